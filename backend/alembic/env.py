@@ -12,10 +12,16 @@ load_dotenv()
 config = context.config
 
 # Override sqlalchemy.url from environment variable
-config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
 
-# Interpret the config file for Python logging.
-fileConfig(config.config_file_name)
+# A caller may hand over an open connection (the test fixtures in
+# conftest.py migrate each worker's schema this way)
+given_connection = config.attributes.get("connection")
+
+# Interpret the config file for Python logging, unless embedded in another program
+if given_connection is None:
+    fileConfig(config.config_file_name)
 
 # For now, we don't have models yet, so set target_metadata to None
 target_metadata = None
@@ -35,6 +41,12 @@ def run_migrations_offline():
 
 def run_migrations_online():
     """Run migrations in 'online' mode."""
+    if given_connection is not None:
+        context.configure(connection=given_connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
@@ -0,0 +1,114 @@
+"""create investment daily rollups table
+
+Revision ID: 098f267e51a0
+Revises: 4d65a2cf1a2a
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '098f267e51a0'
+down_revision = '4d65a2cf1a2a'
+branch_labels = None
+depends_on = None
+
+# Net change per rollup key from the rows touched by one statement.
+# Days are UTC, matching how invested_at is stored.
+DELTAS_SQL = """
+    SELECT user_id, category_id, type, COALESCE(currency, '') AS currency,
+           (invested_at AT TIME ZONE 'UTC')::date AS day,
+           SUM(sign * amount_invested) AS total_amount,
+           SUM(sign) AS investment_count
+    FROM ({changed}) AS changed
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+CHANGED_ROWS = {
+    'INSERT': "SELECT *, 1 AS sign FROM new_rows",
+    'DELETE': "SELECT *, -1 AS sign FROM old_rows",
+    'UPDATE': "SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows",
+}
+
+APPLY_SQL = """
+        INSERT INTO investment_daily_rollups AS r
+            (user_id, category_id, type, currency, day, total_amount, investment_count)
+        {deltas}
+        ON CONFLICT (user_id, category_id, type, currency, day) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            investment_count = r.investment_count + EXCLUDED.investment_count;
+
+        DELETE FROM investment_daily_rollups r
+        USING ({deltas}) AS d
+        WHERE r.user_id = d.user_id AND r.category_id = d.category_id
+          AND r.type = d.type AND r.currency = d.currency AND r.day = d.day
+          AND r.investment_count = 0;
+"""
+
+
+def upgrade():
+    op.create_table('investment_daily_rollups',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', sa.String(length=20), nullable=False),
+        sa.Column('currency', sa.String(length=10), nullable=False, server_default=''),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('investment_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'category_id', 'type', 'currency', 'day')
+    )
+    # Range totals by user regardless of category
+    op.create_index('ix_daily_rollups_user_day', 'investment_daily_rollups', ['user_id', 'day'])
+
+    # Statement-level triggers with transition tables, so a bulk COPY into
+    # investments costs one grouped upsert rather than one per row.
+    # Postgres allows only one event per trigger when transition tables are used.
+    branches = []
+    for op_name, changed in CHANGED_ROWS.items():
+        deltas = DELTAS_SQL.format(changed=changed)
+        branches.append(f"IF TG_OP = '{op_name}' THEN\n{APPLY_SQL.format(deltas=deltas)}\n    END IF;")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION investment_daily_rollups_apply() RETURNS trigger AS $$
+        BEGIN
+            {chr(10).join(branches)}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER investments_rollup_insert AFTER INSERT ON investments
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION investment_daily_rollups_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER investments_rollup_update AFTER UPDATE ON investments
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION investment_daily_rollups_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER investments_rollup_delete AFTER DELETE ON investments
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION investment_daily_rollups_apply()
+    """)
+
+    # Backfill from existing investments
+    op.execute("""
+        INSERT INTO investment_daily_rollups
+            (user_id, category_id, type, currency, day, total_amount, investment_count)
+        SELECT user_id, category_id, type, COALESCE(currency, ''),
+               (invested_at AT TIME ZONE 'UTC')::date,
+               SUM(amount_invested), COUNT(*)
+        FROM investments
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS investments_rollup_delete ON investments")
+    op.execute("DROP TRIGGER IF EXISTS investments_rollup_update ON investments")
+    op.execute("DROP TRIGGER IF EXISTS investments_rollup_insert ON investments")
+    op.execute("DROP FUNCTION IF EXISTS investment_daily_rollups_apply()")
+    op.drop_index('ix_daily_rollups_user_day', table_name='investment_daily_rollups')
+    op.drop_table('investment_daily_rollups')
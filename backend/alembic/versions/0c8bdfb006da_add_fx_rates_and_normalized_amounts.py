@@ -0,0 +1,76 @@
+"""add fx rates and normalized amounts
+
+Revision ID: 0c8bdfb006da
+Revises: 1ae372d9b52e
+Create Date: 2026-10-18 17:00:00.000000
+
+fx_rates holds daily exchange rates into the base currency (FX_BASE_CURRENCY,
+loaded by fx.py): rate = base units per one unit of ``currency``.
+investments.amount_normalized is amount_invested converted at the latest
+rate on or before the investment's UTC date, set by a BEFORE trigger on
+every insert and on updates of amount, currency or date. Rows without a
+rate (time in 'hours', or a currency no rate was loaded for) stay NULL, so
+money totals never mix with hours. Existing rows are filled when rates are
+first loaded.
+
+The partial covering index makes a user's money total an index-only SUM.
+It is built concurrently so writes to investments continue meanwhile.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0c8bdfb006da'
+down_revision = '1ae372d9b52e'
+branch_labels = None
+depends_on = None
+
+NORMALIZE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION investments_normalize() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT'
+           OR NEW.amount_invested IS DISTINCT FROM OLD.amount_invested
+           OR NEW.currency IS DISTINCT FROM OLD.currency
+           OR NEW.invested_at IS DISTINCT FROM OLD.invested_at THEN
+            NEW.amount_normalized := round(NEW.amount_invested * (
+                SELECT rate FROM fx_rates
+                WHERE currency = upper(NEW.currency)
+                  AND rate_date <= (NEW.invested_at AT TIME ZONE 'UTC')::date
+                ORDER BY rate_date DESC
+                LIMIT 1
+            ), 2);
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+def upgrade():
+    op.create_table('fx_rates',
+        sa.Column('currency', sa.String(length=10), nullable=False),
+        sa.Column('rate_date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(20, 10), nullable=False),
+        sa.PrimaryKeyConstraint('currency', 'rate_date'),
+        sa.CheckConstraint('rate > 0', name='check_fx_rate_positive')
+    )
+    op.add_column('investments', sa.Column('amount_normalized', sa.Numeric(14, 2), nullable=True))
+
+    op.execute(NORMALIZE_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER investments_normalize
+        BEFORE INSERT OR UPDATE ON investments
+        FOR EACH ROW EXECUTE FUNCTION investments_normalize()
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_investments_user_normalized', 'investments', ['user_id', 'invested_at'],
+                        postgresql_include=['amount_normalized'],
+                        postgresql_where=sa.text('amount_normalized IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    op.drop_index('ix_investments_user_normalized', table_name='investments')
+    op.execute("DROP TRIGGER IF EXISTS investments_normalize ON investments")
+    op.execute("DROP FUNCTION IF EXISTS investments_normalize()")
+    op.drop_column('investments', 'amount_normalized')
+    op.drop_table('fx_rates')
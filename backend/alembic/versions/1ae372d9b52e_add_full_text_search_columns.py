@@ -0,0 +1,64 @@
+"""add full text search columns
+
+Revision ID: 1ae372d9b52e
+Revises: e4f3f0563277
+Create Date: 2026-10-18 16:00:00.000000
+
+Generated tsvector columns for search.py on investments (title, description),
+job_applications (company, position, notes) and learning_investments
+(course, platform, instructor), weighted so matches in titles rank above
+matches in free text. Postgres keeps them current on every write, so queries
+never run to_tsvector over stored text.
+
+investments and job_applications carry user_id, so their GIN indexes lead
+with it (btree_gin) and one index scan answers "this user's rows matching
+the query". learning_investments is reached through investments.
+
+Adding a stored generated column rewrites the table under an exclusive
+lock, so the indexes are built in the same transaction rather than
+concurrently; run this outside peak hours on large tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '1ae372d9b52e'
+down_revision = 'e4f3f0563277'
+branch_labels = None
+depends_on = None
+
+# table -> (tsvector expression, index columns)
+SEARCH_COLUMNS = {
+    'investments': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        ['user_id', 'search_vector'],
+    ),
+    'job_applications': (
+        "setweight(to_tsvector('english', coalesce(company_name, '') || ' ' || coalesce(position, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(notes, '')), 'B')",
+        ['user_id', 'search_vector'],
+    ),
+    'learning_investments': (
+        "setweight(to_tsvector('english', coalesce(course_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(platform, '') || ' ' || coalesce(instructor, '')), 'C')",
+        ['search_vector'],
+    ),
+}
+
+def upgrade():
+    # GIN operator classes for scalar columns such as user_id. Pinned to
+    # public: created unqualified it would land in the first schema on the
+    # search_path (e.g. a test worker's schema) and vanish when that is dropped
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin SCHEMA public")
+
+    for table, (expression, index_columns) in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(),
+                                       sa.Computed(expression, persisted=True), nullable=True))
+        op.create_index(f'ix_{table}_search', table, index_columns, postgresql_using='gin')
+
+def downgrade():
+    for table in reversed(SEARCH_COLUMNS):
+        op.drop_index(f'ix_{table}_search', table_name=table)
+        op.drop_column(table, 'search_vector')
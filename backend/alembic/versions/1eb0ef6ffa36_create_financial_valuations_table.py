@@ -0,0 +1,42 @@
+"""create financial valuations table
+
+Revision ID: 1eb0ef6ffa36
+Revises: 74654db574f3
+Create Date: 2026-10-18 13:00:00.000000
+
+Mark-to-market history written by revalue.py: one row per holding per
+revaluation run. financial_investments.current_value holds the latest
+market value of the whole position (quantity * price), which outgrows
+numeric(10,2) for large positions, so it is widened to numeric(14,2).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '1eb0ef6ffa36'
+down_revision = '74654db574f3'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.alter_column('financial_investments', 'current_value',
+                    type_=sa.Numeric(14, 2), existing_type=sa.Numeric(10, 2), existing_nullable=True)
+
+    op.create_table('financial_valuations',
+        sa.Column('financial_investment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('valued_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('price', sa.Numeric(18, 6), nullable=False),
+        sa.Column('market_value', sa.Numeric(14, 2), nullable=False),
+        sa.ForeignKeyConstraint(['financial_investment_id'], ['financial_investments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('financial_investment_id', 'valued_at')
+    )
+
+    # Whole-run lookups ("everything valued at T") and pruning by age
+    op.create_index('ix_financial_valuations_valued_at', 'financial_valuations', ['valued_at'])
+
+def downgrade():
+    op.drop_index('ix_financial_valuations_valued_at', table_name='financial_valuations')
+    op.drop_table('financial_valuations')
+    op.alter_column('financial_investments', 'current_value',
+                    type_=sa.Numeric(10, 2), existing_type=sa.Numeric(14, 2), existing_nullable=True)
@@ -0,0 +1,156 @@
+"""create job application funnel table
+
+Revision ID: 5fe51eaf22bf
+Revises: 1eb0ef6ffa36
+Create Date: 2026-10-18 14:00:00.000000
+
+job_application_funnel holds application counts per (user, UTC month of
+applied_at, company, stage, outcome) plus the summed days from applied_at to
+outcome_at, kept current by statement-level triggers like the daily
+rollups. job_applications gains two trigger-maintained columns:
+user_id (copied from the investment, so deleted rows can still be
+attributed after a cascade removed the investment) and outcome_at (set when
+outcome changes, so time-to-outcome can be measured).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5fe51eaf22bf'
+down_revision = '1eb0ef6ffa36'
+branch_labels = None
+depends_on = None
+
+FILL_FUNCTION = """
+    CREATE OR REPLACE FUNCTION job_applications_fill() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' OR NEW.investment_id IS DISTINCT FROM OLD.investment_id THEN
+            SELECT user_id INTO NEW.user_id FROM investments WHERE id = NEW.investment_id;
+        END IF;
+        -- Stamp outcome changes unless the writer supplied outcome_at itself
+        IF TG_OP = 'UPDATE' AND NEW.outcome IS DISTINCT FROM OLD.outcome
+           AND NEW.outcome_at IS NOT DISTINCT FROM OLD.outcome_at THEN
+            NEW.outcome_at := CASE WHEN NEW.outcome IS NULL THEN NULL ELSE now() END;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# Net change per funnel key from the rows touched by one statement
+DELTAS_SQL = """
+    SELECT user_id, date_trunc('month', applied_at AT TIME ZONE 'UTC')::date AS month,
+           company_name, application_stage, COALESCE(outcome, '') AS outcome,
+           SUM(sign) AS application_count,
+           COALESCE(SUM(sign * EXTRACT(EPOCH FROM outcome_at - applied_at) / 86400)
+                    FILTER (WHERE outcome_at IS NOT NULL), 0) AS outcome_days_sum,
+           COALESCE(SUM(sign) FILTER (WHERE outcome_at IS NOT NULL), 0) AS outcome_days_count
+    FROM ({changed}) AS changed
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+CHANGED_ROWS = {
+    'INSERT': "SELECT *, 1 AS sign FROM new_rows",
+    'DELETE': "SELECT *, -1 AS sign FROM old_rows",
+    'UPDATE': "SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows",
+}
+
+KEY = "user_id, month, company_name, application_stage, outcome"
+
+APPLY_SQL = f"""
+        INSERT INTO job_application_funnel AS f
+            ({KEY}, application_count, outcome_days_sum, outcome_days_count)
+        {{deltas}}
+        ON CONFLICT ({KEY}) DO UPDATE
+        SET application_count = f.application_count + EXCLUDED.application_count,
+            outcome_days_sum = f.outcome_days_sum + EXCLUDED.outcome_days_sum,
+            outcome_days_count = f.outcome_days_count + EXCLUDED.outcome_days_count;
+
+        DELETE FROM job_application_funnel f
+        USING ({{deltas}}) AS d
+        WHERE f.user_id = d.user_id AND f.month = d.month AND f.company_name = d.company_name
+          AND f.application_stage = d.application_stage AND f.outcome = d.outcome
+          AND f.application_count = 0;
+"""
+
+
+def upgrade():
+    op.add_column('job_applications', sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('job_applications', sa.Column('outcome_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("""
+        UPDATE job_applications j SET user_id = i.user_id
+        FROM investments i WHERE i.id = j.investment_id
+    """)
+    op.alter_column('job_applications', 'user_id', nullable=False)
+    op.execute(FILL_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER job_applications_fill BEFORE INSERT OR UPDATE ON job_applications
+        FOR EACH ROW EXECUTE FUNCTION job_applications_fill()
+    """)
+
+    # Global stage/outcome breakdowns and the funnel backfill
+    op.create_index('ix_job_applications_stage_outcome', 'job_applications', ['application_stage', 'outcome'])
+
+    op.create_table('job_application_funnel',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('company_name', sa.String(length=200), nullable=False),
+        sa.Column('application_stage', sa.String(length=50), nullable=False),
+        sa.Column('outcome', sa.String(length=50), nullable=False, server_default=''),
+        sa.Column('application_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('outcome_days_sum', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('outcome_days_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'company_name', 'application_stage', 'outcome')
+    )
+    # Per-user funnels filtered or grouped by stage and outcome
+    op.create_index('ix_job_application_funnel_user_stage_outcome', 'job_application_funnel',
+                    ['user_id', 'application_stage', 'outcome'])
+
+    # Same scheme as the investment daily rollups: one grouped upsert per statement
+    branches = []
+    for op_name, changed in CHANGED_ROWS.items():
+        deltas = DELTAS_SQL.format(changed=changed)
+        branches.append(f"IF TG_OP = '{op_name}' THEN\n{APPLY_SQL.format(deltas=deltas)}\n    END IF;")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION job_application_funnel_apply() RETURNS trigger AS $$
+        BEGIN
+            {chr(10).join(branches)}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER job_applications_funnel_insert AFTER INSERT ON job_applications
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION job_application_funnel_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER job_applications_funnel_update AFTER UPDATE ON job_applications
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION job_application_funnel_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER job_applications_funnel_delete AFTER DELETE ON job_applications
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION job_application_funnel_apply()
+    """)
+
+    # Backfill from existing applications
+    op.execute(f"""
+        INSERT INTO job_application_funnel ({KEY}, application_count, outcome_days_sum, outcome_days_count)
+        {DELTAS_SQL.format(changed="SELECT *, 1 AS sign FROM job_applications")}
+    """)
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS job_applications_funnel_delete ON job_applications")
+    op.execute("DROP TRIGGER IF EXISTS job_applications_funnel_update ON job_applications")
+    op.execute("DROP TRIGGER IF EXISTS job_applications_funnel_insert ON job_applications")
+    op.execute("DROP FUNCTION IF EXISTS job_application_funnel_apply()")
+    op.drop_index('ix_job_application_funnel_user_stage_outcome', table_name='job_application_funnel')
+    op.drop_table('job_application_funnel')
+    op.drop_index('ix_job_applications_stage_outcome', table_name='job_applications')
+    op.execute("DROP TRIGGER IF EXISTS job_applications_fill ON job_applications")
+    op.execute("DROP FUNCTION IF EXISTS job_applications_fill()")
+    op.drop_column('job_applications', 'outcome_at')
+    op.drop_column('job_applications', 'user_id')
@@ -0,0 +1,133 @@
+"""partition time logs by month
+
+Revision ID: 74654db574f3
+Revises: a973fa84a52d
+Create Date: 2026-10-18 12:00:00.000000
+
+time_logs becomes a declaratively partitioned table with one range partition
+per calendar month of logged_date (time_logs_pYYYYMM) plus a default
+partition as a safety net. Existing rows are copied across. Run
+`python partitions.py maintain` afterwards (and from cron) to keep future
+months created and old ones archived.
+
+investments is not partitioned here: a partitioned table's unique keys must
+include the partition key, so investments.id alone could no longer be the
+target of the foreign keys from job_applications, learning_investments,
+financial_investments, time_logs and investment_returns. It gets a BRIN
+index on invested_at instead, which is tiny and lets date-bounded scans
+skip block ranges on this append-mostly table.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '74654db574f3'
+down_revision = 'a973fa84a52d'
+branch_labels = None
+depends_on = None
+
+# Months to create ahead of today on top of the months existing data spans
+FUTURE_MONTHS = 3
+
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    first_month date;
+    last_month date;
+    month date;
+BEGIN
+    SELECT COALESCE(date_trunc('month', MIN(logged_date)), date_trunc('month', CURRENT_DATE))::date,
+           GREATEST(COALESCE(MAX(logged_date), CURRENT_DATE), CURRENT_DATE)
+    INTO first_month, last_month
+    FROM time_logs_unpartitioned;
+    last_month := (date_trunc('month', last_month) + interval '%(future)s months')::date;
+
+    month := first_month;
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %%I PARTITION OF time_logs FOR VALUES FROM (%%L) TO (%%L)',
+            'time_logs_p' || to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END
+$$
+""" % {'future': FUTURE_MONTHS}
+
+
+def _rename_indexes(old_suffix, new_suffix):
+    for name in ('time_logs_pkey', 'uq_investment_date', 'ix_time_logs_date',
+                 'ix_time_logs_investment_date_covering'):
+        op.execute(f"ALTER INDEX IF EXISTS {name}{old_suffix} RENAME TO {name}{new_suffix}")
+
+
+def upgrade():
+    # Move the heap table aside; index names are schema-wide, so rename them too
+    op.rename_table('time_logs', 'time_logs_unpartitioned')
+    _rename_indexes('', '_unpartitioned')
+
+    op.create_table('time_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('investment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('logged_date', sa.Date(), nullable=False),
+        sa.Column('time_spent_minutes', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('productivity_rating', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['investment_id'], ['investments.id'], ondelete='CASCADE'),
+        # The partition key has to be part of every unique constraint
+        sa.PrimaryKeyConstraint('id', 'logged_date'),
+        sa.UniqueConstraint('investment_id', 'logged_date', name='uq_investment_date'),
+        postgresql_partition_by='RANGE (logged_date)'
+    )
+    op.create_index('ix_time_logs_date', 'time_logs', ['logged_date'])
+    op.create_index('ix_time_logs_investment_date_covering', 'time_logs',
+                    ['investment_id', 'logged_date'],
+                    postgresql_include=['time_spent_minutes', 'productivity_rating'])
+
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute("CREATE TABLE time_logs_default PARTITION OF time_logs DEFAULT")
+
+    op.execute("""
+        INSERT INTO time_logs
+        (id, investment_id, logged_date, time_spent_minutes, description, productivity_rating, created_at)
+        SELECT id, investment_id, logged_date, time_spent_minutes, description, productivity_rating, created_at
+        FROM time_logs_unpartitioned
+    """)
+    op.drop_table('time_logs_unpartitioned')
+
+    op.execute("CREATE INDEX ix_investments_invested_at_brin ON investments USING brin (invested_at)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_investments_invested_at_brin")
+
+    op.rename_table('time_logs', 'time_logs_partitioned')
+    _rename_indexes('', '_partitioned')
+
+    op.create_table('time_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('investment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('logged_date', sa.Date(), nullable=False),
+        sa.Column('time_spent_minutes', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('productivity_rating', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['investment_id'], ['investments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('investment_id', 'logged_date', name='uq_investment_date')
+    )
+    op.create_index('ix_time_logs_date', 'time_logs', ['logged_date'])
+    op.create_index('ix_time_logs_investment_date_covering', 'time_logs',
+                    ['investment_id', 'logged_date'],
+                    postgresql_include=['time_spent_minutes', 'productivity_rating'])
+
+    # Detached (archived) partitions are not copied back
+    op.execute("""
+        INSERT INTO time_logs
+        (id, investment_id, logged_date, time_spent_minutes, description, productivity_rating, created_at)
+        SELECT id, investment_id, logged_date, time_spent_minutes, description, productivity_rating, created_at
+        FROM time_logs_partitioned
+    """)
+    op.drop_table('time_logs_partitioned')
@@ -0,0 +1,78 @@
+"""notify summary changes
+
+Revision ID: 7efc240fc45b
+Revises: 0c8bdfb006da
+Create Date: 2026-10-18 18:00:00.000000
+
+Statement-level triggers on investments and the tables behind the user
+summaries send pg_notify('summary_invalidate', user_id) once per changed
+user, which the API's cache listener uses to drop that user's cached
+summaries (api/cache.py). Notifications are delivered on commit and
+identical ones within a transaction are folded into one, so a bulk write
+sends one per user and a rolled-back one sends none.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7efc240fc45b'
+down_revision = '0c8bdfb006da'
+branch_labels = None
+depends_on = None
+
+CHANNEL = 'summary_invalidate'
+
+# table -> the user_ids of a transition table {rows}; child tables without a
+# user_id go through investments (cascaded deletes are covered by the
+# investments trigger)
+USERS = {
+    'investments': "SELECT user_id FROM {rows}",
+    'job_applications': "SELECT user_id FROM {rows}",
+    'time_logs': "SELECT i.user_id FROM {rows} r JOIN investments i ON i.id = r.investment_id",
+    'learning_investments': "SELECT i.user_id FROM {rows} r JOIN investments i ON i.id = r.investment_id",
+    'financial_investments': "SELECT i.user_id FROM {rows} r JOIN investments i ON i.id = r.investment_id",
+}
+
+EVENTS = {
+    'insert': ("INSERT", "NEW TABLE AS new_rows"),
+    'update': ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    'delete': ("DELETE", "OLD TABLE AS old_rows"),
+}
+
+
+def notify_function(table):
+    users = USERS[table]
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_notify_summary() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM pg_notify('{CHANNEL}', user_id::text)
+                FROM ({users.format(rows='new_rows')}) AS changed GROUP BY user_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('{CHANNEL}', user_id::text)
+                FROM ({users.format(rows='old_rows')}) AS changed GROUP BY user_id;
+            ELSE
+                PERFORM pg_notify('{CHANNEL}', user_id::text)
+                FROM ({users.format(rows='new_rows')} UNION {users.format(rows='old_rows')}) AS changed
+                GROUP BY user_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade():
+    for table in USERS:
+        op.execute(notify_function(table))
+        for event, (operation, referencing) in EVENTS.items():
+            op.execute(f"""
+                CREATE TRIGGER {table}_notify_summary_{event} AFTER {operation} ON {table}
+                REFERENCING {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION {table}_notify_summary()
+            """)
+
+def downgrade():
+    for table in reversed(list(USERS)):
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_summary_{event} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_notify_summary()")
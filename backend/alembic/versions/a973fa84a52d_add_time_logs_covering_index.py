@@ -0,0 +1,28 @@
+"""add time logs covering index
+
+Revision ID: a973fa84a52d
+Revises: 594b80c4e130
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a973fa84a52d'
+down_revision = '594b80c4e130'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Aggregations read only these columns, so they can be answered by
+    # index-only scans instead of visiting the heap for every log
+    op.create_index('ix_time_logs_investment_date_covering', 'time_logs',
+                    ['investment_id', 'logged_date'],
+                    postgresql_include=['time_spent_minutes', 'productivity_rating'])
+    # Covered by the new index (and by uq_investment_date)
+    op.drop_index('ix_time_logs_investment', table_name='time_logs')
+
+def downgrade():
+    op.create_index('ix_time_logs_investment', 'time_logs', ['investment_id'])
+    op.drop_index('ix_time_logs_investment_date_covering', table_name='time_logs')
@@ -0,0 +1,38 @@
+"""merge time logs covering index into unique constraint
+
+Revision ID: e20803cf7563
+Revises: 7efc240fc45b
+Create Date: 2026-10-18 19:00:00.000000
+
+ix_time_logs_investment_date_covering had the same key as uq_investment_date,
+so every write maintained two equivalent btrees. The unique constraint's
+index now carries the INCLUDE columns itself and the separate index is
+dropped. ON CONFLICT (investment_id, logged_date) still infers the
+constraint. Partitioned tables cannot build indexes concurrently, so this
+holds a lock on time_logs while each partition's index is rebuilt.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e20803cf7563'
+down_revision = '7efc240fc45b'
+branch_labels = None
+depends_on = None
+
+INCLUDE = "time_spent_minutes, productivity_rating"
+
+
+def upgrade():
+    op.drop_constraint('uq_investment_date', 'time_logs', type_='unique')
+    op.execute(f"""
+        ALTER TABLE time_logs ADD CONSTRAINT uq_investment_date
+        UNIQUE (investment_id, logged_date) INCLUDE ({INCLUDE})
+    """)
+    op.drop_index('ix_time_logs_investment_date_covering', table_name='time_logs')
+
+def downgrade():
+    op.create_index('ix_time_logs_investment_date_covering', 'time_logs',
+                    ['investment_id', 'logged_date'],
+                    postgresql_include=['time_spent_minutes', 'productivity_rating'])
+    op.drop_constraint('uq_investment_date', 'time_logs', type_='unique')
+    op.create_unique_constraint('uq_investment_date', 'time_logs', ['investment_id', 'logged_date'])
@@ -0,0 +1,31 @@
+"""create online backfill progress table
+
+Revision ID: e4f3f0563277
+Revises: 5fe51eaf22bf
+Create Date: 2026-10-18 15:00:00.000000
+
+Checkpoints for online_migrations.backfill(): the last key each named
+backfill has committed, so a throttled backfill that is interrupted resumes
+where it stopped instead of starting over.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e4f3f0563277'
+down_revision = '5fe51eaf22bf'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('online_backfill_progress',
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('last_key', sa.Text(), nullable=True),
+        sa.Column('rows_done', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('online_backfill_progress')
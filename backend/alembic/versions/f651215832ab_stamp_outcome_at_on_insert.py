@@ -0,0 +1,65 @@
+"""stamp job application outcome_at on insert
+
+Revision ID: f651215832ab
+Revises: e20803cf7563
+Create Date: 2026-10-18 20:00:00.000000
+
+job_applications_fill only stamped outcome_at when an UPDATE changed the
+outcome, so applications inserted with an outcome already set never got
+one and were left out of the funnel's time-to-outcome averages. The
+function now stamps those inserts too; existing rows take created_at,
+the time the insert happened.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f651215832ab'
+down_revision = 'e20803cf7563'
+branch_labels = None
+depends_on = None
+
+FILL_FUNCTION = """
+    CREATE OR REPLACE FUNCTION job_applications_fill() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' OR NEW.investment_id IS DISTINCT FROM OLD.investment_id THEN
+            SELECT user_id INTO NEW.user_id FROM investments WHERE id = NEW.investment_id;
+        END IF;
+        -- Stamp outcomes unless the writer supplied outcome_at itself
+        IF TG_OP = 'INSERT' AND NEW.outcome IS NOT NULL AND NEW.outcome_at IS NULL THEN
+            NEW.outcome_at := now();
+        ELSIF TG_OP = 'UPDATE' AND NEW.outcome IS DISTINCT FROM OLD.outcome
+              AND NEW.outcome_at IS NOT DISTINCT FROM OLD.outcome_at THEN
+            NEW.outcome_at := CASE WHEN NEW.outcome IS NULL THEN NULL ELSE now() END;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_FILL_FUNCTION = """
+    CREATE OR REPLACE FUNCTION job_applications_fill() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' OR NEW.investment_id IS DISTINCT FROM OLD.investment_id THEN
+            SELECT user_id INTO NEW.user_id FROM investments WHERE id = NEW.investment_id;
+        END IF;
+        -- Stamp outcome changes unless the writer supplied outcome_at itself
+        IF TG_OP = 'UPDATE' AND NEW.outcome IS DISTINCT FROM OLD.outcome
+           AND NEW.outcome_at IS NOT DISTINCT FROM OLD.outcome_at THEN
+            NEW.outcome_at := CASE WHEN NEW.outcome IS NULL THEN NULL ELSE now() END;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    op.execute(FILL_FUNCTION)
+    # The funnel update trigger moves these rows into the time-to-outcome sums
+    op.execute("""
+        UPDATE job_applications SET outcome_at = COALESCE(created_at, applied_at)
+        WHERE outcome IS NOT NULL AND outcome_at IS NULL
+    """)
+
+def downgrade():
+    op.execute(PREVIOUS_FILL_FUNCTION)
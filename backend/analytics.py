@@ -0,0 +1,136 @@
+"""Cross-user analytics over the columnar snapshot written by snapshot.py.
+
+Queries run in DuckDB against the Parquet files, never against Postgres:
+scans read only the columns they use, in vectorized batches across all
+cores, and put no load on the database that serves the app. Results are
+as fresh as the last ``python snapshot.py`` run.
+
+    con = connect()
+    for row in hours_per_category(con):
+        print(row['category'], row['avg_hours'])
+
+Usage:
+    python analytics.py hours-per-category
+    python analytics.py salaries-by-company [--min-applications 3]
+    python analytics.py monthly-activity
+    python analytics.py sql "SELECT count(*) FROM investments"
+"""
+import argparse
+import os
+
+from snapshot import DUCKDB_FILE, SNAPSHOT_DIR, SnapshotError
+
+HOURS_PER_CATEGORY_SQL = """
+    WITH per_investment AS (
+        SELECT investment_id, SUM(time_spent_minutes) / 60.0 AS hours
+        FROM time_logs
+        GROUP BY investment_id
+    )
+    SELECT c.type, c.name AS category,
+           COUNT(*) AS investments,
+           COUNT(DISTINCT i.user_id) AS users,
+           ROUND(AVG(p.hours), 2) AS avg_hours,
+           ROUND(SUM(p.hours), 1) AS total_hours
+    FROM per_investment p
+    JOIN investments i ON i.id = p.investment_id
+    JOIN investment_categories c ON c.id = i.category_id
+    GROUP BY c.type, c.name
+    ORDER BY total_hours DESC
+"""
+
+SALARIES_BY_COMPANY_SQL = """
+    SELECT company_name,
+           COUNT(*) AS applications,
+           COUNT(DISTINCT user_id) AS users,
+           MIN(salary_range_min) AS lowest_min,
+           ROUND(AVG(salary_range_min), 2) AS avg_min,
+           ROUND(AVG(salary_range_max), 2) AS avg_max,
+           MAX(salary_range_max) AS highest_max,
+           COUNT(*) FILTER (WHERE application_stage = 'offer') AS offers
+    FROM job_applications
+    WHERE salary_range_min IS NOT NULL OR salary_range_max IS NOT NULL
+    GROUP BY company_name
+    HAVING COUNT(*) >= ?
+    ORDER BY applications DESC, company_name
+"""
+
+MONTHLY_ACTIVITY_SQL = """
+    SELECT date_trunc('month', t.logged_date) AS month,
+           COUNT(DISTINCT i.user_id) AS active_users,
+           ROUND(SUM(t.time_spent_minutes) / 60.0, 1) AS hours,
+           ROUND(AVG(t.productivity_rating), 2) AS avg_productivity
+    FROM time_logs t
+    JOIN investments i ON i.id = t.investment_id
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+
+def connect(path=None):
+    """Read-only DuckDB connection to the snapshot's analytics database."""
+    try:
+        import duckdb
+    except ImportError:
+        raise SnapshotError("Analytics needs duckdb: pip install duckdb")
+    path = path or os.path.join(SNAPSHOT_DIR, DUCKDB_FILE)
+    if not os.path.exists(path):
+        raise SnapshotError(f"No snapshot at {path}; run python snapshot.py first")
+    return duckdb.connect(path, read_only=True)
+
+
+def query(con, sql, params=None):
+    """Run ``sql`` on the snapshot and return a list of dicts."""
+    cursor = con.execute(sql, params or [])
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def hours_per_category(con):
+    """Hours logged per investment, averaged per category across all users."""
+    return query(con, HOURS_PER_CATEGORY_SQL)
+
+
+def salaries_by_company(con, min_applications=1):
+    """Advertised salary ranges per company, from applications that list one."""
+    return query(con, SALARIES_BY_COMPANY_SQL, [min_applications])
+
+
+def monthly_activity(con):
+    """Users logging time, hours logged and average productivity per month."""
+    return query(con, MONTHLY_ACTIVITY_SQL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics over the columnar snapshot")
+    parser.add_argument('--db', help=f"DuckDB file (default {SNAPSHOT_DIR}/{DUCKDB_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('hours-per-category')
+    salaries_parser = sub.add_parser('salaries-by-company')
+    salaries_parser.add_argument('--min-applications', type=int, default=1)
+    sub.add_parser('monthly-activity')
+    sql_parser = sub.add_parser('sql', help="run an ad-hoc query")
+    sql_parser.add_argument('sql')
+    args = parser.parse_args()
+
+    try:
+        con = connect(args.db)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        return
+    with con:
+        if args.command == 'hours-per-category':
+            rows = hours_per_category(con)
+        elif args.command == 'salaries-by-company':
+            rows = salaries_by_company(con, args.min_applications)
+        elif args.command == 'monthly-activity':
+            rows = monthly_activity(con)
+        else:
+            rows = query(con, args.sql)
+    print(f"📊 {args.command.upper()} ({len(rows)} rows)")
+    print("=" * 30)
+    for row in rows:
+        print("  " + "  ".join(f"{key}={value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
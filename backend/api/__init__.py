@@ -0,0 +1,5 @@
+"""Async HTTP API over the LifeInvest schema.
+
+Run with:
+    uvicorn api.main:app
+"""
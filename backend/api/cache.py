@@ -0,0 +1,276 @@
+"""Per-user response cache for read-heavy summary endpoints.
+
+Entries are grouped by user so every write for a user can drop all of that
+user's cached summaries at once. The in-process tier keeps the
+SUMMARY_CACHE_USERS most recently used users for SUMMARY_CACHE_TTL_S
+seconds each. With SUMMARY_CACHE_REDIS_URL set, summaries are also shared
+between API workers through Redis (pip install redis), one hash per user.
+
+Endpoints invalidate the user they just wrote for. Writes from anywhere
+else (other workers, bulk imports, scripts, psql) reach the cache through
+triggers on investments and its child tables that NOTIFY the changed
+user_ids on commit (migration 7efc240fc45b); InvalidationListener consumes
+them on a connection of its own, outside the API's pool. While it is
+reconnecting notifications may be missed, so once it is back the cache is
+cleared, and so is the shared tier: every generation there includes a
+global epoch, which the clear bumps.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+import db
+from api import schemas
+
+TTL_S = float(os.getenv('SUMMARY_CACHE_TTL_S', '60'))
+MAX_USERS = int(os.getenv('SUMMARY_CACHE_USERS', '10000'))
+REDIS_URL = os.getenv('SUMMARY_CACHE_REDIS_URL')
+CHANNEL = 'summary_invalidate'
+RECONNECT_S = 5
+CONNECT_TIMEOUT_S = 10
+
+logger = logging.getLogger('lifeinvest.cache')
+
+
+class ResponseCache:
+    def __init__(self, ttl=TTL_S, max_users=MAX_USERS, shared=None, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.shared = shared
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._epoch = 0
+        self._generations = {}
+        self._unpublished = set()
+        self._clear_shared = False
+
+    def get(self, user_id, key):
+        user_id = str(user_id)
+        entries = self._entries.get(user_id)
+        entry = entries.get(key) if entries else None
+        if entry is None or entry[0] <= self.clock():
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    def generation(self, user_id):
+        return self._epoch, self._generations.get(str(user_id), 0)
+
+    def set(self, user_id, key, value, generation=None):
+        """Store ``value`` unless the user was invalidated since ``generation`` was read."""
+        user_id = str(user_id)
+        if generation is not None and generation != self.generation(user_id):
+            return
+        self._entries.setdefault(user_id, {})[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        self._entries.pop(user_id, None)
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        if len(self._generations) > self.max_users:
+            # Forgetting one user's count could let an older generation match
+            # again; bumping the epoch outdates every in-flight read instead
+            self._generations.clear()
+            self._epoch += 1
+        if self.shared is not None:
+            self._unpublished.add(user_id)
+
+    def clear(self):
+        """Drop every user's entries, here and in the shared tier, e.g. after invalidations may have been missed."""
+        self._entries.clear()
+        self._generations.clear()
+        self._epoch += 1
+        if self.shared is not None:
+            self._unpublished.clear()
+            self._clear_shared = True
+
+    async def publish(self):
+        """Pass invalidations made since the last call on to the shared tier."""
+        if self._clear_shared:
+            await self.shared.clear()
+            self._clear_shared = False
+        while self._unpublished:
+            user_id = self._unpublished.pop()
+            try:
+                await self.shared.invalidate(user_id)
+            except BaseException:
+                self._unpublished.add(user_id)
+                raise
+
+    async def get_or_compute(self, user_id, key, compute):
+        """Return the cached value or await ``compute()`` and cache it."""
+        value = self.get(user_id, key)
+        if value is not None:
+            return value
+        generation, shared_generation = self.generation(user_id), None
+        if self.shared is not None:
+            # Unreachable shared tier: serve from the database instead of failing
+            try:
+                await self.publish()
+                shared_generation = await self.shared.generation(user_id)
+                value = await self.shared.get(user_id, key, shared_generation)
+            except Exception:
+                logger.warning("Shared summary cache unavailable", exc_info=True)
+                shared_generation = None
+            if value is not None:
+                self.set(user_id, key, value, generation)
+                return value
+        value = await compute()
+        self.set(user_id, key, value, generation)
+        if shared_generation is not None:
+            try:
+                await self.shared.set(user_id, key, value, shared_generation)
+            except Exception:
+                logger.warning("Shared summary cache unavailable", exc_info=True)
+        return value
+
+
+class RedisTier:
+    """Summaries shared between workers: a hash per user plus a generation counter.
+
+    Values are stored as JSON with the name of their api.schemas model.
+    An entry computed before an invalidation keeps the old generation and
+    is ignored, so a slow reader cannot bring back a stale summary. The
+    generation is "<epoch>:<user counter>", so clear() invalidates every
+    user at once by bumping the epoch; old hashes then expire on their TTL.
+    """
+
+    EPOCH = "summary-epoch"
+
+    def __init__(self, url=REDIS_URL, ttl=TTL_S):
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("SUMMARY_CACHE_REDIS_URL needs the redis client: pip install redis")
+        self.redis = redis.asyncio.from_url(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _names(user_id):
+        return f"summary:{user_id}", f"summary-generation:{user_id}"
+
+    async def generation(self, user_id):
+        epoch, generation = await self.redis.mget(self.EPOCH, self._names(user_id)[1])
+        return f"{int(epoch or 0)}:{int(generation or 0)}"
+
+    async def get(self, user_id, key, generation):
+        raw = await self.redis.hget(self._names(user_id)[0], str(key))
+        return decode(raw, generation) if raw is not None else None
+
+    async def set(self, user_id, key, value, generation):
+        raw = encode(value, generation)
+        if raw is None:
+            return
+        entries, _ = self._names(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.hset(entries, str(key), raw).expire(entries, int(self.ttl)).execute()
+
+    async def invalidate(self, user_id):
+        entries, generation = self._names(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.incr(generation).delete(entries).execute()
+
+    async def clear(self):
+        await self.redis.incr(self.EPOCH)
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+def encode(value, generation):
+    """JSON for a schemas model, or None for values the shared tier cannot hold."""
+    if not isinstance(value, BaseModel) or getattr(schemas, type(value).__name__, None) is not type(value):
+        return None
+    return json.dumps({"model": type(value).__name__, "generation": generation,
+                       "value": value.model_dump(mode='json')})
+
+
+def decode(raw, generation):
+    entry = json.loads(raw)
+    if entry["generation"] != generation:
+        return None
+    return getattr(schemas, entry["model"]).model_validate(entry["value"])
+
+
+class InvalidationListener:
+    """LISTENs on CHANNEL and invalidates each notified user_id in ``cache``.
+
+    The connection is opened with asyncpg directly rather than borrowed from
+    the API's pool, where it would hold a slot for the life of the process
+    and be recycled or pre-pinged like a request connection. ``connect`` is
+    an async callable returning an asyncpg-like connection, for tests.
+    """
+
+    def __init__(self, cache, url=None, connect=None, reconnect_delay=RECONNECT_S):
+        self.cache = cache
+        self.url = url
+        self.connect = connect or self._connect
+        self.reconnect_delay = reconnect_delay
+        self._task = None
+
+    async def _connect(self):
+        import asyncpg
+
+        url = db.async_url(self.url or db.DATABASE_URL).set(drivername='postgresql')
+        return await asyncpg.connect(url.render_as_string(hide_password=False), timeout=CONNECT_TIMEOUT_S)
+
+    def _notified(self, connection, pid, channel, payload):
+        self.cache.invalidate(payload)
+
+    async def _listen(self):
+        conn = await self.connect()
+        try:
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _: lost.set())
+            await conn.add_listener(CHANNEL, self._notified)
+            # Anything written while no one was listening may be cached
+            self.cache.clear()
+            while not lost.is_set():
+                if self.cache.shared is not None:
+                    # Left pending for the next round, or for get_or_compute
+                    try:
+                        await self.cache.publish()
+                    except Exception:
+                        logger.warning("Shared summary cache unavailable", exc_info=True)
+                try:
+                    await asyncio.wait_for(lost.wait(), 1)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not conn.is_closed():
+                await conn.close()
+
+    async def _run(self):
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed; reconnecting in %ds", self.reconnect_delay)
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+summaries = ResponseCache(shared=RedisTier() if REDIS_URL else None)
+listener = InvalidationListener(summaries)
@@ -0,0 +1,78 @@
+"""Endpoints for the one-per-investment specialized rows.
+
+Job applications, learning investments and financial holdings share the same
+shape (at most one row per investment, unique on investment_id), so their
+routes are generated from one table of settings.
+"""
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import schemas
+from api.cache import summaries
+from api.investments import owner_of
+from bulk_import import CHILD_TABLES
+from db import get_async_session
+from routing import note_write
+
+router = APIRouter(tags=["investment details"])
+
+# path segment -> (record key in bulk_import, input model, output model)
+CHILD_ROUTES = {
+    'job-application': ('job_application', schemas.JobApplicationIn, schemas.JobApplication),
+    'learning': ('learning_investment', schemas.LearningIn, schemas.Learning),
+    'financial': ('financial_investment', schemas.FinancialIn, schemas.Financial),
+}
+
+
+def add_child_routes(path, record_key, in_model, out_model):
+    table, columns = CHILD_TABLES[record_key]
+    data_columns = [c for c in columns if c not in ('id', 'investment_id')]
+    select_sql = text(f"SELECT {', '.join(columns)} FROM {table} WHERE investment_id = :investment_id")
+    upsert_sql = text(f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        VALUES (gen_random_uuid(), :investment_id, {', '.join(':' + c for c in data_columns)})
+        ON CONFLICT (investment_id) DO UPDATE
+        SET {', '.join(f'{c} = EXCLUDED.{c}' for c in data_columns)}
+        RETURNING {', '.join(columns)}
+    """)
+    delete_sql = text(f"DELETE FROM {table} WHERE investment_id = :investment_id RETURNING id")
+
+    async def get_child(investment_id: UUID, session: AsyncSession = Depends(get_async_session)):
+        row = (await session.execute(select_sql, {"investment_id": investment_id})).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"No {path} for this investment")
+        return dict(row._mapping)
+
+    async def put_child(investment_id: UUID, payload: in_model,
+                        session: AsyncSession = Depends(get_async_session)):
+        user_id = await owner_of(session, investment_id)
+        row = (await session.execute(upsert_sql, {"investment_id": investment_id, **payload.model_dump()})).one()
+        await session.commit()
+        await note_write(session, user_id)
+        summaries.invalidate(user_id)
+        return dict(row._mapping)
+
+    async def delete_child(investment_id: UUID, session: AsyncSession = Depends(get_async_session)):
+        user_id = await owner_of(session, investment_id)
+        deleted = (await session.execute(delete_sql, {"investment_id": investment_id})).scalar()
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"No {path} for this investment")
+        await session.commit()
+        await note_write(session, user_id)
+        summaries.invalidate(user_id)
+        return Response(status_code=204)
+
+    route = f"/investments/{{investment_id}}/{path}"
+    router.add_api_route(route, get_child, methods=["GET"], response_model=out_model,
+                         name=f"get_{record_key}")
+    router.add_api_route(route, put_child, methods=["PUT"], response_model=out_model,
+                         name=f"put_{record_key}")
+    router.add_api_route(route, delete_child, methods=["DELETE"], status_code=204,
+                         name=f"delete_{record_key}")
+
+
+for path, (record_key, in_model, out_model) in CHILD_ROUTES.items():
+    add_child_routes(path, record_key, in_model, out_model)
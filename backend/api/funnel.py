@@ -0,0 +1,33 @@
+"""Job-application funnel endpoint, served from the job_application_funnel summary table."""
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import schemas
+from api.cache import summaries
+from funnel import funnel, stage_counts, time_to_outcome
+from routing import get_read_session
+
+router = APIRouter(tags=["job funnel"])
+
+
+async def compute_funnel(session, user_id, start, end, company):
+    def compute(s):
+        conn = s.connection()
+        return schemas.JobFunnel(
+            steps=funnel(stage_counts(conn, user_id, start, end, company)),
+            time_to_outcome=time_to_outcome(conn, user_id, start, end, company),
+        )
+    return await session.run_sync(compute)
+
+
+@router.get("/users/{user_id}/job-funnel", response_model=schemas.JobFunnel)
+async def get_job_funnel(user_id: UUID, start: Optional[date] = None, end: Optional[date] = None,
+                         company: Optional[str] = None, session: AsyncSession = Depends(get_read_session)):
+    key = ('job-funnel', start, end, company)
+    return await summaries.get_or_compute(
+        user_id, key, lambda: compute_funnel(session, user_id, start, end, company)
+    )
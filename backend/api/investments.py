@@ -0,0 +1,226 @@
+"""Investment CRUD, keyset-paginated listing, batched creation, export, the user summary,
+the money total and the portfolio value series."""
+from dataclasses import asdict
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import schemas
+from api.cache import summaries
+from bulk_import import TABLE_COLUMNS, TABLE_ORDER, split_record
+from db import get_async_session
+from fx import BASE_CURRENCY, money_total, rate_cache
+from investment_listing import InvalidCursor, MAX_LIMIT, decode_cursor, list_investments
+from price_store import portfolio_value_series
+from projections import InvestmentRow, child_counts, investment_history
+from rollups import range_totals
+from routing import get_read_session, note_write
+
+router = APIRouter(tags=["investments"])
+
+MAX_BATCH = 1000
+MAX_VALUE_SERIES_DAYS = 3660
+
+# Serializes the projection dataclasses directly in pydantic-core
+EXPORT_ADAPTER = TypeAdapter(list[InvestmentRow])
+
+INVESTMENT_COLUMNS = ("id, user_id, category_id, type, title, description, "
+                      "amount_invested, currency, invested_at, created_at")
+
+
+async def owner_of(session, investment_id):
+    """Return the investment's user_id, or 404."""
+    user_id = (await session.execute(
+        text("SELECT user_id FROM investments WHERE id = :id"), {"id": investment_id}
+    )).scalar()
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="Investment not found")
+    return user_id
+
+
+async def check_categories(session, user_id, category_ids):
+    """422 unless every category exists and belongs to ``user_id``."""
+    wanted = set(category_ids)
+    found = set((await session.execute(text(
+        "SELECT id FROM investment_categories WHERE id = ANY(:ids) AND user_id = :user_id"
+    ), {"ids": list(wanted), "user_id": user_id})).scalars())
+    missing = wanted - found
+    if missing:
+        raise HTTPException(status_code=422,
+                            detail=f"Unknown categories: {', '.join(sorted(str(c) for c in missing))}")
+
+
+async def insert_investments(session, user_id, payloads):
+    """Insert investments with their nested children; one executemany per table."""
+    await check_categories(session, user_id, [payload.category_id for payload in payloads])
+    rows = {table: [] for table in TABLE_ORDER}
+    ids = []
+    for payload in payloads:
+        record = payload.model_dump()
+        record['user_id'] = user_id
+        split = split_record(record)
+        ids.append(split[0][1]['id'])
+        for table, row in split:
+            rows[table].append(row)
+    for table in TABLE_ORDER:
+        if rows[table]:
+            columns = TABLE_COLUMNS[table]
+            await session.execute(text(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + c for c in columns)})"
+            ), rows[table])
+    return ids
+
+
+async def fetch_investment(session, investment_id):
+    row = (await session.execute(
+        text(f"SELECT {INVESTMENT_COLUMNS} FROM investments WHERE id = :id"), {"id": investment_id}
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Investment not found")
+    return schemas.Investment.model_validate(row)
+
+
+@router.post("/users/{user_id}/investments", response_model=schemas.Investment, status_code=201)
+async def create_investment(user_id: UUID, payload: schemas.InvestmentIn,
+                            session: AsyncSession = Depends(get_async_session)):
+    [investment_id] = await insert_investments(session, user_id, [payload])
+    investment = await fetch_investment(session, investment_id)
+    await session.commit()
+    await note_write(session, user_id)
+    summaries.invalidate(user_id)
+    return investment
+
+
+@router.post("/users/{user_id}/investments/batch", response_model=schemas.BatchResult, status_code=201)
+async def create_investments_batch(user_id: UUID, payloads: list[schemas.InvestmentIn],
+                                   session: AsyncSession = Depends(get_async_session)):
+    if len(payloads) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} investments per batch")
+    ids = await insert_investments(session, user_id, payloads)
+    await session.commit()
+    await note_write(session, user_id)
+    summaries.invalidate(user_id)
+    return schemas.BatchResult(created=len(ids), ids=ids)
+
+
+@router.get("/users/{user_id}/investments", response_model=schemas.InvestmentPage)
+async def get_investments(user_id: UUID, cursor: Optional[str] = None,
+                          limit: int = Query(20, ge=1, le=MAX_LIMIT),
+                          type: Optional[schemas.InvestmentType] = None,
+                          category_id: Optional[UUID] = None,
+                          session: AsyncSession = Depends(get_read_session)):
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await session.run_sync(lambda s: list_investments(
+        s.connection(), user_id, cursor=cursor, limit=limit, type=type, category_id=category_id,
+    ))
+
+
+@router.get("/users/{user_id}/investments/export")
+async def export_investments(user_id: UUID, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             session: AsyncSession = Depends(get_read_session)):
+    """Full investment history as a JSON array, built from projection rows, not ORM objects."""
+    rows = await session.run_sync(
+        lambda s: list(investment_history(s.connection(), user_id, start=start, end=end))
+    )
+    return Response(EXPORT_ADAPTER.dump_json(rows), media_type="application/json")
+
+
+@router.get("/investments/{investment_id}", response_model=schemas.Investment)
+async def get_investment(investment_id: UUID, session: AsyncSession = Depends(get_async_session)):
+    return await fetch_investment(session, investment_id)
+
+
+@router.patch("/investments/{investment_id}", response_model=schemas.Investment)
+async def update_investment(investment_id: UUID, payload: schemas.InvestmentUpdate,
+                            session: AsyncSession = Depends(get_async_session)):
+    changes = payload.model_dump(exclude_unset=True)
+    if not changes:
+        return await fetch_investment(session, investment_id)
+    assignments = ', '.join(f"{column} = :{column}" for column in changes)
+    row = (await session.execute(
+        text(f"UPDATE investments SET {assignments} WHERE id = :id RETURNING {INVESTMENT_COLUMNS}"),
+        {**changes, "id": investment_id},
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Investment not found")
+    await session.commit()
+    await note_write(session, row.user_id)
+    summaries.invalidate(row.user_id)
+    return schemas.Investment.model_validate(row)
+
+
+@router.delete("/investments/{investment_id}", status_code=204)
+async def delete_investment(investment_id: UUID, session: AsyncSession = Depends(get_async_session)):
+    user_id = (await session.execute(
+        text("DELETE FROM investments WHERE id = :id RETURNING user_id"), {"id": investment_id}
+    )).scalar()
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="Investment not found")
+    await session.commit()
+    await note_write(session, user_id)
+    summaries.invalidate(user_id)
+    return Response(status_code=204)
+
+
+async def compute_summary(session, user_id):
+    totals = await session.run_sync(
+        lambda s: range_totals(s.connection(), user_id, date.min, date.max)
+    )
+    counts = await session.run_sync(lambda s: child_counts(s.connection(), user_id))
+    return schemas.Summary(totals=totals, child_counts=asdict(counts))
+
+
+@router.get("/users/{user_id}/summary", response_model=schemas.Summary)
+async def get_summary(user_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    return await summaries.get_or_compute(user_id, 'summary', lambda: compute_summary(session, user_id))
+
+
+async def compute_money_total(session, user_id, currency, start, end):
+    def compute(s):
+        conn = s.connection()
+        total, count = money_total(conn, user_id, start, end)
+        return total, count, rate_cache.convert(conn, total, BASE_CURRENCY, date.today(), to=currency)
+
+    total, count, converted = await session.run_sync(compute)
+    if converted is None:
+        raise HTTPException(status_code=400, detail=f"No exchange rate for {currency}")
+    return schemas.MoneyTotal(base_currency=BASE_CURRENCY, total=total, investment_count=count,
+                              currency=currency, converted_total=converted)
+
+
+@router.get("/users/{user_id}/money-total", response_model=schemas.MoneyTotal)
+async def get_money_total(user_id: UUID, currency: str = Query(BASE_CURRENCY, max_length=10),
+                          start: Optional[datetime] = None, end: Optional[datetime] = None,
+                          session: AsyncSession = Depends(get_read_session)):
+    """Money invested in start <= invested_at < end across currencies, shown in ``currency``.
+
+    Time in hours is not included; see /summary for per-currency totals.
+    """
+    currency = currency.upper()
+    key = f"money-total:{currency}:{start}:{end}"
+    return await summaries.get_or_compute(
+        user_id, key, lambda: compute_money_total(session, user_id, currency, start, end)
+    )
+
+
+@router.get("/users/{user_id}/portfolio-value", response_model=schemas.PortfolioValue)
+async def get_portfolio_value(user_id: UUID, start: date, end: Optional[date] = None,
+                              session: AsyncSession = Depends(get_read_session)):
+    """Daily market value of the user's ticker holdings, one value per day from start to end."""
+    end = end or date.today()
+    if not 0 <= (end - start).days <= MAX_VALUE_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail=f"start must be before end, at most {MAX_VALUE_SERIES_DAYS} days")
+    days, values, unpriced = await session.run_sync(
+        lambda s: portfolio_value_series(s.connection(), user_id, start, end)
+    )
+    return schemas.PortfolioValue(start=start, end=end, values=values.round(2).tolist(), unpriced_tickers=unpriced)
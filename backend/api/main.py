@@ -0,0 +1,61 @@
+"""FastAPI application.
+
+Every request gets its own AsyncSession from the shared asyncpg pool in
+db.py; read-only user endpoints (listings, summaries, search) get one on a
+replica when routing.py has one that qualifies. Responses are declared with
+Pydantic models, so FastAPI serializes them straight to JSON bytes in
+pydantic-core without an intermediate jsonable_encoder pass. Each request
+runs as one SQL unit of work, so a statement repeated inside it is reported
+as a likely N+1; per-statement metrics are served at /metrics. Timer
+heartbeats are buffered in memory and written in batches by a background
+task that is flushed on shutdown (time_log_buffer.py). Cached summaries
+are dropped when the database NOTIFYs a change to the user's rows
+(api/cache.py).
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from api import children, funnel, investments, search, time_logs
+from api.cache import listener, summaries
+from db import dispose_async_engine
+from instrumentation import registry, unit_of_work
+from routing import routing
+
+
+@asynccontextmanager
+async def lifespan(app):
+    listener.start()
+    time_logs.heartbeats.start()
+    yield
+    await time_logs.heartbeats.stop()
+    await listener.stop()
+    if summaries.shared is not None:
+        await summaries.shared.close()
+    await routing.dispose()
+    await dispose_async_engine()
+
+
+app = FastAPI(title="LifeInvest API", lifespan=lifespan)
+app.include_router(investments.router)
+app.include_router(time_logs.router)
+app.include_router(children.router)
+app.include_router(funnel.router)
+app.include_router(search.router)
+
+
+@app.middleware("http")
+async def sql_unit_of_work(request: Request, call_next):
+    with unit_of_work(f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,233 @@
+"""Request and response models.
+
+Field names match the table columns, and the nested child keys match the
+record layout of bulk_import.py, so batched writes can reuse its splitter.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+InvestmentType = Literal['money', 'time', 'energy']
+FinancialType = Literal['stock', 'crypto', 'real_estate', 'equipment', 'other']
+
+
+class JobApplicationIn(BaseModel):
+    company_name: str = Field(max_length=200)
+    position: str = Field(max_length=200)
+    job_url: Optional[str] = Field(None, max_length=500)
+    salary_range_min: Optional[Decimal] = None
+    salary_range_max: Optional[Decimal] = None
+    application_stage: str = Field(max_length=50)
+    outcome: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = None
+    applied_at: datetime
+
+
+class JobApplication(JobApplicationIn):
+    id: UUID
+    investment_id: UUID
+
+
+class LearningIn(BaseModel):
+    platform: Optional[str] = Field(None, max_length=100)
+    course_name: str = Field(max_length=200)
+    instructor: Optional[str] = Field(None, max_length=200)
+    skills_learned: Optional[list[str]] = None
+    completion_percentage: Optional[Decimal] = Field(None, ge=0, le=100)
+    certification_url: Optional[str] = Field(None, max_length=500)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class Learning(LearningIn):
+    id: UUID
+    investment_id: UUID
+
+
+class FinancialIn(BaseModel):
+    investment_type: FinancialType
+    asset_name: str = Field(max_length=100)
+    ticker_symbol: Optional[str] = Field(None, max_length=20)
+    quantity: Decimal
+    purchase_price: Decimal
+    current_value: Optional[Decimal] = None
+    brokerage: Optional[str] = Field(None, max_length=100)
+    risk_level: Optional[str] = Field(None, max_length=20)
+    dividend_yield: Optional[Decimal] = None
+
+
+class Financial(FinancialIn):
+    id: UUID
+    investment_id: UUID
+
+
+class TimeLogIn(BaseModel):
+    logged_date: date
+    time_spent_minutes: int = Field(gt=0)
+    description: Optional[str] = None
+    productivity_rating: Optional[int] = Field(None, ge=1, le=10)
+
+
+class TimeLog(TimeLogIn):
+    id: UUID
+    investment_id: UUID
+
+
+class TimeLogBatchItem(TimeLogIn):
+    investment_id: UUID
+
+
+class Heartbeat(BaseModel):
+    logged_date: date
+    minutes: int = Field(1, gt=0, le=60)
+    # Client-chosen; resend the same id when retrying so the minutes count once
+    heartbeat_id: Optional[UUID] = None
+
+
+class HeartbeatAccepted(BaseModel):
+    investment_id: UUID
+    logged_date: date
+    pending_minutes: int
+
+
+class InvestmentIn(BaseModel):
+    category_id: UUID
+    type: InvestmentType
+    title: str = Field(max_length=200)
+    description: Optional[str] = None
+    amount_invested: Decimal
+    currency: Optional[str] = Field('hours', max_length=10)
+    invested_at: datetime
+    job_application: Optional[JobApplicationIn] = None
+    learning_investment: Optional[LearningIn] = None
+    financial_investment: Optional[FinancialIn] = None
+    time_logs: list[TimeLogIn] = []
+
+
+class InvestmentUpdate(BaseModel):
+    category_id: Optional[UUID] = None
+    type: Optional[InvestmentType] = None
+    title: Optional[str] = Field(None, max_length=200)
+    description: Optional[str] = None
+    amount_invested: Optional[Decimal] = None
+    currency: Optional[str] = Field(None, max_length=10)
+    invested_at: Optional[datetime] = None
+
+
+class Investment(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: UUID
+    category_id: UUID
+    type: InvestmentType
+    title: str
+    description: Optional[str] = None
+    amount_invested: Decimal
+    currency: Optional[str] = None
+    invested_at: datetime
+    created_at: Optional[datetime] = None
+
+
+class InvestmentListItem(BaseModel):
+    id: UUID
+    category_id: UUID
+    category_name: str
+    type: InvestmentType
+    title: str
+    description: Optional[str] = None
+    amount_invested: Decimal
+    currency: Optional[str] = None
+    invested_at: datetime
+    details: Optional[dict] = None
+    time_logs: Optional[dict] = None
+
+
+class InvestmentPage(BaseModel):
+    items: list[InvestmentListItem]
+    next_cursor: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    created: int
+    ids: list[UUID] = []
+
+
+class TypeTotal(BaseModel):
+    type: InvestmentType
+    currency: str
+    total_amount: Decimal
+    investment_count: int
+
+
+class Summary(BaseModel):
+    totals: list[TypeTotal]
+    child_counts: dict[str, int]
+
+
+class MoneyTotal(BaseModel):
+    base_currency: str
+    total: Decimal
+    investment_count: int
+    currency: str
+    converted_total: Decimal
+
+
+class PeriodTotal(BaseModel):
+    period_start: date
+    total_minutes: int
+    total_hours: Decimal
+    weighted_hours: Decimal
+    avg_productivity: Optional[Decimal] = None
+    days_logged: int
+
+
+class TimeStats(BaseModel):
+    weekly: list[PeriodTotal]
+    monthly: list[PeriodTotal]
+    current_streak: int
+    longest_streak: int
+
+
+class PortfolioValue(BaseModel):
+    start: date
+    end: date
+    values: list[float]
+    unpriced_tickers: list[str] = []
+
+
+class FunnelStep(BaseModel):
+    stage: str
+    reached: int
+    conversion: Optional[float] = None
+
+
+class OutcomeTiming(BaseModel):
+    outcome: str
+    applications: int
+    avg_days: Decimal
+
+
+class JobFunnel(BaseModel):
+    steps: list[FunnelStep]
+    time_to_outcome: list[OutcomeTiming]
+
+
+SearchKind = Literal['investment', 'job_application', 'learning']
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    investment_id: UUID
+    title: str
+    snippet: str
+    rank: float
+    at: datetime
+
+
+class SearchResults(BaseModel):
+    query: str
+    results: list[SearchHit]
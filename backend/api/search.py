@@ -0,0 +1,21 @@
+"""Full-text search endpoint over a user's investments, job applications and courses."""
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import schemas
+from routing import get_read_session
+from search import MAX_LIMIT, search
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/users/{user_id}/search", response_model=schemas.SearchResults)
+async def search_history(user_id: UUID, q: str = Query(min_length=1, max_length=200),
+                         kind: Optional[list[schemas.SearchKind]] = Query(None),
+                         limit: int = Query(20, ge=1, le=MAX_LIMIT), offset: int = Query(0, ge=0, le=10_000),
+                         session: AsyncSession = Depends(get_read_session)):
+    hits = await session.run_sync(lambda s: search(s.connection(), user_id, q, kind, limit, offset))
+    return schemas.SearchResults(query=q, results=hits)
@@ -0,0 +1,130 @@
+"""Time logging endpoints, buffered timer heartbeats and cached per-user time statistics."""
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import schemas
+from api.cache import summaries
+from api.investments import MAX_BATCH, owner_of
+from db import get_async_session
+from routing import get_read_session, note_write
+from time_log_buffer import TimeLogBuffer, TimeLogBufferFull
+from time_log_stats import period_totals, streaks
+
+router = APIRouter(tags=["time logs"])
+
+TIME_LOG_COLUMNS = "id, investment_id, logged_date, time_spent_minutes, description, productivity_rating"
+
+UPSERT = """
+    INSERT INTO time_logs
+    (id, investment_id, logged_date, time_spent_minutes, description, productivity_rating)
+    VALUES
+    (gen_random_uuid(), :investment_id, :logged_date, :time_spent_minutes, :description, :productivity_rating)
+    ON CONFLICT (investment_id, logged_date) DO UPDATE
+    SET time_spent_minutes = EXCLUDED.time_spent_minutes,
+        description = EXCLUDED.description,
+        productivity_rating = EXCLUDED.productivity_rating
+"""
+UPSERT_SQL = text(UPSERT)
+UPSERT_RETURNING_SQL = text(f"{UPSERT} RETURNING {TIME_LOG_COLUMNS}")
+
+
+async def flushed(session, user_ids):
+    await note_write(session, *user_ids)
+    for user_id in user_ids:
+        summaries.invalidate(user_id)
+
+
+# Started and flushed on shutdown by the app lifespan (api/main.py)
+heartbeats = TimeLogBuffer(on_flush=flushed)
+
+
+@router.get("/investments/{investment_id}/time-logs", response_model=list[schemas.TimeLog])
+async def get_time_logs(investment_id: UUID, start: Optional[date] = None, end: Optional[date] = None,
+                        session: AsyncSession = Depends(get_async_session)):
+    await owner_of(session, investment_id)
+    filters = ["investment_id = :investment_id"]
+    if start is not None:
+        filters.append("logged_date >= :start")
+    if end is not None:
+        filters.append("logged_date <= :end")
+    result = await session.execute(text(f"""
+        SELECT {TIME_LOG_COLUMNS} FROM time_logs
+        WHERE {' AND '.join(filters)}
+        ORDER BY logged_date
+    """), {"investment_id": investment_id, "start": start, "end": end})
+    return [dict(row._mapping) for row in result]
+
+
+@router.put("/investments/{investment_id}/time-logs/{logged_date}", response_model=schemas.TimeLog)
+async def put_time_log(investment_id: UUID, logged_date: date, payload: schemas.TimeLogIn,
+                       session: AsyncSession = Depends(get_async_session)):
+    if payload.logged_date != logged_date:
+        raise HTTPException(status_code=422, detail="logged_date in body and path differ")
+    user_id = await owner_of(session, investment_id)
+    params = {"investment_id": investment_id, **payload.model_dump()}
+    row = (await session.execute(UPSERT_RETURNING_SQL, params)).one()
+    await session.commit()
+    await note_write(session, user_id)
+    summaries.invalidate(user_id)
+    return dict(row._mapping)
+
+
+@router.post("/time-logs/batch", response_model=schemas.BatchResult, status_code=201)
+async def create_time_logs_batch(payloads: list[schemas.TimeLogBatchItem],
+                                 session: AsyncSession = Depends(get_async_session)):
+    if len(payloads) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} time logs per batch")
+    if not payloads:
+        return schemas.BatchResult(created=0)
+    investment_ids = list({p.investment_id for p in payloads})
+    owners = (await session.execute(
+        text("SELECT id, user_id FROM investments WHERE id = ANY(:ids)"), {"ids": investment_ids}
+    )).all()
+    if len(owners) != len(investment_ids):
+        raise HTTPException(status_code=404, detail="Investment not found")
+    await session.execute(UPSERT_SQL, [p.model_dump() for p in payloads])
+    await session.commit()
+    user_ids = {owner.user_id for owner in owners}
+    await note_write(session, *user_ids)
+    for user_id in user_ids:
+        summaries.invalidate(user_id)
+    return schemas.BatchResult(created=len(payloads))
+
+
+@router.post("/investments/{investment_id}/heartbeat", response_model=schemas.HeartbeatAccepted,
+             status_code=202)
+async def post_heartbeat(investment_id: UUID, payload: schemas.Heartbeat,
+                         session: AsyncSession = Depends(get_async_session)):
+    """Add timer minutes to the day's time log; written within a few seconds, see time_log_buffer.py."""
+    user_id = heartbeats.owner(investment_id) or await owner_of(session, investment_id)
+    try:
+        pending = heartbeats.add(investment_id, payload.logged_date, payload.minutes, user_id,
+                                 payload.heartbeat_id)
+    except TimeLogBufferFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return schemas.HeartbeatAccepted(investment_id=investment_id, logged_date=payload.logged_date,
+                                     pending_minutes=pending)
+
+
+async def compute_time_stats(session, user_id):
+    def compute(s):
+        conn = s.connection()
+        user_streaks = streaks(conn, user_id)
+        return schemas.TimeStats(
+            weekly=period_totals(conn, user_id, 'week'),
+            monthly=period_totals(conn, user_id, 'month'),
+            current_streak=user_streaks['current'],
+            longest_streak=user_streaks['longest'],
+        )
+    return await session.run_sync(compute)
+
+
+@router.get("/users/{user_id}/time-stats", response_model=schemas.TimeStats)
+async def get_time_stats(user_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    key = ('time-stats', date.today())
+    return await summaries.get_or_compute(user_id, key, lambda: compute_time_stats(session, user_id))
@@ -0,0 +1,171 @@
+"""Benchmark harness for insert throughput and key read-query latency.
+
+Run against a local database seeded with seed_data.py. Each read query is
+run ``--iterations`` times for randomly sampled users and reported as
+p50/p99 in milliseconds. Results can be saved as a baseline and later runs
+compared against it; a query whose p50 or p99 grows by more than
+``--tolerance`` is flagged as a regression and the exit code is non-zero.
+
+Usage:
+    python benchmark.py --insert-users 200 --save-baseline
+    python benchmark.py --compare
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from db import engine
+from investment_listing import list_investments
+from rollups import range_totals
+from seed_data import seed
+from skills import courses_with_skill
+from time_log_stats import period_totals, streaks
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'baseline.json')
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` for 0 < q <= 100."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _deep_page(conn, user_id):
+    page = list_investments(conn, user_id, limit=20)
+    for _ in range(4):
+        if not page['next_cursor']:
+            break
+        page = list_investments(conn, user_id, cursor=page['next_cursor'], limit=20)
+    return page
+
+
+# name -> callable(conn, user_id)
+READ_QUERIES = {
+    'list_first_page': lambda conn, user_id: list_investments(conn, user_id, limit=20),
+    'list_fifth_page': _deep_page,
+    'rollup_range_totals': lambda conn, user_id: range_totals(
+        conn, user_id, date.today() - timedelta(days=365), date.today()),
+    'time_logs_weekly': lambda conn, user_id: period_totals(conn, user_id, 'week'),
+    'time_logs_streaks': lambda conn, user_id: streaks(conn, user_id),
+    'courses_with_skill': lambda conn, user_id: courses_with_skill(conn, 'python', user_id),
+}
+
+
+def sample_users(conn, count, seed=0):
+    """Pick ``count`` random user ids; one scan of users, done once per run."""
+    conn.execute(text("SELECT setseed(:s)"), {"s": (seed % 1000) / 1000})
+    return [row[0] for row in conn.execute(
+        text("SELECT id FROM users ORDER BY random() LIMIT :n"), {"n": count}
+    )]
+
+
+def bench_reads(iterations=100, users=20, queries=None):
+    """Return {query: {"p50_ms", "p99_ms", "mean_ms", "runs"}}."""
+    results = {}
+    with engine.connect() as conn:
+        user_ids = sample_users(conn, users)
+        if not user_ids:
+            raise SystemExit("No users to benchmark; run seed_data.py first")
+        rng = random.Random(1)
+        for name, query in (queries or READ_QUERIES).items():
+            timings = []
+            for _ in range(iterations):
+                user_id = rng.choice(user_ids)
+                started = time.perf_counter()
+                query(conn, user_id)
+                timings.append((time.perf_counter() - started) * 1000)
+                conn.rollback()
+            results[name] = {
+                "p50_ms": round(percentile(timings, 50), 3),
+                "p99_ms": round(percentile(timings, 99), 3),
+                "mean_ms": round(sum(timings) / len(timings), 3),
+                "runs": len(timings),
+            }
+    return results
+
+
+def bench_inserts(users, seed_value=None):
+    """Seed ``users`` extra users and return rows/second for the COPY path.
+
+    The seed decides the new users' ids and emails, so it defaults to a
+    random one per run: repeated runs against the same database add new
+    users instead of colliding with the previous run's.
+    """
+    if seed_value is None:
+        seed_value = random.SystemRandom().randrange(2 ** 48)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        totals = seed(conn, users, seed=seed_value)
+    elapsed = time.perf_counter() - started
+    rows = sum(totals.values())
+    return {"rows": rows, "seconds": round(elapsed, 3), "rows_per_second": round(rows / elapsed, 1),
+            "seed": seed_value}
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (query, metric, baseline, current) that regressed."""
+    regressions = []
+    for name, stats in results.get('reads', {}).items():
+        before = baseline.get('reads', {}).get(name)
+        if not before:
+            continue
+        for metric in ('p50_ms', 'p99_ms'):
+            if stats[metric] > before[metric] * (1 + tolerance):
+                regressions.append((name, metric, before[metric], stats[metric]))
+    inserts, before = results.get('inserts'), baseline.get('inserts')
+    if inserts and before and inserts['rows_per_second'] < before['rows_per_second'] * (1 - tolerance):
+        regressions.append(('inserts', 'rows_per_second', before['rows_per_second'], inserts['rows_per_second']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeInvest benchmarks")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--users', type=int, default=20, help="distinct users sampled for reads")
+    parser.add_argument('--insert-users', type=int, default=0,
+                        help="also measure insert throughput by seeding this many extra users")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    print("⏱️  BENCHMARK")
+    print("=" * 50)
+    results = {}
+    if args.insert_users:
+        results['inserts'] = bench_inserts(args.insert_users)
+        print(f"  inserts: {results['inserts']['rows']:,} rows, "
+              f"{results['inserts']['rows_per_second']:,.0f} rows/s")
+    results['reads'] = bench_reads(args.iterations, args.users)
+    for name, stats in results['reads'].items():
+        print(f"  {name:<22} p50 {stats['p50_ms']:>8.2f} ms   p99 {stats['p99_ms']:>8.2f} ms")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Saved baseline to {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSIONS:")
+            for name, metric, before, now in regressions:
+                print(f"  {name} {metric}: {before} -> {now}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Streaming bulk importer for investments and their specialized child tables.
+
+Records are read one at a time from a CSV or JSONL file, grouped into batches
+and written with one COPY per table per batch (falling back to a multi-row
+executemany when the driver has no COPY support). Parent ids are generated
+client-side, so every child row knows its investment_id before anything is
+sent to the database.
+
+JSONL record:
+    {"user_id": "...", "category_id": "...", "type": "time", "title": "...",
+     "amount_invested": 2.5, "currency": "hours", "invested_at": "...",
+     "learning_investment": {"course_name": "...", "skills_learned": ["sql"]},
+     "time_logs": [{"logged_date": "2024-10-18", "time_spent_minutes": 90}]}
+
+CSV record: the same investment columns, plus dotted columns for the child,
+e.g. ``job_application.company_name`` or ``time_log.logged_date``.
+
+Usage:
+    python bulk_import.py history.jsonl
+    python bulk_import.py history.csv --batch-size 5000
+"""
+import argparse
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from db import engine
+
+INVESTMENT_COLUMNS = [
+    'id', 'user_id', 'category_id', 'type', 'title', 'description',
+    'amount_invested', 'currency', 'invested_at',
+]
+
+# record key -> (table, columns); investment_id is filled in from the parent
+CHILD_TABLES = {
+    'job_application': ('job_applications', [
+        'id', 'investment_id', 'company_name', 'position', 'job_url',
+        'salary_range_min', 'salary_range_max', 'application_stage',
+        'outcome', 'notes', 'applied_at',
+    ]),
+    'learning_investment': ('learning_investments', [
+        'id', 'investment_id', 'platform', 'course_name', 'instructor',
+        'skills_learned', 'completion_percentage', 'certification_url',
+        'started_at', 'completed_at',
+    ]),
+    'financial_investment': ('financial_investments', [
+        'id', 'investment_id', 'investment_type', 'asset_name',
+        'ticker_symbol', 'quantity', 'purchase_price', 'current_value',
+        'brokerage', 'risk_level', 'dividend_yield',
+    ]),
+    'time_logs': ('time_logs', [
+        'id', 'investment_id', 'logged_date', 'time_spent_minutes',
+        'description', 'productivity_rating',
+    ]),
+}
+
+# CSV prefix for a single time log per row
+CSV_TIME_LOG_PREFIX = 'time_log'
+
+# Insert order within a batch: parents first, then children
+TABLE_ORDER = ['investments'] + [table for table, _ in CHILD_TABLES.values()]
+TABLE_COLUMNS = dict([('investments', INVESTMENT_COLUMNS)] + list(CHILD_TABLES.values()))
+
+
+def read_csv_records(path):
+    """Yield nested records from a CSV file, one row at a time."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            record = {}
+            for key, value in row.items():
+                if value == '':
+                    value = None
+                if '.' not in key:
+                    record[key] = value
+                    continue
+                prefix, column = key.split('.', 1)
+                if prefix == CSV_TIME_LOG_PREFIX:
+                    prefix = 'time_logs'
+                record.setdefault(prefix, {})[column] = value
+            time_log = record.get('time_logs')
+            if isinstance(time_log, dict):
+                record['time_logs'] = [time_log] if any(v is not None for v in time_log.values()) else []
+            for key in ('job_application', 'learning_investment', 'financial_investment'):
+                child = record.get(key)
+                if child is not None and all(v is None for v in child.values()):
+                    del record[key]
+            skills = (record.get('learning_investment') or {}).get('skills_learned')
+            if isinstance(skills, str):
+                record['learning_investment']['skills_learned'] = [s.strip() for s in skills.split(';') if s.strip()]
+            yield record
+
+
+def read_jsonl_records(path):
+    """Yield records from a JSONL file, one line at a time."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def read_records(path):
+    if path.endswith('.csv'):
+        return read_csv_records(path)
+    return read_jsonl_records(path)
+
+
+def split_record(record):
+    """Split a nested record into (table, row) pairs, parent first.
+
+    The investment id is generated here when the record has none, and is
+    written into every child row, so no round trip is needed to resolve it.
+    """
+    investment = {column: record.get(column) for column in INVESTMENT_COLUMNS}
+    if investment['id'] is None:
+        investment['id'] = uuid.uuid4()
+    rows = [('investments', investment)]
+
+    for key, (table, columns) in CHILD_TABLES.items():
+        children = record.get(key)
+        if not children:
+            continue
+        if isinstance(children, dict):
+            children = [children]
+        for child in children:
+            row = {column: child.get(column) for column in columns}
+            row['id'] = row['id'] or uuid.uuid4()
+            row['investment_id'] = investment['id']
+            rows.append((table, row))
+    return rows
+
+
+def _copy_value(value):
+    """Render one value in COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (list, tuple)):
+        items = []
+        for item in value:
+            item = str(item).replace('\\', '\\\\').replace('"', '\\"')
+            items.append(f'"{item}"')
+        value = '{' + ','.join(items) + '}'
+    elif isinstance(value, bool):
+        value = 't' if value else 'f'
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (uuid.UUID, Decimal, int, float)):
+        value = str(value)
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+                 .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_rows(conn, table, columns, rows):
+    """Write rows with COPY when the driver supports it, else executemany."""
+    if not rows:
+        return
+    cursor = conn.connection.cursor()
+    if hasattr(cursor, 'copy_expert'):
+        buf = io.StringIO()
+        for row in rows:
+            buf.write('\t'.join(_copy_value(row[column]) for column in columns))
+            buf.write('\n')
+        buf.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+        cursor.close()
+        return
+    cursor.close()
+    placeholders = ', '.join(f':{column}' for column in columns)
+    conn.execute(text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"), rows)
+
+
+class ImportStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = 0
+        self.rows = {table: 0 for table in TABLE_ORDER}
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.total_rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.records} records, {self.total_rows} rows in {self.elapsed:.1f}s "
+                f"({self.rows_per_second:,.0f} rows/s)")
+
+
+def import_records(conn, records, batch_size=1000, stats=None, report=None):
+    """Import records in batches of ``batch_size`` parents, one transaction per batch.
+
+    ``report`` is called with the running stats after every batch.
+    """
+    stats = stats or ImportStats()
+    pending = {table: [] for table in TABLE_ORDER}
+    parents = 0
+
+    def flush():
+        with conn.begin():
+            for table in TABLE_ORDER:
+                copy_rows(conn, table, TABLE_COLUMNS[table], pending[table])
+        for table in TABLE_ORDER:
+            stats.rows[table] += len(pending[table])
+            pending[table].clear()
+        if report:
+            report(stats)
+
+    for record in records:
+        for table, row in split_record(record):
+            pending[table].append(row)
+        parents += 1
+        stats.records += 1
+        if parents >= batch_size:
+            flush()
+            parents = 0
+    if parents:
+        flush()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import investments from CSV or JSONL")
+    parser.add_argument('path', help="CSV or JSONL file")
+    parser.add_argument('--batch-size', type=int, default=1000, help="investments per batch")
+    args = parser.parse_args()
+
+    print("📥 BULK IMPORT")
+    print("=" * 30)
+    with engine.connect() as conn:
+        stats = import_records(
+            conn, read_records(args.path), batch_size=args.batch_size,
+            report=lambda s: print(f"  ... {s.summary()}"),
+        )
+    for table in TABLE_ORDER:
+        print(f"  {table}: {stats.rows[table]} rows")
+    print(f"\n✅ Imported {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
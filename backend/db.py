@@ -0,0 +1,153 @@
+"""Shared database engines and sessions.
+
+Every script and the API service get their connections from here instead of
+calling create_engine() themselves, so pool sizing, pre-ping and statement
+timeouts are configured in one place.
+
+Settings (all optional, read from the environment / .env):
+    DB_POOL_SIZE              connections kept open per process (default 5)
+    DB_MAX_OVERFLOW           extra connections under burst load (default 10)
+    DB_POOL_TIMEOUT           seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE           seconds before a connection is replaced (default 1800)
+    DB_STATEMENT_TIMEOUT_MS   server-side statement_timeout, 0 disables (default 30000)
+    DB_INSTRUMENT             record per-statement metrics, see instrumentation.py (default 1)
+"""
+import os
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Before importing modules that read their settings at import time
+load_dotenv()
+
+import instrumentation  # noqa: E402
+
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+INSTRUMENT = os.getenv('DB_INSTRUMENT', '1') != '0'
+
+
+def _pool_options():
+    return {
+        'pool_size': POOL_SIZE,
+        'max_overflow': MAX_OVERFLOW,
+        'pool_timeout': POOL_TIMEOUT,
+        'pool_recycle': POOL_RECYCLE,
+        'pool_pre_ping': True,
+    }
+
+
+def sync_url(url):
+    """Return ``url`` pinned to psycopg2, the driver in requirements.txt."""
+    url = make_url(url)
+    if url.drivername == 'postgresql':
+        url = url.set(drivername='postgresql+psycopg2')
+    return url
+
+
+def async_url(url):
+    """Return ``url`` rewritten for the asyncpg driver."""
+    return make_url(url).set(drivername='postgresql+asyncpg')
+
+
+def make_engine(url=None, statement_timeout_ms=None, **kwargs):
+    """Create a pooled sync engine for ``url`` (defaults to DATABASE_URL)."""
+    timeout = STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+    connect_args = kwargs.pop('connect_args', {})
+    if timeout:
+        connect_args.setdefault('options', f'-c statement_timeout={timeout}')
+    options = _pool_options()
+    options.update(kwargs)
+    engine = create_engine(sync_url(url or DATABASE_URL), connect_args=connect_args, **options)
+    if INSTRUMENT:
+        instrumentation.install(engine)
+    return engine
+
+
+def make_async_engine(url=None, statement_timeout_ms=None, **kwargs):
+    """Create a pooled asyncpg-backed engine for ``url`` (defaults to DATABASE_URL)."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    timeout = STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+    connect_args = kwargs.pop('connect_args', {})
+    if timeout:
+        connect_args.setdefault('server_settings', {})['statement_timeout'] = str(timeout)
+    options = _pool_options()
+    options.update(kwargs)
+    engine = create_async_engine(async_url(url or DATABASE_URL), connect_args=connect_args, **options)
+    if INSTRUMENT:
+        instrumentation.install(engine.sync_engine)
+    return engine
+
+
+# Creating an engine does not connect, so the sync one is built eagerly
+engine = make_engine()
+SessionLocal = sessionmaker(bind=engine)
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = make_async_engine()
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), expire_on_commit=False)
+    return _async_sessionmaker
+
+
+@contextmanager
+def session_scope():
+    """Yield a session that commits on success and rolls back on error."""
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def async_session_scope():
+    """Async counterpart of session_scope()."""
+    async with get_async_sessionmaker()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_async_session():
+    """FastAPI dependency: one session per request, closed when the request ends."""
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """Close pooled async connections; call on application shutdown."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
@@ -0,0 +1,181 @@
+"""Job-application funnel analytics.
+
+job_application_funnel holds one row per (user, UTC month applied, company,
+stage, outcome) with the application count and the summed days from
+applied_at to outcome_at. Statement-level triggers on job_applications keep
+it current (see migration 5fe51eaf22bf). Every report here aggregates those
+few summary rows, never the applications themselves.
+
+A funnel counts an application as having reached every stage up to its
+current one, in STAGES order. Stages outside that list (e.g. 'rejected')
+count as applied only.
+
+Usage:
+    python funnel.py backfill
+    python funnel.py report <user_id>
+"""
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+
+from db import engine
+from routing import Routing
+
+STAGES = ('applied', 'screening', 'interview', 'offer')
+GROUP_COLUMNS = ('month', 'company_name')
+
+BACKFILL_SQL = """
+    INSERT INTO job_application_funnel
+        (user_id, month, company_name, application_stage, outcome,
+         application_count, outcome_days_sum, outcome_days_count)
+    SELECT user_id, date_trunc('month', applied_at AT TIME ZONE 'UTC')::date,
+           company_name, application_stage, COALESCE(outcome, ''),
+           COUNT(*),
+           COALESCE(SUM(EXTRACT(EPOCH FROM outcome_at - applied_at) / 86400)
+                    FILTER (WHERE outcome_at IS NOT NULL), 0),
+           COUNT(outcome_at)
+    FROM job_applications
+    {where}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def backfill(conn, user_id=None):
+    """Rebuild the funnel table from job_applications, for one user or everyone."""
+    with conn.begin():
+        conn.execute(text("LOCK TABLE job_applications IN SHARE MODE"))
+        if user_id is None:
+            conn.execute(text("TRUNCATE job_application_funnel"))
+            result = conn.execute(text(BACKFILL_SQL.format(where="")))
+        else:
+            conn.execute(text("DELETE FROM job_application_funnel WHERE user_id = :user_id"),
+                         {"user_id": user_id})
+            result = conn.execute(text(BACKFILL_SQL.format(where="WHERE user_id = :user_id")),
+                                  {"user_id": user_id})
+        return result.rowcount
+
+
+def _filters(user_id, start=None, end=None, company=None):
+    filters = ["user_id = :user_id"]
+    params = {"user_id": user_id}
+    if start is not None:
+        filters.append("month >= date_trunc('month', CAST(:start AS date))")
+        params["start"] = start
+    if end is not None:
+        filters.append("month <= :end")
+        params["end"] = end
+    if company is not None:
+        filters.append("company_name = :company")
+        params["company"] = company
+    return ' AND '.join(filters), params
+
+
+def stage_counts(conn, user_id, start=None, end=None, company=None, group_by=()):
+    """Applications per stage and outcome, optionally per month and/or company.
+
+    ``start`` and ``end`` bound the month applied (any day within a month
+    selects that month).
+    """
+    for column in group_by:
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group the funnel by {column!r}")
+    where, params = _filters(user_id, start, end, company)
+    columns = ', '.join(tuple(group_by) + ('application_stage', 'outcome'))
+    result = conn.execute(text(f"""
+        SELECT {columns}, SUM(application_count) AS applications
+        FROM job_application_funnel
+        WHERE {where}
+        GROUP BY {columns}
+        ORDER BY {columns}
+    """), params)
+    return [dict(row._mapping) for row in result]
+
+
+def funnel(counts):
+    """Turn stage_counts() rows into [{"stage", "reached", "conversion"}] in STAGES order.
+
+    ``conversion`` is the share of applications at the previous stage that
+    reached this one (None for the first stage or an empty previous stage).
+    """
+    at_stage = dict.fromkeys(STAGES, 0)
+    total = 0
+    for row in counts:
+        total += row['applications']
+        if row['application_stage'] in at_stage:
+            at_stage[row['application_stage']] += row['applications']
+
+    steps, previous = [], None
+    for position, stage in enumerate(STAGES):
+        reached = total if position == 0 else sum(at_stage[later] for later in STAGES[position:])
+        steps.append({
+            "stage": stage,
+            "reached": reached,
+            "conversion": round(reached / previous, 4) if previous else None,
+        })
+        previous = reached
+    return steps
+
+
+def company_funnels(conn, user_id, start=None, end=None):
+    """{company: funnel steps} for every company the user applied to."""
+    by_company = {}
+    for row in stage_counts(conn, user_id, start, end, group_by=('company_name',)):
+        by_company.setdefault(row['company_name'], []).append(row)
+    return {company: funnel(rows) for company, rows in by_company.items()}
+
+
+def monthly_funnels(conn, user_id, start=None, end=None, company=None):
+    """{month: funnel steps}, oldest month first."""
+    by_month = {}
+    for row in stage_counts(conn, user_id, start, end, company, group_by=('month',)):
+        by_month.setdefault(row['month'], []).append(row)
+    return {month: funnel(rows) for month, rows in by_month.items()}
+
+
+def time_to_outcome(conn, user_id, start=None, end=None, company=None):
+    """Average days from applied_at to outcome_at per outcome, for applications with an outcome_at."""
+    where, params = _filters(user_id, start, end, company)
+    result = conn.execute(text(f"""
+        SELECT outcome,
+               SUM(outcome_days_count) AS applications,
+               ROUND(SUM(outcome_days_sum) / NULLIF(SUM(outcome_days_count), 0), 1) AS avg_days
+        FROM job_application_funnel
+        WHERE {where} AND outcome <> ''
+        GROUP BY outcome
+        HAVING SUM(outcome_days_count) > 0
+        ORDER BY outcome
+    """), params)
+    return [dict(row._mapping) for row in result]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job-application funnel analytics")
+    sub = parser.add_subparsers(dest='command', required=True)
+    backfill_parser = sub.add_parser('backfill', help="rebuild the funnel table from job_applications")
+    backfill_parser.add_argument('--user', help="only rebuild this user's rows")
+    report_parser = sub.add_parser('report', help="print a user's funnel")
+    report_parser.add_argument('user_id')
+    report_parser.add_argument('--start', type=date.fromisoformat)
+    report_parser.add_argument('--end', type=date.fromisoformat)
+    report_parser.add_argument('--company')
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        with engine.connect() as conn:
+            rows = backfill(conn, user_id=args.user)
+        print(f"✅ Rebuilt {rows} funnel rows")
+        return
+    with Routing().read(args.user_id) as conn:
+        counts = stage_counts(conn, args.user_id, args.start, args.end, args.company)
+        print("🎯 APPLICATION FUNNEL")
+        print("=" * 30)
+        for step in funnel(counts):
+            conversion = f"{step['conversion']:.0%}" if step['conversion'] is not None else ""
+            print(f"  {step['stage']:<10} {step['reached']:>6}  {conversion}")
+        for row in time_to_outcome(conn, args.user_id, args.start, args.end, args.company):
+            print(f"  ⏱️  {row['outcome']}: {row['avg_days']} days on average ({row['applications']})")
+
+
+if __name__ == "__main__":
+    main()
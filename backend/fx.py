@@ -0,0 +1,288 @@
+"""Exchange rates and base-currency amounts.
+
+fx_rates stores, per currency and day, how many units of the base currency
+(FX_BASE_CURRENCY, default USD) one unit buys. A trigger keeps
+investments.amount_normalized = amount_invested at the latest rate on or
+before the investment's UTC date (migration 0c8bdfb006da), so a user's
+money total is one SUM over a partial covering index. Time in 'hours' has
+no rate and is never normalized; it is totalled separately (rollups.py).
+
+Rates files are CSV with ``date,base,currency,rate`` columns, where one
+``base`` buys ``rate`` units of ``currency`` (the ECB layout: 2026-10-16,
+EUR, USD, 1.0871). Any file base works as long as each date also quotes
+FX_BASE_CURRENCY; rates are cross-converted into it on load. Loading
+re-normalizes the investments whose rates changed in one statement.
+
+RateCache keeps each currency's rate history in process memory for
+conversions in Python, e.g. showing a base-currency total in EUR.
+
+Usage:
+    python fx.py load rates.csv [--rebase]
+    python fx.py status
+    python fx.py total <user_id> [--currency EUR]
+"""
+import argparse
+import bisect
+import csv
+import os
+import time
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import text
+
+from bulk_import import copy_rows
+from db import engine
+
+BASE_CURRENCY = os.getenv('FX_BASE_CURRENCY', 'USD').upper()
+RATE_CACHE_TTL_S = int(os.getenv('FX_RATE_CACHE_TTL_S', '3600'))
+# The base currency is stored with rate 1 from this date, so it converts at any date
+BASE_ROW_DATE = date(1900, 1, 1)
+RATE_PLACES = Decimal('1e-10')
+STAGING_TABLE = 'fx_rate_staging'
+
+CREATE_STAGING_SQL = text(f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        currency varchar(10) NOT NULL,
+        rate_date date NOT NULL,
+        rate numeric(20, 10) NOT NULL,
+        PRIMARY KEY (currency, rate_date)
+    ) ON COMMIT DROP
+""")
+
+UPSERT_SQL = text(f"""
+    INSERT INTO fx_rates AS r (currency, rate_date, rate)
+    SELECT currency, rate_date, rate FROM {STAGING_TABLE}
+    ON CONFLICT (currency, rate_date) DO UPDATE
+    SET rate = EXCLUDED.rate
+    WHERE r.rate IS DISTINCT FROM EXCLUDED.rate
+    RETURNING currency, rate_date
+""")
+
+# Recompute amount_normalized for investments in ``currencies`` (all when
+# NULL) invested on or after ``since`` (all when NULL). Leaves the columns
+# the trigger watches untouched, so the trigger keeps the value set here.
+RENORMALIZE_SQL = text("""
+    UPDATE investments i
+    SET amount_normalized = n.value
+    FROM (
+        SELECT i.id, round(i.amount_invested * r.rate, 2) AS value
+        FROM investments i
+        LEFT JOIN LATERAL (
+            SELECT rate FROM fx_rates
+            WHERE currency = upper(i.currency)
+              AND rate_date <= (i.invested_at AT TIME ZONE 'UTC')::date
+            ORDER BY rate_date DESC
+            LIMIT 1
+        ) r ON true
+        WHERE (CAST(:currencies AS text[]) IS NULL OR upper(i.currency) = ANY(CAST(:currencies AS text[])))
+          AND (CAST(:since AS date) IS NULL OR i.invested_at >= CAST(:since AS date)::timestamp AT TIME ZONE 'UTC')
+    ) n
+    WHERE i.id = n.id AND i.amount_normalized IS DISTINCT FROM n.value
+""")
+
+MONEY_TOTAL_SQL = """
+    SELECT COALESCE(SUM(amount_normalized), 0) AS total, COUNT(*) AS investments
+    FROM investments
+    WHERE user_id = :user_id AND amount_normalized IS NOT NULL {range}
+"""
+
+
+class FxRateError(ValueError):
+    pass
+
+
+def read_rates(path):
+    """Return [(date, BASE, CURRENCY, Decimal rate)] from a date,base,currency,rate CSV."""
+    rates = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                day = date.fromisoformat((row.get('date') or '').strip())
+            except ValueError:
+                raise FxRateError(f"{path}:{line}: bad date {row.get('date')!r}")
+            base, currency = (row.get('base') or '').strip().upper(), (row.get('currency') or '').strip().upper()
+            if not base or not currency or len(base) > 10 or len(currency) > 10:
+                raise FxRateError(f"{path}:{line}: missing or too long base/currency")
+            try:
+                rate = Decimal((row.get('rate') or '').strip())
+            except InvalidOperation:
+                raise FxRateError(f"{path}:{line}: bad rate {row.get('rate')!r} for {currency}")
+            if not rate.is_finite() or rate <= 0:
+                raise FxRateError(f"{path}:{line}: bad rate {rate} for {currency}")
+            rates.append((day, base, currency, rate))
+    return rates
+
+
+def rebase(rates, base=BASE_CURRENCY):
+    """Convert quotes to {(currency, date): base units per unit}, plus the dates lacking ``base``.
+
+    One ``file base`` buys ``rate`` of a currency, so one unit of that
+    currency is worth quote(base) / rate in ``base``.
+    """
+    quotes = defaultdict(dict)
+    for day, file_base, currency, rate in rates:
+        day_quotes = quotes[(day, file_base)]
+        day_quotes[file_base] = Decimal(1)
+        day_quotes[currency] = rate
+    converted, missing = {}, set()
+    for (day, _), day_quotes in quotes.items():
+        if base not in day_quotes:
+            missing.add(day)
+            continue
+        for currency, rate in day_quotes.items():
+            if currency != base:
+                converted[(currency, day)] = (day_quotes[base] / rate).quantize(RATE_PLACES)
+    return converted, sorted(missing)
+
+
+def current_base(conn):
+    return conn.execute(text("SELECT currency FROM fx_rates WHERE rate_date = :day"),
+                        {"day": BASE_ROW_DATE}).scalar()
+
+
+def renormalize(conn, currencies=None, since=None):
+    """Recompute amount_normalized in one statement; returns the rows changed."""
+    return conn.execute(RENORMALIZE_SQL, {
+        "currencies": sorted(currencies) if currencies is not None else None, "since": since,
+    }).rowcount
+
+
+def load_rates(conn, rates, base=BASE_CURRENCY, replace=False):
+    """Store converted rates and re-normalize affected investments in one transaction.
+
+    ``rates`` is {(currency, date): rate in ``base``}. Stored rates in
+    another base are refused unless ``replace`` drops them all first.
+    Returns {"rates", "changed", "investments"}.
+    """
+    with conn.begin():
+        stored_base = current_base(conn)
+        if stored_base and stored_base != base and not replace:
+            raise FxRateError(f"fx_rates holds {stored_base} rates; load with --rebase to switch to {base}")
+        if replace:
+            conn.execute(text("DELETE FROM fx_rates"))
+        rows = [{'currency': currency, 'rate_date': day, 'rate': rate} for (currency, day), rate in rates.items()]
+        rows.append({'currency': base, 'rate_date': BASE_ROW_DATE, 'rate': Decimal(1)})
+        conn.execute(text(f"DROP TABLE IF EXISTS pg_temp.{STAGING_TABLE}"))
+        conn.execute(CREATE_STAGING_SQL)
+        copy_rows(conn, STAGING_TABLE, ['currency', 'rate_date', 'rate'], rows)
+        changed = conn.execute(UPSERT_SQL).all()
+        if replace:
+            investments = renormalize(conn)
+        elif changed:
+            investments = renormalize(conn, {row.currency for row in changed},
+                                      min(row.rate_date for row in changed))
+        else:
+            investments = 0
+    rate_cache.clear()
+    return {"rates": len(rows), "changed": len(changed), "investments": investments}
+
+
+def money_total(conn, user_id, start=None, end=None):
+    """Sum of a user's money investments in the base currency, start <= invested_at < end.
+
+    Returns (total, investments counted). Answered from the partial index
+    on (user_id, invested_at) INCLUDE (amount_normalized).
+    """
+    filters, params = [], {"user_id": user_id}
+    if start is not None:
+        filters.append("AND invested_at >= :start")
+        params["start"] = start
+    if end is not None:
+        filters.append("AND invested_at < :end")
+        params["end"] = end
+    row = conn.execute(text(MONEY_TOTAL_SQL.format(range=' '.join(filters))), params).one()
+    return row.total, row.investments
+
+
+class RateCache:
+    """Per-currency rate history held in memory for ``ttl`` seconds."""
+
+    def __init__(self, ttl=RATE_CACHE_TTL_S, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._series = {}
+
+    def clear(self):
+        self._series.clear()
+
+    def series(self, conn, currency):
+        """(dates, rates) for ``currency``, oldest first."""
+        currency = currency.upper()
+        cached = self._series.get(currency)
+        if cached is None or cached[0] <= self.clock():
+            rows = conn.execute(text(
+                "SELECT rate_date, rate FROM fx_rates WHERE currency = :currency ORDER BY rate_date"
+            ), {"currency": currency}).all()
+            cached = (self.clock() + self.ttl, [row.rate_date for row in rows], [row.rate for row in rows])
+            self._series[currency] = cached
+        return cached[1], cached[2]
+
+    def rate(self, conn, currency, on):
+        """Base units per unit of ``currency`` on day ``on`` (latest earlier rate), or None."""
+        dates, rates = self.series(conn, currency)
+        position = bisect.bisect_right(dates, on) - 1
+        return rates[position] if position >= 0 else None
+
+    def convert(self, conn, amount, currency, on, to=BASE_CURRENCY):
+        """``amount`` of ``currency`` in ``to`` at the rates of day ``on``; None without a rate."""
+        if currency.upper() == to.upper():
+            return amount
+        from_rate, to_rate = self.rate(conn, currency, on), self.rate(conn, to, on)
+        if from_rate is None or to_rate is None:
+            return None
+        return (Decimal(amount) * from_rate / to_rate).quantize(Decimal('0.01'))
+
+
+rate_cache = RateCache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exchange rates and base-currency totals")
+    sub = parser.add_subparsers(dest='command', required=True)
+    load_parser = sub.add_parser('load', help="load a date,base,currency,rate CSV")
+    load_parser.add_argument('path')
+    load_parser.add_argument('--rebase', action='store_true',
+                             help=f"replace rates stored in another base with {BASE_CURRENCY} rates")
+    sub.add_parser('status', help="show loaded rates and unconverted investments")
+    total_parser = sub.add_parser('total', help="print a user's money total")
+    total_parser.add_argument('user_id')
+    total_parser.add_argument('--currency', default=BASE_CURRENCY)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if args.command == 'load':
+            try:
+                rates, missing = rebase(read_rates(args.path))
+                result = load_rates(conn, rates, replace=args.rebase)
+            except FxRateError as e:
+                raise SystemExit(f"❌ {e}")
+            print(f"💱 Loaded {result['rates']:,} {BASE_CURRENCY} rates ({result['changed']:,} new or changed)")
+            print(f"  re-normalized {result['investments']:,} investments")
+            if missing:
+                print(f"⚠️  Skipped {len(missing)} dates without a {BASE_CURRENCY} quote, e.g. {missing[0]}")
+        elif args.command == 'status':
+            print(f"💱 FX RATES (base {current_base(conn) or 'none loaded'})")
+            print("=" * 30)
+            for row in conn.execute(text("""
+                SELECT currency, min(rate_date) AS first, max(rate_date) AS last, count(*) AS days
+                FROM fx_rates WHERE rate_date > :base_day GROUP BY currency ORDER BY currency
+            """), {"base_day": BASE_ROW_DATE}):
+                print(f"  {row.currency}: {row.days:,} days, {row.first} .. {row.last}")
+            for row in conn.execute(text("""
+                SELECT currency, count(*) AS investments FROM investments
+                WHERE amount_normalized IS NULL AND currency IS NOT NULL AND lower(currency) <> 'hours'
+                GROUP BY currency ORDER BY 2 DESC
+            """)):
+                print(f"⚠️  {row.investments:,} {row.currency} investments have no rate")
+        else:
+            total, count = money_total(conn, args.user_id)
+            shown = rate_cache.convert(conn, total, BASE_CURRENCY, date.today(), to=args.currency)
+            print(f"💰 {count:,} money investments: {total:,.2f} {BASE_CURRENCY}"
+                  + (f" = {shown:,.2f} {args.currency}" if shown is not None and args.currency != BASE_CURRENCY
+                     else ""))
+
+
+if __name__ == "__main__":
+    main()
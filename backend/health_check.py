@@ -1,52 +1,152 @@
-import os
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
-
-load_dotenv()
-
-engine = create_engine(os.getenv('DATABASE_URL'))
-
-print("🏥 DATABASE HEALTH CHECK")
-print("=" * 50)
-
-with engine.connect() as conn:
-    # Check table counts
-    result = conn.execute(text("""
-        SELECT table_name, 
-               (SELECT COUNT(*) FROM information_schema.columns WHERE table_name = t.table_name) as column_count
-        FROM information_schema.tables t
-        WHERE table_schema = 'public' AND table_name != 'alembic_version'
-        ORDER BY table_name
-    """))
-    
+"""Database health check.
+
+By default every number comes from one catalog query (pg_class and
+pg_stat_user_tables), so the check never scans a table. Partitioned tables
+such as time_logs are reported once, with their partitions' rows. ``--exact`` counts
+rows instead, one table per connection in parallel, bounded by ``--budget``
+seconds; tables that do not finish in time are reported as timed out.
+
+Usage:
+    python health_check.py
+    python health_check.py --exact --workers 4 --budget 5
+    python health_check.py --json
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from sqlalchemy import text
+
+from db import engine
+
+# Partitioned tables hold no rows themselves: their rows are added up over
+# the leaf partitions (pg_partition_tree returns a plain table as its own leaf)
+TABLE_STATS_SQL = text("""
+    SELECT c.relname AS table_name,
+           (SELECT count(*) FROM pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped) AS column_count,
+           (SELECT COALESCE(sum(COALESCE(s.n_live_tup, GREATEST(leaf.reltuples, 0))), 0)
+            FROM pg_partition_tree(c.oid) tree
+            JOIN pg_class leaf ON leaf.oid = tree.relid
+            LEFT JOIN pg_stat_user_tables s ON s.relid = tree.relid
+            WHERE tree.isleaf)::bigint AS estimated_rows
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relkind IN ('r', 'p')
+      AND NOT c.relispartition
+      AND c.relname != 'alembic_version'
+    ORDER BY c.relname
+""")
+
+
+def table_stats(conn):
+    """Return {table: {"columns": n, "rows": estimate}} from the catalog."""
+    return {
+        row.table_name: {"columns": row.column_count, "rows": row.estimated_rows}
+        for row in conn.execute(TABLE_STATS_SQL)
+    }
+
+
+def _count_rows(table, deadline):
+    """COUNT(*) with a statement_timeout of the time left until ``deadline`` (time.monotonic())."""
+    with engine.connect() as conn:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise TimeoutError(f"no time left to count {table}")
+        with conn.begin():
+            conn.execute(text(f"SET LOCAL statement_timeout = {remaining_ms}"))
+            return conn.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar()
+
+
+def exact_counts(tables, workers=4, budget=10.0):
+    """Count rows of ``tables`` in parallel connections within ``budget`` seconds.
+
+    Returns {table: count}, with None for tables that timed out or failed.
+    """
+    counts = {table: None for table in tables}
+    if not tables:
+        return counts
+    deadline = time.monotonic() + budget
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = {pool.submit(_count_rows, table, deadline): table for table in tables}
+    done, _ = wait(futures, timeout=budget)
+    # Each count's statement_timeout ends at the deadline, including counts
+    # that started late behind others; don't wait for them here
+    pool.shutdown(wait=False, cancel_futures=True)
+    for future in done:
+        if future.exception() is None:
+            counts[futures[future]] = future.result()
+    return counts
+
+
+def check_health(exact=False, workers=4, budget=10.0):
+    """Collect the health report as a plain dict."""
+    started = time.perf_counter()
+    report = {"status": "ok", "mode": "exact" if exact else "estimate", "tables": {}}
+    try:
+        with engine.connect() as conn:
+            stats = table_stats(conn)
+    except Exception as e:
+        report.update(status="error", error=str(e))
+        return report
+
+    if exact:
+        counts = exact_counts(list(stats), workers=workers, budget=budget)
+        for table, count in counts.items():
+            stats[table]["rows"] = count
+        if any(count is None for count in counts.values()):
+            report["status"] = "degraded"
+
+    report["tables"] = stats
+    report["total_tables"] = len(stats)
+    report["total_columns"] = sum(t["columns"] for t in stats.values())
+    report["all_empty"] = all(t["rows"] == 0 for t in stats.values())
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def print_report(report):
+    print("🏥 DATABASE HEALTH CHECK")
+    print("=" * 50)
+    if report["status"] == "error":
+        print(f"❌ Could not reach the database: {report['error']}")
+        return
+
     print("\n📋 TABLE OVERVIEW:")
-    total_tables = 0
-    total_columns = 0
-    for table in result:
-        print(f"  {table[0]}: {table[1]} columns")
-        total_tables += 1
-        total_columns += table[1]
-    
-    print(f"\n📊 TOTALS: {total_tables} tables, {total_columns} columns")
-    
-    # Check empty tables
-    print("\n🔍 EMPTY TABLES CHECK:")
-    result = conn.execute(text("""
-        SELECT table_name
-        FROM information_schema.tables 
-        WHERE table_schema = 'public' 
-        AND table_name != 'alembic_version'
-        ORDER BY table_name
-    """))
-    
-    all_empty = True
-    for table in result:
-        count_result = conn.execute(text(f"SELECT COUNT(*) FROM {table[0]}"))
-        count = count_result.scalar()
-        status = "✅ EMPTY" if count == 0 else f"❌ {count} rows"
-        print(f"  {table[0]}: {status}")
-        if count > 0:
-            all_empty = False
-    
-    print(f"\n🎯 HEALTH STATUS: {'✅ EXCELLENT' if all_empty else '⚠️  NEEDS CLEANUP'}")
-    print("💡 Database is ready for Day 4 development!")
+    approx = "" if report["mode"] == "exact" else "~"
+    for table, stats in report["tables"].items():
+        rows = stats["rows"]
+        if rows is None:
+            status = "⏱️  timed out"
+        elif rows == 0:
+            status = "✅ EMPTY"
+        else:
+            status = f"{approx}{rows} rows"
+        print(f"  {table}: {stats['columns']} columns, {status}")
+
+    print(f"\n📊 TOTALS: {report['total_tables']} tables, {report['total_columns']} columns")
+    print(f"⏱️  {report['mode']} check took {report['elapsed_ms']} ms")
+    print(f"\n🎯 HEALTH STATUS: {'✅ EXCELLENT' if report['all_empty'] else '⚠️  NEEDS CLEANUP'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeInvest database health check")
+    parser.add_argument('--exact', action='store_true', help="count rows instead of using estimates")
+    parser.add_argument('--workers', type=int, default=4, help="parallel connections for --exact")
+    parser.add_argument('--budget', type=float, default=10.0, help="seconds allowed for --exact counts")
+    parser.add_argument('--json', action='store_true', help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = check_health(exact=args.exact, workers=args.workers, budget=args.budget)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
+    sys.exit(0 if report["status"] != "error" else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""SQL instrumentation: latency histograms, slow-query log and N+1 detection.
+
+install(engine) hooks the engine's cursor events. Every statement is
+normalized (literals, bind placeholders and IN/VALUES lists collapsed), so
+the same query with different parameters lands in one histogram, along
+with the number of rows it returned or changed.
+
+Statements slower than DB_SLOW_QUERY_MS (default 200) are logged on the
+``lifeinvest.sql`` logger with their bind parameters redacted to types.
+Inside unit_of_work() (the API wraps every request in one), a statement
+that runs DB_N_PLUS_ONE_THRESHOLD times (default 10) is logged once as a
+likely N+1 and counted.
+
+db.py installs this on its engines unless DB_INSTRUMENT=0. To read the
+numbers, fetch /metrics (Prometheus text) from the API, or run a script
+under the CLI and get a report when it exits:
+
+    python instrumentation.py benchmark.py --iterations 20
+    python instrumentation.py --format prometheus seed_data.py --users 50
+"""
+import argparse
+import bisect
+import hashlib
+import logging
+import os
+import re
+import runpy
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger('lifeinvest.sql')
+
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '200'))
+N_PLUS_ONE_THRESHOLD = int(os.getenv('DB_N_PLUS_ONE_THRESHOLD', '10'))
+
+# Histogram upper bounds in seconds; +Inf is implicit
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?\b')
+# psycopg2 %(name)s / %s, asyncpg $1, SQLAlchemy :name
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|\$\d+|(?<!:):\w+')
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_ROWS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+
+
+def normalize(statement):
+    """Return ``statement`` with literals and parameters replaced by ``?``."""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _STRING.sub('?', statement)
+    statement = _PLACEHOLDER.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _LIST.sub('(...)', statement)
+    return _ROWS.sub('(...)', statement)
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def redact(parameters):
+    """Describe bind parameters by type only, never by value."""
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return [type(value).__name__ for value in parameters]
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return type(parameters).__name__
+
+
+class StatementStats:
+    __slots__ = ('statement', 'count', 'total_seconds', 'max_seconds', 'rows', 'buckets', 'n_plus_one')
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.n_plus_one = 0
+
+    @property
+    def mean_seconds(self):
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-quantile (0 < q <= 1)."""
+        target, seen = q * self.count, 0
+        for bound, hits in zip(BUCKETS + (float('inf'),), self.buckets):
+            seen += hits
+            if seen >= target:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+
+class QueryStats:
+    """Thread-safe registry of per-statement statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statements = {}
+        self.slow_queries = 0
+
+    def record(self, statement, seconds, rows):
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(statement)
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if rows is not None and rows >= 0:
+                stats.rows += rows
+            stats.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def record_slow(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def record_n_plus_one(self, statement):
+        with self._lock:
+            stats = self._statements.get(fingerprint(statement))
+            if stats is not None:
+                stats.n_plus_one += 1
+
+    def snapshot(self):
+        """Return {fingerprint: StatementStats}, a copy safe to read without the lock."""
+        with self._lock:
+            copies = {}
+            for key, stats in self._statements.items():
+                copy = StatementStats(stats.statement)
+                for name in StatementStats.__slots__[1:]:
+                    value = getattr(stats, name)
+                    setattr(copy, name, list(value) if isinstance(value, list) else value)
+                copies[key] = copy
+            return copies
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries = 0
+
+    def prometheus(self):
+        """Render the registry in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP lifeinvest_sql_statement_duration_seconds Statement latency by normalized statement.',
+            '# TYPE lifeinvest_sql_statement_duration_seconds histogram',
+        ]
+        for key, stats in snapshot.items():
+            labels = f'fingerprint="{key}",statement="{_label(stats.statement)}"'
+            cumulative = 0
+            for bound, hits in zip(BUCKETS + ('+Inf',), stats.buckets):
+                cumulative += hits
+                lines.append(f'lifeinvest_sql_statement_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'lifeinvest_sql_statement_duration_seconds_sum{{{labels}}} {stats.total_seconds:.6f}')
+            lines.append(f'lifeinvest_sql_statement_duration_seconds_count{{{labels}}} {stats.count}')
+        lines += [
+            '# HELP lifeinvest_sql_statement_rows_total Rows returned or affected by normalized statement.',
+            '# TYPE lifeinvest_sql_statement_rows_total counter',
+        ]
+        lines += [f'lifeinvest_sql_statement_rows_total{{fingerprint="{key}"}} {stats.rows}'
+                  for key, stats in snapshot.items()]
+        lines += [
+            '# HELP lifeinvest_sql_n_plus_one_total Units of work in which the statement repeated like an N+1.',
+            '# TYPE lifeinvest_sql_n_plus_one_total counter',
+        ]
+        lines += [f'lifeinvest_sql_n_plus_one_total{{fingerprint="{key}"}} {stats.n_plus_one}'
+                  for key, stats in snapshot.items() if stats.n_plus_one]
+        lines += [
+            '# HELP lifeinvest_sql_slow_queries_total Statements slower than the slow-query threshold.',
+            '# TYPE lifeinvest_sql_slow_queries_total counter',
+            f'lifeinvest_sql_slow_queries_total {self.slow_queries}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def report(self, top=20):
+        """Plain-text table of the statements with the most total time."""
+        snapshot = sorted(self.snapshot().values(), key=lambda s: s.total_seconds, reverse=True)
+        lines = [f"{'calls':>8} {'total ms':>10} {'mean ms':>9} {'p95 ms':>8} {'rows':>9} {'N+1':>4}  statement"]
+        for stats in snapshot[:top]:
+            lines.append(
+                f"{stats.count:>8} {stats.total_seconds * 1000:>10.1f} {stats.mean_seconds * 1000:>9.2f} "
+                f"{stats.quantile(0.95) * 1000:>8.1f} {stats.rows:>9} {stats.n_plus_one:>4}  "
+                f"{stats.statement[:120]}"
+            )
+        lines.append(f"\n{len(snapshot)} distinct statements, {self.slow_queries} slow queries")
+        return '\n'.join(lines)
+
+
+def _label(value, limit=200):
+    value = value[:limit]
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = QueryStats()
+_installed = weakref.WeakSet()
+
+# Per request / unit of work: {normalized statement: executions}
+_unit = ContextVar('lifeinvest_sql_unit', default=None)
+
+
+@contextmanager
+def unit_of_work(name):
+    """Count statements run inside the block so repeated ones can be flagged."""
+    token = _unit.set({'name': name, 'counts': {}})
+    try:
+        yield
+    finally:
+        _unit.reset(token)
+
+
+def _check_n_plus_one(statement, stats):
+    unit = _unit.get()
+    if unit is None:
+        return
+    counts = unit['counts']
+    counts[statement] = counts.get(statement, 0) + 1
+    if counts[statement] == N_PLUS_ONE_THRESHOLD:
+        stats.record_n_plus_one(statement)
+        logger.warning("Possible N+1 in %s: statement ran %d times: %s",
+                       unit['name'], N_PLUS_ONE_THRESHOLD, statement[:300])
+
+
+def install(engine, stats=None):
+    """Attach the listeners to a sync ``engine`` (use async_engine.sync_engine for async)."""
+    stats = stats or registry
+    if engine in _installed:
+        return engine
+    _installed.add(engine)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        normalized = normalize(statement)
+        stats.record(normalized, elapsed, getattr(cursor, 'rowcount', None))
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            stats.record_slow()
+            logger.warning("Slow query (%.1f ms): %s params=%s", elapsed * 1000, normalized[:500],
+                           redact(parameters))
+        _check_n_plus_one(normalized, stats)
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(context):
+        started = context.connection.info.get('query_started') if context.connection else None
+        if started:
+            started.pop()
+
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a script with SQL instrumentation and report")
+    parser.add_argument('--format', choices=['text', 'prometheus'], default='text')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    try:
+        runpy.run_path(args.script, run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"⚠️  {args.script} exited with {e.code}")
+    if args.format == 'prometheus':
+        print(registry.prometheus(), end='')
+    else:
+        print("\n📊 SQL REPORT")
+        print("=" * 50)
+        print(registry.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
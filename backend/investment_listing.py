@@ -0,0 +1,155 @@
+"""Keyset pagination over a user's investment history.
+
+Pages are ordered newest first by (invested_at, id). Instead of OFFSET, each
+page carries an opaque cursor holding the (invested_at, id) of its last row,
+and the next page seeks past it through ix_investments_user_date, so page
+1000 costs the same as page 1.
+
+Usage:
+    python investment_listing.py <user_id> [--cursor CURSOR] [--limit 20]
+"""
+import argparse
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import text
+
+from db import engine
+
+MAX_LIMIT = 100
+
+# Specialized children that have at most one row per investment
+CHILD_COLUMNS = {
+    'job_application': ('j', [
+        'company_name', 'position', 'job_url', 'salary_range_min', 'salary_range_max',
+        'application_stage', 'outcome', 'applied_at',
+    ]),
+    'learning': ('l', [
+        'platform', 'course_name', 'instructor', 'skills_learned',
+        'completion_percentage', 'started_at', 'completed_at',
+    ]),
+    'financial': ('f', [
+        'investment_type', 'asset_name', 'ticker_symbol', 'quantity',
+        'purchase_price', 'current_value',
+    ]),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(invested_at, investment_id):
+    payload = json.dumps([invested_at.isoformat(), str(investment_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (invested_at, id) from a cursor made by encode_cursor()."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        invested_at, investment_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(invested_at), uuid.UUID(investment_id)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def _select_children():
+    columns = []
+    for alias, names in CHILD_COLUMNS.values():
+        columns.extend(f"{alias}.{name} AS {alias}_{name}" for name in names)
+    return ',\n               '.join(columns)
+
+
+LIST_SQL = """
+    SELECT i.id, i.category_id, c.name AS category_name, i.type, i.title,
+           i.description, i.amount_invested, i.currency, i.invested_at,
+           j.id AS j_id, l.id AS l_id, f.id AS f_id,
+           {children},
+           tl.log_count, tl.total_minutes
+    FROM investments i
+    JOIN investment_categories c ON c.id = i.category_id
+    LEFT JOIN job_applications j ON j.investment_id = i.id
+    LEFT JOIN learning_investments l ON l.investment_id = i.id
+    LEFT JOIN financial_investments f ON f.investment_id = i.id
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*) AS log_count, SUM(t.time_spent_minutes) AS total_minutes
+        FROM time_logs t
+        WHERE t.investment_id = i.id
+    ) tl ON true
+    WHERE {filters}
+    ORDER BY i.invested_at DESC, i.id DESC
+    LIMIT :limit
+"""
+
+
+def _to_item(row):
+    m = row._mapping
+    item = {
+        'id': m['id'], 'category_id': m['category_id'], 'category_name': m['category_name'],
+        'type': m['type'], 'title': m['title'], 'description': m['description'],
+        'amount_invested': m['amount_invested'], 'currency': m['currency'],
+        'invested_at': m['invested_at'], 'details': None,
+    }
+    for kind, (alias, names) in CHILD_COLUMNS.items():
+        if m[f'{alias}_id'] is not None:
+            item['details'] = {'kind': kind, **{name: m[f'{alias}_{name}'] for name in names}}
+            break
+    if m['log_count']:
+        item['time_logs'] = {'count': m['log_count'], 'total_minutes': m['total_minutes']}
+    return item
+
+
+def list_investments(conn, user_id, cursor=None, limit=20, type=None, category_id=None):
+    """Return one page of a user's investments, newest first.
+
+    Returns {"items": [...], "next_cursor": str or None}. Pass next_cursor
+    back to get the following page; filters must stay the same between pages.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    filters = ["i.user_id = :user_id"]
+    params = {"user_id": user_id, "limit": limit + 1}
+    if cursor:
+        params["after_at"], params["after_id"] = decode_cursor(cursor)
+        filters.append("(i.invested_at, i.id) < (:after_at, CAST(:after_id AS uuid))")
+    if type is not None:
+        filters.append("i.type = :type")
+        params["type"] = type
+    if category_id is not None:
+        filters.append("i.category_id = :category_id")
+        params["category_id"] = category_id
+
+    rows = conn.execute(text(LIST_SQL.format(
+        children=_select_children(), filters=' AND '.join(filters),
+    )), params).all()
+
+    items = [_to_item(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last['invested_at'], last['id'])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List a user's investments")
+    parser.add_argument('user_id')
+    parser.add_argument('--cursor')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--type', choices=['money', 'time', 'energy'])
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        page = list_investments(conn, args.user_id, cursor=args.cursor, limit=args.limit, type=args.type)
+    for item in page['items']:
+        kind = item['details']['kind'] if item['details'] else '-'
+        print(f"  {item['invested_at']:%Y-%m-%d} {item['type']:<6} {item['title']} "
+              f"({item['amount_invested']} {item['currency'] or ''}) [{kind}]")
+    if page['next_cursor']:
+        print(f"\nNext page: --cursor {page['next_cursor']}")
+
+
+if __name__ == "__main__":
+    main()
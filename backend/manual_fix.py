@@ -1,39 +1,78 @@
-import os
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
-
-load_dotenv()
-
-engine = create_engine(os.getenv('DATABASE_URL'))
-
-with engine.connect() as conn:
-    # Drop the old investments table if it exists
-    conn.execute(text("DROP TABLE IF EXISTS investments CASCADE"))
-    conn.commit()
-    print("Dropped old investments table")
-    
-    # Create the correct investments table
-    conn.execute(text("""
-        CREATE TABLE investments (
-            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-            user_id UUID NOT NULL,
-            category_id UUID NOT NULL,
-            type VARCHAR(20) NOT NULL CHECK (type IN ('money', 'time', 'energy')),
-            title VARCHAR(200) NOT NULL,
-            description TEXT,
-            amount_invested NUMERIC(10,2) NOT NULL,
-            currency VARCHAR(10),
-            invested_at TIMESTAMPTZ NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT NOW(),
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (category_id) REFERENCES investment_categories(id)
-        )
-    """))
-    
-    # Create index
-    conn.execute(text("""
-        CREATE INDEX ix_investments_user_date ON investments (user_id, invested_at)
-    """))
-    
-    conn.commit()
-    print("Created correct investments table with foreign keys")
+"""Convert a legacy investments table (text ``category``) to ``category_id`` in place.
+
+This used to drop and recreate investments, losing every row and every
+dependent table through CASCADE. It now runs the expand / backfill /
+contract sequence from online_migrations.py, so the table stays readable
+and writable throughout and an interrupted run can simply be restarted:
+
+    1. add a nullable category_id column and create missing categories
+    2. fill category_id in throttled batches
+    3. add the foreign key NOT VALID, then validate it
+    4. make category_id NOT NULL and index it concurrently
+
+The old ``category`` column is left for a later release to drop, once no
+code reads it.
+
+Usage:
+    python manual_fix.py
+"""
+from sqlalchemy import text
+
+from db import engine
+from online_migrations import (add_foreign_key_not_valid, backfill, create_index_concurrently,
+                               reset_backfill, set_not_null, validate_constraint)
+
+
+def columns(conn, table):
+    return set(conn.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+    """), {"table": table}).scalars())
+
+
+def main():
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        existing = columns(conn, 'investments')
+        if 'category' not in existing:
+            print("✅ investments already uses category_id; nothing to do")
+            return
+        if 'user_id' not in existing:
+            print("❌ investments has no user_id column; categories cannot be matched to their owners")
+            return
+
+        conn.execute(text("ALTER TABLE investments ADD COLUMN IF NOT EXISTS category_id UUID"))
+        created = conn.execute(text("""
+            INSERT INTO investment_categories (id, user_id, name, type)
+            SELECT gen_random_uuid(), user_id, category, min(type)
+            FROM investments
+            WHERE category IS NOT NULL AND category_id IS NULL
+            GROUP BY user_id, category
+            ON CONFLICT (user_id, name) DO NOTHING
+        """)).rowcount
+        print(f"📁 Created {created} missing categories")
+
+        rows = backfill(conn, 'investments.category_id', 'investments',
+                        set_sql="category_id = c.id", from_sql="investment_categories c",
+                        where_sql="c.user_id = t.user_id AND c.name = t.category AND t.category_id IS NULL",
+                        report=lambda name, done, last_key, size, seconds:
+                            print(f"  {done:,} rows (batch of {size} in {seconds:.2f}s)"))
+        print(f"🚚 Backfilled category_id on {rows:,} investments")
+
+        missing = conn.execute(text("SELECT COUNT(*) FROM investments WHERE category_id IS NULL")).scalar()
+        if missing:
+            # Rows written by old code during the backfill need another pass
+            reset_backfill(conn, 'investments.category_id')
+            print(f"⚠️  {missing} investments have no category; fix them and run again to finish")
+            return
+
+        add_foreign_key_not_valid(conn, 'investments_category_id_fkey', 'investments',
+                                  ['category_id'], 'investment_categories', ['id'])
+        validate_constraint(conn, 'investments', 'investments_category_id_fkey')
+        set_not_null(conn, 'investments', 'category_id')
+        create_index_concurrently(conn, 'ix_investments_user_date', 'investments', ['user_id', 'invested_at'])
+        create_index_concurrently(conn, 'ix_investments_category', 'investments', ['category_id'])
+        print("✅ investments.category_id is populated, constrained and indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,21 @@
 from .base import Base
+from .user import User, InvestmentCategory
 from .investment import Investment
+from .details import JobApplication, LearningInvestment, FinancialInvestment, FinancialValuation
+from .time_log import TimeLog
+from .investment_return import InvestmentReturn
+from .fx_rate import FxRate
 
-__all__ = ["Base", "Investment"]
+__all__ = [
+    "Base",
+    "User",
+    "InvestmentCategory",
+    "Investment",
+    "JobApplication",
+    "LearningInvestment",
+    "FinancialInvestment",
+    "FinancialValuation",
+    "TimeLog",
+    "InvestmentReturn",
+    "FxRate",
+]
@@ -0,0 +1,124 @@
+"""The one-per-investment specialized tables."""
+from sqlalchemy import (Column, String, DateTime, Text, Numeric, ForeignKey, CheckConstraint, Index, UUID, FetchedValue,
+                        Computed)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func
+import uuid
+from .base import Base
+
+class JobApplication(Base):
+    __tablename__ = "job_applications"
+    __table_args__ = (
+        Index('ix_job_applications_outcome', 'outcome'),
+        Index('ix_job_applications_company', 'company_name'),
+        Index('ix_job_applications_stage_outcome', 'application_stage', 'outcome'),
+        Index('ix_job_applications_search', 'user_id', 'search_vector', postgresql_using='gin'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    investment_id = Column(UUID(as_uuid=True), ForeignKey("investments.id", ondelete="CASCADE"),
+                           nullable=False, unique=True)
+    company_name = Column(String(200), nullable=False)
+    position = Column(String(200), nullable=False)
+    job_url = Column(String(500))
+    salary_range_min = Column(Numeric(10, 2))
+    salary_range_max = Column(Numeric(10, 2))
+    application_stage = Column(String(50), nullable=False)  # 'applied', 'interview', 'offer', ...
+    outcome = Column(String(50))
+    notes = Column(Text)
+    applied_at = Column(DateTime(timezone=True), nullable=False)
+    # Both set by the job_applications_fill trigger
+    user_id = Column(UUID(as_uuid=True), nullable=False, server_default=FetchedValue())
+    outcome_at = Column(DateTime(timezone=True), server_default=FetchedValue(), server_onupdate=FetchedValue())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Full-text search document, see search.py; not loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(company_name, '') || ' ' || coalesce(position, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(notes, '')), 'B')", persisted=True)))
+
+    investment = relationship("Investment", back_populates="job_application")
+
+    def __repr__(self):
+        return f"<JobApplication(id={self.id}, company='{self.company_name}', stage='{self.application_stage}')>"
+
+
+class LearningInvestment(Base):
+    __tablename__ = "learning_investments"
+    __table_args__ = (
+        Index('ix_learning_skills', 'skills_learned', postgresql_using='gin'),
+        Index('ix_learning_investments_search', 'search_vector', postgresql_using='gin'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    investment_id = Column(UUID(as_uuid=True), ForeignKey("investments.id", ondelete="CASCADE"),
+                           nullable=False, unique=True)
+    platform = Column(String(100))
+    course_name = Column(String(200), nullable=False)
+    instructor = Column(String(200))
+    skills_learned = Column(ARRAY(String))
+    completion_percentage = Column(Numeric(5, 2))
+    certification_url = Column(String(500))
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Full-text search document, see search.py; not loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(course_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(platform, '') || ' ' || coalesce(instructor, '')), 'C')",
+        persisted=True)))
+
+    investment = relationship("Investment", back_populates="learning_investment")
+
+    def __repr__(self):
+        return f"<LearningInvestment(id={self.id}, course='{self.course_name}')>"
+
+
+class FinancialInvestment(Base):
+    __tablename__ = "financial_investments"
+    __table_args__ = (
+        CheckConstraint("investment_type IN ('stock', 'crypto', 'real_estate', 'equipment', 'other')",
+                        name='check_financial_type'),
+        Index('ix_financial_type', 'investment_type'),
+        Index('ix_financial_asset', 'asset_name'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    investment_id = Column(UUID(as_uuid=True), ForeignKey("investments.id", ondelete="CASCADE"),
+                           nullable=False, unique=True)
+    investment_type = Column(String(50), nullable=False)
+    asset_name = Column(String(100), nullable=False)
+    ticker_symbol = Column(String(20))
+    quantity = Column(Numeric(10, 4), nullable=False)
+    purchase_price = Column(Numeric(10, 2), nullable=False)
+    current_value = Column(Numeric(14, 2))  # quantity * latest price, see revalue.py
+    brokerage = Column(String(100))
+    risk_level = Column(String(20))
+    dividend_yield = Column(Numeric(5, 2))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    investment = relationship("Investment", back_populates="financial_investment")
+    valuations = relationship("FinancialValuation", back_populates="holding", passive_deletes=True,
+                              order_by="FinancialValuation.valued_at")
+
+    def __repr__(self):
+        return f"<FinancialInvestment(id={self.id}, asset='{self.asset_name}')>"
+
+
+class FinancialValuation(Base):
+    """Mark-to-market history, one row per holding per revaluation run."""
+    __tablename__ = "financial_valuations"
+    __table_args__ = (
+        Index('ix_financial_valuations_valued_at', 'valued_at'),
+    )
+
+    financial_investment_id = Column(UUID(as_uuid=True), ForeignKey("financial_investments.id", ondelete="CASCADE"),
+                                     primary_key=True)
+    valued_at = Column(DateTime(timezone=True), primary_key=True)
+    price = Column(Numeric(18, 6), nullable=False)
+    market_value = Column(Numeric(14, 2), nullable=False)
+
+    holding = relationship("FinancialInvestment", back_populates="valuations")
+
+    def __repr__(self):
+        return f"<FinancialValuation(holding={self.financial_investment_id}, at={self.valued_at}, value={self.market_value})>"
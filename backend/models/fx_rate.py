@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Date, Numeric, CheckConstraint
+from .base import Base
+
+class FxRate(Base):
+    """Base-currency units per one unit of ``currency`` from ``rate_date``, see fx.py."""
+    __tablename__ = "fx_rates"
+    __table_args__ = (
+        CheckConstraint("rate > 0", name='check_fx_rate_positive'),
+    )
+
+    currency = Column(String(10), primary_key=True)
+    rate_date = Column(Date, primary_key=True)
+    rate = Column(Numeric(20, 10), nullable=False)
+
+    def __repr__(self):
+        return f"<FxRate(currency='{self.currency}', rate_date={self.rate_date}, rate={self.rate})>"
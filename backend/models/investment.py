@@ -1,20 +1,50 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, Numeric, UUID
+from sqlalchemy import Column, String, DateTime, Text, Numeric, ForeignKey, CheckConstraint, Index, UUID, Computed, FetchedValue, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 from .base import Base
 
 class Investment(Base):
     __tablename__ = "investments"
-    
+    __table_args__ = (
+        CheckConstraint("type IN ('money', 'time', 'energy')", name='check_investment_type'),
+        Index('ix_investments_user_date', 'user_id', 'invested_at'),
+        Index('ix_investments_search', 'user_id', 'search_vector', postgresql_using='gin'),
+        Index('ix_investments_user_normalized', 'user_id', 'invested_at',
+              postgresql_include=['amount_normalized'], postgresql_where=text('amount_normalized IS NOT NULL')),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("investment_categories.id"), nullable=False)
     type = Column(String(20), nullable=False)  # 'money', 'time', 'energy'
-    category = Column(String(50), nullable=False)  # 'learning', 'job_hunt', 'health'
     title = Column(String(200), nullable=False)
     description = Column(Text)
     amount_invested = Column(Numeric(10, 2), nullable=False)
     currency = Column(String(10), default='hours')  # 'USD', 'EUR', or 'hours' for time
     invested_at = Column(DateTime(timezone=True), nullable=False)
+    # amount_invested in the FX base currency, set by a trigger (see fx.py); NULL for hours
+    amount_normalized = Column(Numeric(14, 2), server_default=FetchedValue(), server_onupdate=FetchedValue())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
+    # Full-text search document, see search.py; not loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')", persisted=True)))
+
+    user = relationship("User", back_populates="investments")
+    category = relationship("InvestmentCategory", back_populates="investments")
+    # One-to-one specialized rows; the database cascades their deletes
+    job_application = relationship("JobApplication", back_populates="investment", uselist=False,
+                                    passive_deletes=True)
+    learning_investment = relationship("LearningInvestment", back_populates="investment", uselist=False,
+                                       passive_deletes=True)
+    financial_investment = relationship("FinancialInvestment", back_populates="investment", uselist=False,
+                                        passive_deletes=True)
+    time_logs = relationship("TimeLog", back_populates="investment", passive_deletes=True,
+                             order_by="TimeLog.logged_date")
+    returns = relationship("InvestmentReturn", back_populates="investment", passive_deletes=True,
+                           order_by="InvestmentReturn.return_date")
+
     def __repr__(self):
         return f"<Investment(id={self.id}, title='{self.title}', type='{self.type}')>"
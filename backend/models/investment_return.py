@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, DateTime, Text, Numeric, ForeignKey, CheckConstraint, Index, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from .base import Base
+
+class InvestmentReturn(Base):
+    __tablename__ = "investment_returns"
+    __table_args__ = (
+        CheckConstraint("type IN ('money', 'opportunity', 'skill', 'connection')", name='check_return_type'),
+        Index('ix_investment_returns_investment', 'investment_id', 'return_date'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    investment_id = Column(UUID(as_uuid=True), ForeignKey("investments.id", ondelete="CASCADE"), nullable=False)
+    type = Column(String(20), nullable=False)
+    amount_returned = Column(Numeric(12, 2), nullable=False)
+    description = Column(Text)
+    return_date = Column(DateTime(timezone=True), nullable=False)
+    # Cumulative ROI of the investment as of this return, maintained by roi.py
+    roi_percentage = Column(Numeric(10, 2))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    investment = relationship("Investment", back_populates="returns")
+
+    def __repr__(self):
+        return f"<InvestmentReturn(id={self.id}, type='{self.type}', amount={self.amount_returned})>"
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Text, ForeignKey, UniqueConstraint, Index, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from .base import Base
+
+class TimeLog(Base):
+    """One row per investment per day.
+
+    The table is range-partitioned on logged_date (see partitions.py), so the
+    primary key includes the partition key.
+    """
+    __tablename__ = "time_logs"
+    __table_args__ = (
+        # Also the covering index for aggregations (index-only scans)
+        UniqueConstraint('investment_id', 'logged_date', name='uq_investment_date',
+                         postgresql_include=['time_spent_minutes', 'productivity_rating']),
+        Index('ix_time_logs_date', 'logged_date'),
+        {'postgresql_partition_by': 'RANGE (logged_date)'},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    investment_id = Column(UUID(as_uuid=True), ForeignKey("investments.id", ondelete="CASCADE"), nullable=False)
+    logged_date = Column(Date, primary_key=True)
+    time_spent_minutes = Column(Integer, nullable=False)
+    description = Column(Text)
+    productivity_rating = Column(Integer)  # 1-10
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    investment = relationship("Investment", back_populates="time_logs")
+
+    def __repr__(self):
+        return f"<TimeLog(investment_id={self.investment_id}, date={self.logged_date}, minutes={self.time_spent_minutes})>"
+
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from .base import Base
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email = Column(String(255), nullable=False, unique=True)
+    password_hash = Column(String(255), nullable=False)
+    full_name = Column(String(255))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    categories = relationship("InvestmentCategory", back_populates="user")
+    investments = relationship("Investment", back_populates="user")
+
+    def __repr__(self):
+        return f"<User(id={self.id}, email='{self.email}')>"
+
+
+class InvestmentCategory(Base):
+    __tablename__ = "investment_categories"
+    __table_args__ = (UniqueConstraint('user_id', 'name', name='uq_user_category_name'),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    type = Column(String(20), nullable=False)  # 'money', 'time', 'energy'
+    color = Column(String(7))  # '#RRGGBB'
+    icon = Column(String(50))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", back_populates="categories")
+    investments = relationship("Investment", back_populates="category")
+
+    def __repr__(self):
+        return f"<InvestmentCategory(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,344 @@
+"""Helpers for changing the schema of tables that are in use.
+
+op.create_index or ADD CONSTRAINT inside a migration's transaction keeps a
+lock that blocks writes until the whole migration commits, and a one-shot
+UPDATE of a large table holds row locks and bloats it in one go. These
+helpers split such changes into steps that only take brief locks:
+
+    create_index_concurrently   CREATE INDEX CONCURRENTLY; an invalid index
+                                left by an interrupted or timed-out build
+                                is dropped and rebuilt
+    add_foreign_key_not_valid   ADD CONSTRAINT ... NOT VALID checks new rows
+    add_check_not_valid         only, then validate_constraint() scans the
+                                old ones without blocking writes
+    set_not_null                SET NOT NULL backed by a validated CHECK, so
+                                it does not scan the table under lock
+    backfill                    UPDATE in primary-key batches, one statement
+                                (and commit) per batch, throttled; progress
+                                is kept in online_backfill_progress so an
+                                interrupted run resumes after its last batch
+
+Every helper expects a connection in autocommit mode, because CREATE INDEX
+CONCURRENTLY cannot run in a transaction and a backfill should commit each
+batch. In a migration use autocommit(), which wraps
+op.get_context().autocommit_block(); elsewhere pass
+engine.connect().execution_options(isolation_level='AUTOCOMMIT'). DDL runs
+with a short lock_timeout and is retried, so a step waiting behind a long
+transaction does not queue every other query on the table behind itself.
+
+A column change such as investments.category -> category_id then becomes
+expand, backfill, contract:
+
+    def upgrade():
+        op.add_column('investments', sa.Column('category_id', postgresql.UUID(), nullable=True))
+        with autocommit() as conn:
+            backfill(conn, 'investments.category_id', 'investments',
+                     set_sql="category_id = c.id", from_sql="investment_categories c",
+                     where_sql="c.user_id = t.user_id AND c.name = t.category AND t.category_id IS NULL")
+            add_foreign_key_not_valid(conn, 'investments_category_id_fkey', 'investments',
+                                      ['category_id'], 'investment_categories', ['id'])
+            validate_constraint(conn, 'investments', 'investments_category_id_fkey')
+            set_not_null(conn, 'investments', 'category_id')
+            create_index_concurrently(conn, 'ix_investments_category', 'investments', ['category_id'])
+        # Drop investments.category in a later release, once no code reads it
+
+manual_fix.py runs exactly that on a legacy investments table.
+
+Usage:
+    python online_migrations.py status
+    python online_migrations.py reset <backfill name>
+"""
+import argparse
+import logging
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger('lifeinvest.migrations')
+
+LOCK_TIMEOUT_MS = 3000
+DDL_RETRIES = 5
+LOCK_NOT_AVAILABLE = '55P03'
+PROGRESS_TABLE = 'online_backfill_progress'
+
+
+@contextmanager
+def autocommit():
+    """Inside a migration: commit what ran so far and yield the bind in autocommit mode."""
+    from alembic import op
+
+    with op.get_context().autocommit_block():
+        yield op.get_bind()
+
+
+def _quote(conn, name):
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def _retry_locked(conn, step, description, lock_timeout_ms=LOCK_TIMEOUT_MS, retries=DDL_RETRIES):
+    """Call ``step()`` with a lock_timeout, retrying with backoff when the lock is not granted."""
+    conn.execute(text(f"SET lock_timeout = {int(lock_timeout_ms)}"))
+    try:
+        for attempt in range(retries + 1):
+            try:
+                return step()
+            except OperationalError as e:
+                if getattr(e.orig, 'pgcode', None) != LOCK_NOT_AVAILABLE or attempt == retries:
+                    raise
+                delay = min(30, 2 ** attempt)
+                logger.warning("lock not available, retrying in %ds: %s", delay, description)
+                time.sleep(delay)
+    finally:
+        conn.execute(text("RESET lock_timeout"))
+
+
+def _ddl(conn, sql, lock_timeout_ms=LOCK_TIMEOUT_MS, retries=DDL_RETRIES):
+    """Execute ``sql`` with a lock_timeout, retrying with backoff when the lock is not granted."""
+    return _retry_locked(conn, lambda: conn.execute(text(sql)), sql, lock_timeout_ms, retries)
+
+
+def index_sql(conn, name, table, columns, unique=False, using=None, include=None, where=None):
+    sql = (f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY {_quote(conn, name)} "
+           f"ON {_quote(conn, table)}")
+    if using:
+        sql += f" USING {using}"
+    sql += f" ({', '.join(columns)})"
+    if include:
+        sql += f" INCLUDE ({', '.join(_quote(conn, column) for column in include)})"
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def index_state(conn, name):
+    """None if index ``name`` does not exist in the current schema, else whether it is valid."""
+    return conn.execute(text("""
+        SELECT i.indisvalid FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relname = :name AND n.nspname = current_schema()
+    """), {"name": name}).scalar()
+
+
+def create_index_concurrently(conn, name, table, columns, unique=False, using=None, include=None,
+                              where=None, lock_timeout_ms=LOCK_TIMEOUT_MS, retries=DDL_RETRIES):
+    """Build an index without blocking writes; returns False if a valid one already exists.
+
+    ``columns`` are SQL expressions, so 'lower(email)' or 'invested_at DESC'
+    work as they would in CREATE INDEX.
+    """
+    sql = index_sql(conn, name, table, columns, unique, using, include, where)
+
+    def build():
+        state = index_state(conn, name)
+        if state:
+            return False
+        if state is False:
+            # An interrupted or timed-out concurrent build leaves an invalid
+            # index that is never used for reads but still slows down every
+            # write, and blocks the next CREATE with "already exists"
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(conn, name)}"))
+        conn.execute(text(sql))
+        return True
+
+    return _retry_locked(conn, build, sql, lock_timeout_ms, retries)
+
+
+def drop_index_concurrently(conn, name, lock_timeout_ms=LOCK_TIMEOUT_MS):
+    _ddl(conn, f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(conn, name)}", lock_timeout_ms)
+
+
+def constraint_state(conn, table, name):
+    """None if constraint ``name`` does not exist on ``table``, else whether it is validated."""
+    return conn.execute(text("""
+        SELECT convalidated FROM pg_constraint
+        WHERE conname = :name AND conrelid = to_regclass(:table)
+    """), {"name": name, "table": table}).scalar()
+
+
+def add_foreign_key_not_valid(conn, name, table, columns, ref_table, ref_columns, ondelete=None,
+                              lock_timeout_ms=LOCK_TIMEOUT_MS):
+    """Add a foreign key that only checks new rows; follow with validate_constraint()."""
+    if constraint_state(conn, table, name) is not None:
+        return False
+    columns = ', '.join(_quote(conn, column) for column in columns)
+    ref_columns = ', '.join(_quote(conn, column) for column in ref_columns)
+    _ddl(conn, f"ALTER TABLE {_quote(conn, table)} ADD CONSTRAINT {_quote(conn, name)} "
+               f"FOREIGN KEY ({columns}) REFERENCES {_quote(conn, ref_table)} ({ref_columns})"
+               f"{f' ON DELETE {ondelete}' if ondelete else ''} NOT VALID", lock_timeout_ms)
+    return True
+
+
+def add_check_not_valid(conn, name, table, condition, lock_timeout_ms=LOCK_TIMEOUT_MS):
+    """Add a CHECK constraint that only checks new rows; follow with validate_constraint()."""
+    if constraint_state(conn, table, name) is not None:
+        return False
+    _ddl(conn, f"ALTER TABLE {_quote(conn, table)} ADD CONSTRAINT {_quote(conn, name)} "
+               f"CHECK ({condition}) NOT VALID", lock_timeout_ms)
+    return True
+
+
+def validate_constraint(conn, table, name, lock_timeout_ms=LOCK_TIMEOUT_MS):
+    """Check existing rows against a NOT VALID constraint; reads and writes continue meanwhile."""
+    if constraint_state(conn, table, name):
+        return False
+    _ddl(conn, f"ALTER TABLE {_quote(conn, table)} VALIDATE CONSTRAINT {_quote(conn, name)}", lock_timeout_ms)
+    return True
+
+
+def set_not_null(conn, table, column, lock_timeout_ms=LOCK_TIMEOUT_MS):
+    """SET NOT NULL without a full scan under ACCESS EXCLUSIVE.
+
+    Postgres 12+ skips the scan when a validated CHECK (column IS NOT NULL)
+    already proves it; the helper constraint is dropped afterwards.
+    """
+    check = f"{table}_{column}_not_null"
+    add_check_not_valid(conn, check, table, f"{_quote(conn, column)} IS NOT NULL", lock_timeout_ms)
+    validate_constraint(conn, table, check, lock_timeout_ms)
+    _ddl(conn, f"ALTER TABLE {_quote(conn, table)} ALTER COLUMN {_quote(conn, column)} SET NOT NULL",
+         lock_timeout_ms)
+    _ddl(conn, f"ALTER TABLE {_quote(conn, table)} DROP CONSTRAINT {_quote(conn, check)}", lock_timeout_ms)
+
+
+def backfill_sql(conn, table, set_sql, where_sql, from_sql=None, key='id', key_type='uuid', resume=False):
+    """One batch: UPDATE the next :batch_size keys after :last_key and record progress.
+
+    The batch is selected from ``table`` alone, so it advances even when no
+    row in it matches ``where_sql``. Inside ``set_sql`` and ``where_sql`` the
+    table is aliased ``t``.
+    """
+    table, key = _quote(conn, table), _quote(conn, key)
+    after = f"WHERE t.{key} > CAST(:last_key AS {key_type})" if resume else ""
+    return f"""
+        WITH batch AS (
+            SELECT t.{key} AS key FROM {table} t
+            {after}
+            ORDER BY t.{key}
+            LIMIT :batch_size
+        ),
+        changed AS (
+            UPDATE {table} t SET {set_sql}
+            FROM batch{f', {from_sql}' if from_sql else ''}
+            WHERE t.{key} = batch.key AND ({where_sql})
+            RETURNING 1
+        ),
+        summary AS (
+            SELECT (SELECT key::text FROM batch ORDER BY key DESC LIMIT 1) AS last_key,
+                   (SELECT count(*) FROM batch) AS scanned,
+                   (SELECT count(*) FROM changed) AS updated
+        ),
+        progress AS (
+            UPDATE {PROGRESS_TABLE} p
+            SET last_key = COALESCE(s.last_key, p.last_key),
+                rows_done = p.rows_done + s.updated,
+                updated_at = now(),
+                finished_at = CASE WHEN s.scanned < :batch_size THEN now() END
+            FROM summary s
+            WHERE p.name = :name
+        )
+        SELECT last_key, scanned, updated FROM summary
+    """
+
+
+def next_batch_size(batch_size, elapsed, target_seconds, min_size=100, max_size=50_000):
+    """Halve the batch when it ran well over ``target_seconds``, double it when well under."""
+    if elapsed > target_seconds * 1.5:
+        return max(min_size, batch_size // 2)
+    if elapsed < target_seconds / 2:
+        return min(max_size, batch_size * 2)
+    return batch_size
+
+
+def _key_type(conn, table, key):
+    return conn.execute(text("""
+        SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = to_regclass(:table) AND attname = :key
+    """), {"table": table, "key": key}).scalar()
+
+
+def backfill(conn, name, table, set_sql, where_sql='TRUE', from_sql=None, key='id', batch_size=1000,
+             sleep=0.1, target_seconds=0.5, max_batch_size=50_000, report=None):
+    """Run ``UPDATE table t SET set_sql [FROM from_sql] WHERE where_sql`` a batch at a time.
+
+    Batches walk ``key`` in order; each one is a single statement that also
+    advances the progress row ``name``, so with an autocommit connection a
+    crash loses at most the batch in flight and the next call resumes after
+    it. A finished backfill is not run again until reset. The batch size
+    adapts to stay near ``target_seconds`` and the loop sleeps ``sleep``
+    seconds between batches to leave room for other traffic and for
+    replicas to keep up. ``where_sql`` should skip rows that are already
+    done so re-running a batch is harmless. ``report(name, rows_done,
+    last_key, batch_size, seconds)`` is called after each batch. Returns the
+    rows updated by this call.
+    """
+    progress = conn.execute(text(f"""
+        INSERT INTO {PROGRESS_TABLE} (name) VALUES (:name)
+        ON CONFLICT (name) DO UPDATE SET updated_at = now()
+        RETURNING last_key, rows_done, finished_at
+    """), {"name": name}).one()
+    if progress.finished_at is not None:
+        logger.info("backfill %s already finished at %s", name, progress.finished_at)
+        return 0
+
+    key_type = _key_type(conn, table, key)
+    statements = {resume: text(backfill_sql(conn, table, set_sql, where_sql, from_sql, key, key_type, resume))
+                  for resume in (False, True)}
+    last_key, rows_done, updated = progress.last_key, progress.rows_done, 0
+    while True:
+        started = time.perf_counter()
+        batch = conn.execute(statements[last_key is not None],
+                             {"name": name, "last_key": last_key, "batch_size": batch_size}).one()
+        elapsed = time.perf_counter() - started
+        last_key = batch.last_key or last_key
+        rows_done += batch.updated
+        updated += batch.updated
+        if report:
+            report(name, rows_done, last_key, batch_size, elapsed)
+        else:
+            logger.info("backfill %s: %d rows done, at %s (batch of %d in %.2fs)",
+                        name, rows_done, last_key, batch_size, elapsed)
+        if batch.scanned < batch_size:
+            return updated
+        batch_size = next_batch_size(batch_size, elapsed, target_seconds, max_size=max_batch_size)
+        time.sleep(sleep)
+
+
+def reset_backfill(conn, name):
+    return conn.execute(text(f"DELETE FROM {PROGRESS_TABLE} WHERE name = :name"), {"name": name}).rowcount
+
+
+def backfill_status(conn):
+    result = conn.execute(text(f"""
+        SELECT name, last_key, rows_done, updated_at, finished_at
+        FROM {PROGRESS_TABLE}
+        ORDER BY updated_at DESC
+    """))
+    return [dict(row._mapping) for row in result]
+
+
+def main():
+    from db import engine
+
+    parser = argparse.ArgumentParser(description="Online migration helpers")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help="show backfill progress")
+    reset_parser = sub.add_parser('reset', help="forget a backfill's progress so it runs again")
+    reset_parser.add_argument('name')
+    args = parser.parse_args()
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        if args.command == 'reset':
+            removed = reset_backfill(conn, args.name)
+            print(f"✅ Reset {args.name}" if removed else f"⚠️  No backfill named {args.name}")
+            return
+        print("🚚 BACKFILLS")
+        print("=" * 30)
+        for row in backfill_status(conn):
+            state = f"finished {row['finished_at']:%Y-%m-%d %H:%M}" if row['finished_at'] else "in progress"
+            print(f"  {row['name']}: {row['rows_done']:,} rows, {state}, last key {row['last_key']}")
+
+
+if __name__ == "__main__":
+    main()
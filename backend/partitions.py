@@ -0,0 +1,168 @@
+"""Monthly partition maintenance for range-partitioned tables.
+
+Partitions are named <table>_pYYYYMM and cover one calendar month; rows
+outside every month land in <table>_default. `maintain` pre-creates the
+coming months, moves rows that landed in the default partition (e.g. past
+months loaded by bulk_import.py or seed_data.py) into monthly partitions of
+their own, and moves partitions older than the retention window into the
+archive schema (detached, so queries and vacuum on the live table no longer
+see them, but the data is still there to dump or drop). `split-default`
+only does the middle step.
+
+Usage:
+    python partitions.py list
+    python partitions.py maintain --months-ahead 3 --keep-months 24
+    python partitions.py split-default
+"""
+import argparse
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from db import engine
+
+# table -> partition key column
+PARTITIONED_TABLES = {
+    'time_logs': 'logged_date',
+}
+
+ARCHIVE_SCHEMA = 'archive'
+
+
+def month_start(d, offset=0):
+    """First day of the month ``offset`` months after the month of ``d``."""
+    months = d.year * 12 + d.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def list_partitions(conn, table):
+    """Return {month: partition name} for the monthly partitions attached to ``table``."""
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    rows = conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits inh
+        JOIN pg_class c ON c.oid = inh.inhrelid
+        WHERE inh.inhparent = CAST(:table AS regclass)
+    """), {"table": table})
+    partitions = {}
+    for (name,) in rows:
+        match = pattern.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partition(conn, table, month):
+    """Create the partition for ``month``, moving any of its rows out of the default partition."""
+    column = PARTITIONED_TABLES[table]
+    name = partition_name(table, month)
+    default = f"{table}_default"
+    bounds = {"start": month, "end": month_start(month, 1)}
+
+    has_default = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": default}).scalar()
+    stray_rows = has_default and conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= :start AND {column} < :end)"
+    ), bounds).scalar()
+
+    if stray_rows:
+        # A new partition can't be attached while the default holds rows in its range
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    conn.execute(text(
+        f"CREATE TABLE {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+    if stray_rows:
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {column} >= :start AND {column} < :end RETURNING *) "
+            f"INSERT INTO {table} SELECT * FROM moved"
+        ), bounds)
+        conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    return name
+
+
+def ensure_future_partitions(conn, table, months_ahead=3, today=None):
+    """Create partitions from the current month through ``months_ahead`` months out."""
+    today = today or date.today()
+    with conn.begin():
+        existing = list_partitions(conn, table)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = month_start(today, offset)
+        if month not in existing:
+            with conn.begin():
+                created.append(create_partition(conn, table, month))
+    return created
+
+
+def split_default(conn, table):
+    """Give every month found in the default partition a partition of its own; returns the names created."""
+    column = PARTITIONED_TABLES[table]
+    with conn.begin():
+        months = conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', {column})::date FROM {table}_default ORDER BY 1"
+        )).scalars().all()
+    created = []
+    for month in months:
+        with conn.begin():
+            created.append(create_partition(conn, table, month))
+    return created
+
+
+def archive_old_partitions(conn, table, keep_months=24, today=None):
+    """Detach partitions older than ``keep_months`` and move them to the archive schema."""
+    cutoff = month_start(today or date.today(), -keep_months)
+    archived = []
+    with conn.begin():
+        partitions = list_partitions(conn, table)
+    for month, name in sorted(partitions.items()):
+        if month >= cutoff:
+            break
+        with conn.begin():
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(f"{ARCHIVE_SCHEMA}.{name}")
+    return archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain monthly partitions")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="show attached monthly partitions")
+    sub.add_parser('split-default', help="move rows in the default partition into monthly partitions")
+    maintain = sub.add_parser('maintain', help="create partitions, split the default and archive old ones")
+    maintain.add_argument('--months-ahead', type=int, default=3)
+    maintain.add_argument('--keep-months', type=int, default=24,
+                          help="archive partitions older than this; 0 keeps everything")
+    args = parser.parse_args()
+
+    print("🗂️  PARTITION MAINTENANCE")
+    print("=" * 30)
+    with engine.connect() as conn:
+        for table in PARTITIONED_TABLES:
+            if args.command == 'list':
+                partitions = list_partitions(conn, table)
+                print(f"  {table}: {len(partitions)} monthly partitions")
+                for month, name in sorted(partitions.items()):
+                    print(f"    {name}")
+                continue
+            if args.command == 'maintain':
+                for name in ensure_future_partitions(conn, table, args.months_ahead):
+                    print(f"✅ Created {name}")
+            for name in split_default(conn, table):
+                print(f"🔀 Split {name} out of {table}_default")
+            if args.command == 'split-default':
+                continue
+            if args.keep_months:
+                for name in archive_old_partitions(conn, table, args.keep_months):
+                    print(f"📦 Archived {name}")
+    print("\n🎉 Partitions are up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Local columnar store of daily closing prices.
+
+Each ticker is one .npy file under PRICE_STORE_DIR holding a structured
+array of (date datetime64[D], strictly increasing; close float64); the
+ticker is percent-encoded into the file name, so symbols like "BTC/USD" are
+stored as ``BTC%2FUSD.npy``. Files are opened with np.load(mmap_mode='r'),
+so reading years of history maps the file instead of copying it; only the
+pages a query touches are read from disk. Writes merge into a temporary
+file and rename it over the old one, so readers see either the old or the
+new series, never dates from one next to closes from the other.
+
+portfolio_value_series() loads a user's holdings with one query and values
+them on every day of a range with searchsorted lookups: one vectorized pass
+per ticker, no Python loop over days. A day before a ticker's first price is
+valued at the holding's purchase price.
+
+Usage:
+    python price_store.py import closes.csv      # ticker_symbol,date,close
+    python price_store.py value <user_id> --start 2025-01-01
+"""
+import argparse
+import csv
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import quote, unquote
+
+import numpy as np
+from sqlalchemy import text
+
+from db import engine
+
+PRICE_STORE_DIR = os.getenv('PRICE_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            'data', 'prices'))
+
+SERIES_DTYPE = np.dtype([('date', 'datetime64[D]'), ('close', np.float64)])
+
+HOLDINGS_SQL = text("""
+    SELECT upper(f.ticker_symbol) AS ticker_symbol, f.quantity, f.purchase_price,
+           (i.invested_at AT TIME ZONE 'UTC')::date AS purchased_on
+    FROM financial_investments f
+    JOIN investments i ON i.id = f.investment_id
+    WHERE i.user_id = :user_id AND f.ticker_symbol IS NOT NULL
+""")
+
+
+class PriceStore:
+    def __init__(self, root=None):
+        self.root = root or PRICE_STORE_DIR
+
+    def _path(self, ticker):
+        # Percent-encoding leaves no path separators, so any symbol stays inside root
+        return os.path.join(self.root, f"{quote(ticker.upper(), safe='^=')}.npy")
+
+    def tickers(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(unquote(name[:-len('.npy')]) for name in os.listdir(self.root) if name.endswith('.npy'))
+
+    def series(self, ticker):
+        """Return (dates, closes) as read-only memory-mapped views, or None if the ticker is unknown."""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        series = np.load(path, mmap_mode='r')
+        return series['date'], series['close']
+
+    def write(self, ticker, dates, closes):
+        """Merge ``closes`` on ``dates`` into the ticker's series; new values win on the same day."""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        closes = np.asarray(closes, dtype=np.float64)
+        if dates.shape != closes.shape:
+            raise ValueError("dates and closes must have the same length")
+        existing = self.series(ticker)
+        if existing is not None:
+            # New rows go first so np.unique keeps them over older values for the same day
+            dates = np.concatenate([dates, existing[0]])
+            closes = np.concatenate([closes, existing[1]])
+        dates, first = np.unique(dates, return_index=True)
+        series = np.empty(len(dates), dtype=SERIES_DTYPE)
+        series['date'], series['close'] = dates, closes[first]
+
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(ticker)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, series)
+        os.replace(tmp, path)
+        return len(series)
+
+    def closes_on(self, ticker, days):
+        """As-of close for each of ``days`` (last close on or before the day); NaN before the first."""
+        days = np.asarray(days, dtype='datetime64[D]')
+        series = self.series(ticker)
+        if series is None or not len(series[0]):
+            return np.full(days.shape, np.nan)
+        dates, closes = series
+        positions = np.searchsorted(dates, days, side='right') - 1
+        return np.where(positions >= 0, closes[np.maximum(positions, 0)], np.nan)
+
+    def import_csv(self, path):
+        """Load a ticker_symbol,date,close CSV; returns {ticker: rows after merge}."""
+        columns = defaultdict(lambda: ([], []))
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                dates, closes = columns[row['ticker_symbol'].strip().upper()]
+                dates.append(row['date'])
+                closes.append(float(row['close']))
+        return {ticker: self.write(ticker, dates, closes) for ticker, (dates, closes) in columns.items()}
+
+
+def value_series(store, holdings, start, end):
+    """Value ``holdings`` on each day from start to end inclusive.
+
+    ``holdings`` is an iterable of (ticker, quantity, purchase_price,
+    purchased_on). Returns (days, values, unpriced tickers).
+    """
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    values = np.zeros(days.shape)
+    by_ticker = defaultdict(list)
+    for ticker, quantity, purchase_price, purchased_on in holdings:
+        by_ticker[ticker].append((np.datetime64(purchased_on, 'D'), float(quantity), float(purchase_price)))
+
+    unpriced = []
+    for ticker, lots in by_ticker.items():
+        lots.sort()
+        bought = np.array([lot[0] for lot in lots], dtype='datetime64[D]')
+        held = np.cumsum([lot[1] for lot in lots])
+        cost = np.cumsum([lot[1] * lot[2] for lot in lots])
+        # Lots bought on or before each day
+        count = np.searchsorted(bought, days, side='right')
+        owned = count > 0
+        held_on = np.where(owned, held[np.maximum(count - 1, 0)], 0.0)
+        cost_on = np.where(owned, cost[np.maximum(count - 1, 0)], 0.0)
+
+        closes = store.closes_on(ticker, days)
+        if np.isnan(closes).all():
+            unpriced.append(ticker)
+        values += np.where(np.isnan(closes), cost_on, held_on * closes)
+    return days, values, sorted(unpriced)
+
+
+def portfolio_value_series(conn, user_id, start, end=None, store=None):
+    """Daily market value of a user's ticker holdings; see value_series()."""
+    holdings = conn.execute(HOLDINGS_SQL, {"user_id": user_id}).all()
+    return value_series(store or PriceStore(), holdings, start, end or date.today())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar price history store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="merge a ticker_symbol,date,close CSV")
+    import_parser.add_argument('path')
+    value_parser = subparsers.add_parser('value', help="print a user's daily portfolio value")
+    value_parser.add_argument('user_id')
+    value_parser.add_argument('--start', type=date.fromisoformat,
+                              default=date.today() - timedelta(days=365))
+    value_parser.add_argument('--end', type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    store = PriceStore()
+    if args.command == 'import':
+        counts = store.import_csv(args.path)
+        print(f"✅ Stored {len(counts)} tickers in {store.root}")
+        for ticker, rows in sorted(counts.items()):
+            print(f"  {ticker}: {rows:,} days")
+        return
+
+    with engine.connect() as conn:
+        days, values, unpriced = portfolio_value_series(conn, args.user_id, args.start, args.end, store)
+    print(f"📈 PORTFOLIO VALUE {args.start} .. {args.end}")
+    print("=" * 40)
+    for day, value in zip(days[::max(1, len(days) // 30)], values[::max(1, len(days) // 30)]):
+        print(f"  {day}  {value:>14,.2f}")
+    if unpriced:
+        print(f"⚠️  No price history for {', '.join(unpriced)}; valued at purchase price")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Read-side projections: compact rows straight from Core select().
+
+The ORM models in models/ are for code that changes rows. Read paths that
+return many rows (lists, summaries, history exports) skip them: hydrating an
+ORM object means instance state, an identity-map entry and attribute
+instrumentation per row, which for a 10k-row export costs several times the
+memory and CPU of the data itself. Here each query selects exactly the
+columns a __slots__ dataclass declares, in field order, and rows are built
+positionally from the DBAPI tuples.
+
+    with engine.connect() as conn:
+        for row in investment_history(conn, user_id):
+            print(row.invested_at, row.amount_invested)
+"""
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from models import FinancialInvestment, Investment, JobApplication, LearningInvestment, TimeLog
+
+EXPORT_BATCH_SIZE = 1000
+
+
+@dataclass(slots=True, frozen=True)
+class InvestmentRow:
+    id: UUID
+    category_id: UUID
+    type: str
+    title: str
+    amount_invested: Decimal
+    currency: Optional[str]
+    invested_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class TimeLogRow:
+    investment_id: UUID
+    logged_date: date
+    time_spent_minutes: int
+    productivity_rating: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class ChildCounts:
+    investments: int
+    job_applications: int
+    learning_investments: int
+    financial_investments: int
+    time_logs: int
+
+
+def select_for(row_type, table):
+    """select() of ``table``'s columns named like ``row_type``'s fields, in order."""
+    return select(*(table.c[f.name] for f in fields(row_type)))
+
+
+def project(result, row_type):
+    """Build ``row_type`` instances positionally from a Core result."""
+    return [row_type(*row) for row in result]
+
+
+def stream(conn, statement, row_type, batch_size=EXPORT_BATCH_SIZE):
+    """Yield ``row_type`` instances through a server-side cursor, batch by batch."""
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+    for batch in result.partitions():
+        for row in batch:
+            yield row_type(*row)
+
+
+def _date_range(statement, column, start, end):
+    if start is not None:
+        statement = statement.where(column >= start)
+    if end is not None:
+        statement = statement.where(column < end)
+    return statement
+
+
+def investment_history(conn, user_id, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield a user's investments as InvestmentRow, oldest first, start <= invested_at < end."""
+    statement = select_for(InvestmentRow, Investment.__table__).where(Investment.user_id == user_id)
+    statement = _date_range(statement, Investment.invested_at, start, end)
+    return stream(conn, statement.order_by(Investment.invested_at, Investment.id), InvestmentRow, batch_size)
+
+
+def time_log_history(conn, user_id, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield a user's time logs as TimeLogRow, oldest first, start <= logged_date < end."""
+    statement = (
+        select_for(TimeLogRow, TimeLog.__table__)
+        .join(Investment, Investment.id == TimeLog.investment_id)
+        .where(Investment.user_id == user_id)
+    )
+    statement = _date_range(statement, TimeLog.logged_date, start, end)
+    return stream(conn, statement.order_by(TimeLog.logged_date, TimeLog.investment_id), TimeLogRow, batch_size)
+
+
+def child_counts(conn, user_id):
+    """Count a user's investments, their specialized rows and time logs in one query."""
+    time_logs = (
+        select(func.count())
+        .select_from(TimeLog)
+        .join(Investment, Investment.id == TimeLog.investment_id)
+        .where(Investment.user_id == user_id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            func.count(),
+            func.count(JobApplication.id),
+            func.count(LearningInvestment.id),
+            func.count(FinancialInvestment.id),
+            time_logs,
+        )
+        .select_from(Investment)
+        .outerjoin(JobApplication, JobApplication.investment_id == Investment.id)
+        .outerjoin(LearningInvestment, LearningInvestment.investment_id == Investment.id)
+        .outerjoin(FinancialInvestment, FinancialInvestment.investment_id == Investment.id)
+        .where(Investment.user_id == user_id)
+    )
+    return ChildCounts(*conn.execute(statement).one())
@@ -0,0 +1,159 @@
+"""Fast database resets for development and CI.
+
+Two strategies, neither of which touches rows one at a time:
+
+    truncate   TRUNCATE every table in the schema in one statement
+               (RESTART IDENTITY CASCADE); alembic_version is kept, so the
+               schema stays migrated. Takes milliseconds at any size.
+    template   Snapshot a seeded database once with CREATE DATABASE ...
+               TEMPLATE, then restore it by dropping the working database
+               and cloning the snapshot again. Postgres copies the files
+               instead of replaying rows, so a 10M-row fixture comes back
+               in seconds.
+
+CREATE DATABASE ... TEMPLATE needs the source database to have no other
+sessions; --force terminates them first. Snapshot and restore connect to
+the 'postgres' maintenance database to do their work. The clone is built
+under a staging name and only renamed over the old database once it
+exists, so a missing template or a failed copy leaves the working
+database and the previous snapshot untouched.
+
+Usage:
+    python reset_db.py truncate
+    python reset_db.py snapshot [--name lifeinvest_db_template] [--force]
+    python reset_db.py restore  [--name lifeinvest_db_template] [--force]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from db import DATABASE_URL, engine, sync_url
+
+KEEP_TABLES = ('alembic_version',)
+MAX_NAME_LENGTH = 63
+
+TABLES_SQL = text("""
+    SELECT c.relname
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relkind IN ('r', 'p')
+      AND NOT c.relispartition
+    ORDER BY c.relname
+""")
+
+
+def truncate(conn, keep=KEEP_TABLES):
+    """Empty every table in the current schema with one TRUNCATE; returns the table names."""
+    with conn.begin():
+        tables = [name for name in conn.execute(TABLES_SQL).scalars() if name not in keep]
+        if tables:
+            quote = conn.dialect.identifier_preparer.quote
+            conn.execute(text(f"TRUNCATE {', '.join(quote(t) for t in tables)} RESTART IDENTITY CASCADE"))
+    return tables
+
+
+class TemplateNotFoundError(ValueError):
+    pass
+
+
+def default_template_name(url=None):
+    return f"{sync_url(url or DATABASE_URL).database}_template"
+
+
+def _maintenance_engine(url):
+    url = sync_url(url)
+    return create_engine(url.set(database='postgres'), poolclass=NullPool,
+                         isolation_level='AUTOCOMMIT')
+
+
+def _terminate(conn, database):
+    conn.execute(text("""
+        SELECT pg_terminate_backend(pid) FROM pg_stat_activity
+        WHERE datname = :database AND pid <> pg_backend_pid()
+    """), {"database": database})
+
+
+def staging_name(target):
+    """Name the clone is built under before it replaces ``target``."""
+    suffix = '_staging'
+    return f"{target[:MAX_NAME_LENGTH - len(suffix)]}{suffix}"
+
+
+def clone_database(source, target, url=None, force=False, replace=False):
+    """CREATE DATABASE target TEMPLATE source; with ``replace``, swap it in for an existing target."""
+    maintenance = _maintenance_engine(url or DATABASE_URL)
+    try:
+        with maintenance.connect() as conn:
+            quote = conn.dialect.identifier_preparer.quote
+            exists = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                                  {"name": source}).first()
+            if exists is None:
+                raise TemplateNotFoundError(f"Database {source!r} does not exist")
+            if force:
+                _terminate(conn, source)
+            if not replace:
+                conn.execute(text(f"CREATE DATABASE {quote(target)} TEMPLATE {quote(source)}"))
+                return
+            staging = staging_name(target)
+            conn.execute(text(f"DROP DATABASE IF EXISTS {quote(staging)}"))
+            conn.execute(text(f"CREATE DATABASE {quote(staging)} TEMPLATE {quote(source)}"))
+            if force:
+                _terminate(conn, target)
+            conn.execute(text(f"DROP DATABASE IF EXISTS {quote(target)}"))
+            conn.execute(text(f"ALTER DATABASE {quote(staging)} RENAME TO {quote(target)}"))
+    finally:
+        maintenance.dispose()
+
+
+def snapshot(name=None, url=None, force=False):
+    """Save the working database as template ``name``, replacing an older snapshot."""
+    url = url or DATABASE_URL
+    name = name or default_template_name(url)
+    engine.dispose()
+    clone_database(sync_url(url).database, name, url, force=force, replace=True)
+    return name
+
+
+def restore(name=None, url=None, force=False):
+    """Replace the working database with a fresh clone of template ``name``."""
+    url = url or DATABASE_URL
+    name = name or default_template_name(url)
+    engine.dispose()
+    clone_database(name, sync_url(url).database, url, force=force, replace=True)
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reset the database quickly")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('truncate', help="empty every table, keep the schema")
+    for command, help_text in (('snapshot', "save the database as a template"),
+                               ('restore', "recreate the database from the template")):
+        command_parser = sub.add_parser(command, help=help_text)
+        command_parser.add_argument('--name', help="template database name (default <db>_template)")
+        command_parser.add_argument('--force', action='store_true',
+                                    help="terminate other sessions on the databases involved")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == 'truncate':
+        with engine.connect() as conn:
+            tables = truncate(conn)
+        print(f"🧹 Truncated {len(tables)} tables: {', '.join(tables)}")
+    elif args.command == 'snapshot':
+        name = snapshot(args.name, force=args.force)
+        print(f"📸 Saved snapshot {name}")
+    else:
+        try:
+            name = restore(args.name, force=args.force)
+        except TemplateNotFoundError as e:
+            parser.exit(1, f"❌ {e}; run `python reset_db.py snapshot` first\n")
+        print(f"♻️  Restored database from {name}")
+    print(f"✅ Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
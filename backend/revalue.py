@@ -0,0 +1,160 @@
+"""Revalue financial holdings from a price snapshot file.
+
+The snapshot is a CSV or Parquet file with ``ticker_symbol`` and ``price``
+columns. Prices are COPYed into a temporary staging table, then a single
+statement sets every matching holding's current_value = quantity * price
+and appends one financial_valuations row per holding for this run. Tickers
+match case-insensitively. Only holdings whose value actually changed are
+rewritten, so an unchanged price does not churn the table. A holding whose
+value would not fit numeric(14, 2) is left alone and reported instead of
+failing the whole run.
+
+Usage:
+    python revalue.py prices.csv
+    python revalue.py prices.parquet --as-of 2026-10-16T21:00:00+00:00
+"""
+import argparse
+import csv
+import os
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import text
+
+from bulk_import import copy_rows
+from db import engine
+
+STAGING_TABLE = 'price_staging'
+
+# Largest value current_value and financial_valuations.market_value can hold (numeric(14, 2))
+MAX_MARKET_VALUE = Decimal('999999999999.99')
+
+CREATE_STAGING_SQL = text(f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        ticker_symbol varchar(20) PRIMARY KEY,
+        price numeric(18, 6) NOT NULL
+    ) ON COMMIT DROP
+""")
+
+REVALUE_SQL = text(f"""
+    WITH matched AS (
+        SELECT f.id, s.price, round(f.quantity * s.price, 2) AS market_value
+        FROM financial_investments f
+        JOIN {STAGING_TABLE} s ON s.ticker_symbol = upper(f.ticker_symbol)
+    ),
+    priced AS (
+        SELECT * FROM matched WHERE abs(market_value) <= :max_value
+    ),
+    updated AS (
+        UPDATE financial_investments f
+        SET current_value = p.market_value
+        FROM priced p
+        WHERE f.id = p.id AND f.current_value IS DISTINCT FROM p.market_value
+        RETURNING f.id
+    ),
+    history AS (
+        INSERT INTO financial_valuations (financial_investment_id, valued_at, price, market_value)
+        SELECT id, :valued_at, price, market_value FROM priced
+        ON CONFLICT (financial_investment_id, valued_at) DO UPDATE
+        SET price = EXCLUDED.price, market_value = EXCLUDED.market_value
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM priced) AS valued,
+           (SELECT count(*) FROM updated) AS changed,
+           (SELECT count(*) FROM matched) - (SELECT count(*) FROM priced) AS too_large
+""")
+
+UNPRICED_SQL = text(f"""
+    SELECT upper(f.ticker_symbol) AS ticker_symbol, count(*) AS holdings
+    FROM financial_investments f
+    LEFT JOIN {STAGING_TABLE} s ON s.ticker_symbol = upper(f.ticker_symbol)
+    WHERE f.ticker_symbol IS NOT NULL AND s.ticker_symbol IS NULL
+    GROUP BY 1
+    ORDER BY 2 DESC
+""")
+
+
+class PriceFileError(ValueError):
+    pass
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            yield line, row.get('ticker_symbol'), row.get('price')
+
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise PriceFileError("Reading Parquet needs pyarrow: pip install pyarrow")
+    table = pq.read_table(path, columns=['ticker_symbol', 'price'])
+    for line, row in enumerate(table.to_pylist(), start=1):
+        yield line, row['ticker_symbol'], row['price']
+
+
+def read_prices(path):
+    """Return {TICKER: Decimal price} from a CSV or Parquet snapshot; later rows win."""
+    reader = _read_parquet if os.path.splitext(path)[1].lower() in ('.parquet', '.pq') else _read_csv
+    prices = {}
+    for line, ticker, price in reader(path):
+        if not ticker:
+            raise PriceFileError(f"{path}:{line}: missing ticker_symbol")
+        try:
+            price = Decimal(str(price))
+        except (InvalidOperation, TypeError):
+            raise PriceFileError(f"{path}:{line}: bad price {price!r} for {ticker}")
+        if not price.is_finite() or price < 0:
+            raise PriceFileError(f"{path}:{line}: bad price {price} for {ticker}")
+        prices[ticker.strip().upper()] = price
+    return prices
+
+
+def revalue(conn, prices, valued_at=None):
+    """Apply ``prices`` to all holdings in one transaction.
+
+    Returns {"prices", "valued", "changed", "too_large", "unpriced"} where
+    too_large counts holdings skipped because their value overflows
+    numeric(14, 2) and unpriced maps tickers without a price to their number
+    of holdings.
+    """
+    valued_at = valued_at or datetime.now(timezone.utc)
+    rows = [{'ticker_symbol': ticker, 'price': price} for ticker, price in prices.items()]
+    with conn.begin():
+        conn.execute(CREATE_STAGING_SQL)
+        copy_rows(conn, STAGING_TABLE, ['ticker_symbol', 'price'], rows)
+        conn.execute(text(f"ANALYZE {STAGING_TABLE}"))
+        result = conn.execute(REVALUE_SQL, {"valued_at": valued_at, "max_value": MAX_MARKET_VALUE}).one()
+        unpriced = {row.ticker_symbol: row.holdings for row in conn.execute(UNPRICED_SQL)}
+    return {"prices": len(rows), "valued": result.valued, "changed": result.changed,
+            "too_large": result.too_large, "unpriced": unpriced}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revalue financial holdings from a price file")
+    parser.add_argument('path', help="CSV or Parquet file with ticker_symbol and price columns")
+    parser.add_argument('--as-of', type=datetime.fromisoformat,
+                        help="valuation timestamp (ISO 8601, default now)")
+    args = parser.parse_args()
+
+    print("💹 REVALUING HOLDINGS")
+    print("=" * 30)
+    try:
+        prices = read_prices(args.path)
+    except PriceFileError as e:
+        raise SystemExit(f"❌ {e}")
+    with engine.connect() as conn:
+        result = revalue(conn, prices, args.as_of)
+    print(f"  prices loaded: {result['prices']:,}")
+    print(f"  holdings valued: {result['valued']:,} ({result['changed']:,} changed)")
+    if result['too_large']:
+        print(f"⚠️  Skipped {result['too_large']:,} holdings whose value exceeds {MAX_MARKET_VALUE:,}")
+    if result['unpriced']:
+        print(f"⚠️  No price for {len(result['unpriced'])} tickers:")
+        for ticker, holdings in list(result['unpriced'].items())[:20]:
+            print(f"    {ticker}: {holdings} holdings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Vectorized ROI engine.
+
+A user's investments and investment_returns are loaded with two queries into
+NumPy column arrays, and every ROI figure is computed from those arrays in a
+single pass: no Python loop runs per investment or per return.
+
+    roi = (amount returned - amount invested) / amount invested * 100
+
+The time-weighted ROI divides the total gain by capital-years (amount
+invested x years since invested_at), i.e. the gain per unit of capital per
+year held, so a return earned over five years weighs less than the same
+return earned in one. Amounts are only ever added up within one currency
+('hours' counting as its own), so totals are reported per currency.
+
+Usage:
+    python roi.py <user_id>
+"""
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from db import engine
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+# 'USD', 'EUR', ... upper-cased; NULL or any spelling of hours is 'hours'
+CURRENCY_SQL = "CASE WHEN i.currency IS NULL OR lower(i.currency) = 'hours' THEN 'hours' ELSE upper(i.currency) END"
+
+
+class Portfolio:
+    """Column arrays for one user's investments and their returns.
+
+    ``return_index`` maps each return to its investment's position in the
+    investment arrays. Returns are in their investment's currency.
+    """
+
+    def __init__(self, investment_ids, category_ids, types, currencies, invested, invested_at,
+                 return_index, returned, return_dates):
+        self.investment_ids = investment_ids
+        self.category_ids = category_ids
+        self.types = types
+        self.currencies = currencies
+        self.invested = invested
+        self.invested_at = invested_at
+        self.return_index = return_index
+        self.returned = returned
+        self.return_dates = return_dates
+
+    def __len__(self):
+        return len(self.investment_ids)
+
+    @classmethod
+    def from_rows(cls, investment_rows, return_rows):
+        """Build from (id, category_id, type, currency, amount, epoch) and (investment_id, amount, epoch) rows."""
+        investment_rows = list(investment_rows)
+        return_rows = list(return_rows)
+        inv = list(zip(*investment_rows)) if investment_rows else [(), (), (), (), (), ()]
+        ret = list(zip(*return_rows)) if return_rows else [(), (), ()]
+
+        investment_ids = np.array([str(i) for i in inv[0]], dtype=object)
+        return_ids = np.array([str(i) for i in ret[0]], dtype=object)
+        order = np.argsort(investment_ids)
+        if len(return_ids):
+            positions = np.searchsorted(investment_ids[order], return_ids)
+            return_index = order[positions]
+        else:
+            return_index = np.zeros(0, dtype=np.intp)
+
+        return cls(
+            investment_ids=investment_ids,
+            category_ids=np.array([str(c) for c in inv[1]], dtype=object),
+            types=np.array(inv[2], dtype=object),
+            currencies=np.array(inv[3], dtype=object),
+            invested=np.array(inv[4], dtype=np.float64),
+            invested_at=np.array(inv[5], dtype=np.float64),
+            return_index=return_index,
+            returned=np.array(ret[1], dtype=np.float64),
+            return_dates=np.array(ret[2], dtype=np.float64),
+        )
+
+
+def load_portfolio(conn, user_id, investment_type=None, return_types=None, currency=None):
+    """Load a user's investments and returns as a Portfolio.
+
+    ``investment_type`` limits to 'money', 'time' or 'energy';
+    ``return_types`` limits which investment_returns.type values count;
+    ``currency`` limits to one currency, e.g. 'USD' or 'hours'.
+    """
+    filters = []
+    if investment_type:
+        filters.append("AND i.type = :investment_type")
+    if currency:
+        filters.append(f"AND {CURRENCY_SQL} = :currency")
+    inv_filter = ' '.join(filters)
+    ret_filter = "AND r.type = ANY(:return_types)" if return_types else ""
+    params = {"user_id": user_id, "investment_type": investment_type,
+              "return_types": list(return_types or []),
+              "currency": 'hours' if currency and currency.lower() == 'hours' else (currency or '').upper()}
+
+    investments = conn.execute(text(f"""
+        SELECT i.id, i.category_id, i.type, {CURRENCY_SQL}, i.amount_invested,
+               EXTRACT(EPOCH FROM i.invested_at)
+        FROM investments i
+        WHERE i.user_id = :user_id {inv_filter}
+    """), params)
+    returns = conn.execute(text(f"""
+        SELECT r.investment_id, r.amount_returned, EXTRACT(EPOCH FROM r.return_date)
+        FROM investment_returns r
+        JOIN investments i ON i.id = r.investment_id
+        WHERE i.user_id = :user_id {inv_filter} {ret_filter}
+    """), params)
+    return Portfolio.from_rows(investments, returns)
+
+
+class ROIReport:
+    """Result of compute_roi(); per-investment figures are aligned with the Portfolio arrays.
+
+    ``by_category`` is keyed by (category_id, currency) and ``by_currency``
+    by currency, each holding invested, returned and roi; ``by_currency``
+    also has the time-weighted ROI.
+    """
+
+    def __init__(self, returned, gain, roi, annualized_roi, by_category, by_currency):
+        self.returned = returned
+        self.gain = gain
+        self.roi = roi
+        self.annualized_roi = annualized_roi
+        self.by_category = by_category
+        self.by_currency = by_currency
+
+
+def _percent(numerator, denominator):
+    out = np.full(np.shape(numerator), np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * 100
+
+
+def _grouped(keys, invested, returned):
+    """Unique keys with their summed invested and returned amounts."""
+    groups, index = np.unique(keys, return_inverse=True)
+    group_invested = np.bincount(index, weights=invested, minlength=len(groups))
+    group_returned = np.bincount(index, weights=returned, minlength=len(groups))
+    return groups, index, group_invested, group_returned
+
+
+def compute_roi(portfolio, as_of=None):
+    """Compute per-investment, per-category and per-currency ROI in one vectorized pass.
+
+    ``as_of`` is an epoch timestamp (defaults to now) used for holding periods.
+    ROI is NaN where nothing was invested.
+    """
+    as_of = time.time() if as_of is None else as_of
+    n = len(portfolio)
+    invested = portfolio.invested
+
+    returned = np.bincount(portfolio.return_index, weights=portfolio.returned, minlength=n)
+    gain = returned - invested
+    roi = _percent(gain, invested)
+
+    years = np.maximum(as_of - portfolio.invested_at, 0) / SECONDS_PER_YEAR
+    growth = np.divide(returned, invested, out=np.full(n, np.nan), where=invested > 0)
+    annualized = np.full(n, np.nan)
+    np.power(growth, 1 / np.where(years > 0, years, 1), out=annualized,
+             where=(years > 0) & (growth >= 0))
+    annualized = (annualized - 1) * 100
+
+    currencies, currency_index, currency_invested, currency_returned = _grouped(
+        portfolio.currencies, invested, returned)
+    capital_years = np.bincount(currency_index, weights=invested * years, minlength=len(currencies))
+    currency_gain = currency_returned - currency_invested
+    currency_roi = _percent(currency_gain, currency_invested)
+    time_weighted = _percent(currency_gain, capital_years)
+    by_currency = {
+        currency: {"invested": float(i), "returned": float(r), "roi": float(p), "time_weighted_roi": float(t)}
+        for currency, i, r, p, t in zip(currencies, currency_invested, currency_returned, currency_roi,
+                                         time_weighted)
+    }
+
+    # One group per (category, currency) pair, numbered category-major
+    category_ids, category_index = np.unique(portfolio.category_ids, return_inverse=True)
+    pairs, _, pair_invested, pair_returned = _grouped(
+        category_index * len(currencies) + currency_index, invested, returned)
+    pair_roi = _percent(pair_returned - pair_invested, pair_invested)
+    by_category = {
+        (category_ids[pair // len(currencies)], currencies[pair % len(currencies)]):
+            {"invested": float(i), "returned": float(r), "roi": float(p)}
+        for pair, i, r, p in zip(pairs, pair_invested, pair_returned, pair_roi)
+    }
+
+    return ROIReport(
+        returned=returned, gain=gain, roi=roi, annualized_roi=annualized,
+        by_category=by_category, by_currency=by_currency,
+    )
+
+
+def update_return_percentages(conn, user_id=None):
+    """Fill investment_returns.roi_percentage in one UPDATE.
+
+    Each return stores the investment's cumulative ROI as of that return:
+    (all returns up to and including it - amount invested) / amount invested.
+    The latest return therefore matches the investment's ROI in compute_roi().
+    """
+    user_filter = "AND i.user_id = :user_id" if user_id else ""
+    with conn.begin():
+        result = conn.execute(text(f"""
+            UPDATE investment_returns r
+            SET roi_percentage = c.roi_percentage
+            FROM (
+                SELECT r.id,
+                       ROUND((SUM(r.amount_returned) OVER (PARTITION BY r.investment_id
+                                                           ORDER BY r.return_date, r.id)
+                              - i.amount_invested) / i.amount_invested * 100, 2) AS roi_percentage
+                FROM investment_returns r
+                JOIN investments i ON i.id = r.investment_id
+                WHERE i.amount_invested > 0 {user_filter}
+            ) AS c
+            WHERE r.id = c.id
+        """), {"user_id": user_id})
+    return result.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio ROI for one user")
+    parser.add_argument('user_id')
+    parser.add_argument('--type', choices=['money', 'time', 'energy'], help="only this investment type")
+    parser.add_argument('--currency', help="only this currency, e.g. USD or hours")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        portfolio = load_portfolio(conn, args.user_id, investment_type=args.type, currency=args.currency)
+    started = time.perf_counter()
+    report = compute_roi(portfolio)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print("📈 ROI REPORT")
+    print("=" * 30)
+    print(f"  Investments: {len(portfolio)}")
+    for currency, stats in report.by_currency.items():
+        print(f"\n  {currency}: invested {stats['invested']:.2f}, returned {stats['returned']:.2f}")
+        print(f"    ROI: {stats['roi']:.2f}%, time-weighted: {stats['time_weighted_roi']:.2f}% per year")
+    print("\n  By category:")
+    for (category, currency), stats in report.by_category.items():
+        print(f"    {category}: {stats['roi']:.2f}% ({stats['returned']:.2f} / {stats['invested']:.2f} {currency})")
+    print(f"\n⏱️  Computed in {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-user daily investment rollups.
+
+investment_daily_rollups holds one row per (user, category, type, currency,
+UTC day) and is kept current by statement-level triggers on investments (see
+migration 098f267e51a0). Range totals read at most one row per day and key
+instead of every investment in the range.
+
+Usage:
+    python rollups.py backfill
+    python rollups.py backfill --user <user_id>
+    python rollups.py totals <user_id> 2024-10-01 2024-10-31
+"""
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+
+from db import engine
+
+GROUP_COLUMNS = ('category_id', 'type', 'currency')
+
+BACKFILL_SQL = """
+    INSERT INTO investment_daily_rollups
+        (user_id, category_id, type, currency, day, total_amount, investment_count)
+    SELECT user_id, category_id, type, COALESCE(currency, ''),
+           (invested_at AT TIME ZONE 'UTC')::date,
+           SUM(amount_invested), COUNT(*)
+    FROM investments
+    {where}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def backfill(conn, user_id=None):
+    """Rebuild rollups from investments, for one user or everyone.
+
+    Writes to investments are blocked while the rebuild runs so the triggers
+    and the rebuild can't double count.
+    """
+    with conn.begin():
+        conn.execute(text("LOCK TABLE investments IN SHARE MODE"))
+        if user_id is None:
+            conn.execute(text("TRUNCATE investment_daily_rollups"))
+            result = conn.execute(text(BACKFILL_SQL.format(where="")))
+        else:
+            conn.execute(text("DELETE FROM investment_daily_rollups WHERE user_id = :user_id"),
+                         {"user_id": user_id})
+            result = conn.execute(text(BACKFILL_SQL.format(where="WHERE user_id = :user_id")),
+                                  {"user_id": user_id})
+        return result.rowcount
+
+
+def range_totals(conn, user_id, start, end, type=None, category_id=None, group_by=('type', 'currency')):
+    """Sum a user's investments with start <= day <= end.
+
+    Returns a list of dicts with the ``group_by`` columns plus ``total_amount``
+    and ``investment_count``. Amounts in different currencies are never
+    added together, so keep 'currency' in ``group_by`` unless a filter
+    already pins it down.
+    """
+    for column in group_by:
+        if column not in GROUP_COLUMNS + ('day',):
+            raise ValueError(f"Cannot group rollups by {column!r}")
+
+    filters = ["user_id = :user_id", "day BETWEEN :start AND :end"]
+    params = {"user_id": user_id, "start": start, "end": end}
+    if type is not None:
+        filters.append("type = :type")
+        params["type"] = type
+    if category_id is not None:
+        filters.append("category_id = :category_id")
+        params["category_id"] = category_id
+
+    columns = ', '.join(group_by)
+    select_columns = f"{columns}, " if group_by else ""
+    group_clause = f"GROUP BY {columns} ORDER BY {columns}" if group_by else ""
+    result = conn.execute(text(f"""
+        SELECT {select_columns}SUM(total_amount) AS total_amount,
+               SUM(investment_count) AS investment_count
+        FROM investment_daily_rollups
+        WHERE {' AND '.join(filters)}
+        {group_clause}
+    """), params)
+    return [dict(row._mapping) for row in result if row.investment_count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Investment daily rollups")
+    sub = parser.add_subparsers(dest='command', required=True)
+    backfill_parser = sub.add_parser('backfill', help="rebuild rollups from investments")
+    backfill_parser.add_argument('--user', help="only rebuild this user's rollups")
+    totals_parser = sub.add_parser('totals', help="print a user's totals for a date range")
+    totals_parser.add_argument('user_id')
+    totals_parser.add_argument('start', type=date.fromisoformat)
+    totals_parser.add_argument('end', type=date.fromisoformat)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if args.command == 'backfill':
+            rows = backfill(conn, user_id=args.user)
+            print(f"✅ Rebuilt {rows} rollup rows")
+        else:
+            for row in range_totals(conn, args.user_id, args.start, args.end):
+                print(f"  {row['type']}: {row['total_amount']} {row['currency'] or ''} "
+                      f"({row['investment_count']} investments)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Read/write routing between the primary and read replicas.
+
+Writes always go to the primary (DATABASE_URL). Read-only work that can
+tolerate a little staleness (listings, summaries, search) goes to a replica
+from DATABASE_REPLICA_URLS, round-robin, as long as:
+
+  * the replica is reachable within DB_REPLICA_CONNECT_TIMEOUT_S, is in
+    recovery (a standby, not a promoted or misconfigured primary) and no
+    more than DB_REPLICA_MAX_LAG_S behind. Each replica is checked at most
+    every DB_REPLICA_CHECK_S seconds, on demand, and an unhealthy replica
+    is left out until a later check passes;
+  * the user has not written recently. After a write, note_write() records
+    the primary's WAL position (LSN) for the user, and that user's reads go
+    only to replicas that have replayed past it, or to the primary. A
+    replica whose position cannot be read (only a standalone server used
+    as a stand-in in tests, see Router.allow_primary) is treated as not
+    caught up, so the user reads from the primary for DB_STICKY_S seconds
+    after each write.
+
+If no replica qualifies, the read goes to the primary, so routing never
+makes a read fail that would have worked before. Without replicas
+configured every call is a pass-through to the primary and no extra
+queries are run.
+
+Stickiness lives in process memory. With several API processes a user's
+next read may land on a process that did not see the write, so keep
+DB_STICKY_S above the usual replica lag to fall back on the lag limit.
+
+Settings (read from the environment / .env):
+    DATABASE_REPLICA_URLS   comma-separated replica URLs (default none)
+    DB_REPLICA_MAX_LAG_S    seconds of lag beyond which a replica is skipped (default 5)
+    DB_REPLICA_CHECK_S      seconds between checks of one replica (default 2)
+    DB_REPLICA_CONNECT_TIMEOUT_S  seconds to wait for a replica connection (default 2)
+    DB_STICKY_S             seconds a user's reads follow their write (default 30)
+"""
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+import db
+
+REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+MAX_LAG_S = float(os.getenv('DB_REPLICA_MAX_LAG_S', '5'))
+CHECK_INTERVAL_S = float(os.getenv('DB_REPLICA_CHECK_S', '2'))
+CONNECT_TIMEOUT_S = float(os.getenv('DB_REPLICA_CONNECT_TIMEOUT_S', '2'))
+STICKY_S = float(os.getenv('DB_STICKY_S', '30'))
+
+# On a standby: replayed position and seconds since the last replayed commit
+# (0 when nothing is waiting to be replayed). Not in recovery: NULL, 0, and
+# in_recovery false, which makes the server unhealthy as a replica.
+REPLICA_STATUS_SQL = text("""
+    SELECT pg_is_in_recovery() AS in_recovery,
+           pg_last_wal_replay_lsn()::text AS lsn,
+           CASE WHEN NOT pg_is_in_recovery()
+                  OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+           END AS lag
+""")
+PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+
+
+def parse_lsn(value):
+    """'16/B374D848' -> integer WAL position, for comparisons; None stays None."""
+    if not value:
+        return None
+    high, low = value.split('/')
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+@dataclass(slots=True)
+class ReplicaStatus:
+    lsn: Optional[int] = None
+    lag: float = 0.0
+    healthy: bool = False
+    checked_at: float = float('-inf')
+
+
+@dataclass
+class Router:
+    """Chooses where a read runs. Pure bookkeeping; the engines live in Routing/AsyncRouting.
+
+    ``allow_primary`` accepts servers that are not in recovery as replicas.
+    It exists for tests that stand a second standalone server in for a
+    replica; never set it in production, where such a server is either a
+    promoted former replica or a misconfigured URL and is not receiving the
+    primary's writes.
+    """
+    replicas: int
+    max_lag: float = MAX_LAG_S
+    check_interval: float = CHECK_INTERVAL_S
+    sticky_for: float = STICKY_S
+    clock: object = time.monotonic
+    allow_primary: bool = False
+    status: list = field(init=False)
+    _sticky: dict = field(init=False, default_factory=dict)
+    _next: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.status = [ReplicaStatus() for _ in range(self.replicas)]
+
+    def record_write(self, user_id, lsn=None):
+        """The user just committed a write at WAL position ``lsn`` (an int, or None if unknown)."""
+        self._sticky[str(user_id)] = (lsn, self.clock() + self.sticky_for)
+
+    def observe(self, replica, lsn=None, lag=0.0, healthy=True, in_recovery=True):
+        healthy = healthy and (in_recovery or self.allow_primary)
+        self.status[replica] = ReplicaStatus(lsn, float(lag), healthy, self.clock())
+
+    def needs_check(self, replica):
+        return self.clock() - self.status[replica].checked_at >= self.check_interval
+
+    def _required_lsn(self, user_id):
+        """None if the user may read from any healthy replica, else (lsn or None)."""
+        if user_id is None:
+            return None
+        entry = self._sticky.get(str(user_id))
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._sticky[str(user_id)]
+            return None
+        return entry
+
+    def usable(self, replica, user_id=None):
+        status = self.status[replica]
+        if not status.healthy or status.lag > self.max_lag:
+            return False
+        required = self._required_lsn(user_id)
+        if required is None:
+            return True
+        lsn = required[0]
+        return lsn is not None and status.lsn is not None and status.lsn >= lsn
+
+    def candidates(self):
+        """Replica indexes in round-robin order, starting after the last one used."""
+        start = self._next
+        self._next = (self._next + 1) % max(1, self.replicas)
+        return [(start + offset) % self.replicas for offset in range(self.replicas)]
+
+
+class Routing:
+    """Sync engines for scripts: primary plus one engine per replica URL."""
+
+    def __init__(self, replica_urls=None, primary=None, router=None):
+        urls = REPLICA_URLS if replica_urls is None else replica_urls
+        self.primary = primary or db.engine
+        self.replicas = [db.make_engine(url, connect_args={'connect_timeout': max(1, round(CONNECT_TIMEOUT_S))})
+                         for url in urls]
+        self.router = router or Router(len(self.replicas))
+
+    def _check(self, replica):
+        try:
+            with self.replicas[replica].connect() as conn:
+                row = conn.execute(REPLICA_STATUS_SQL).one()
+            self.router.observe(replica, parse_lsn(row.lsn), row.lag, in_recovery=row.in_recovery)
+        except Exception:
+            self.router.observe(replica, healthy=False)
+
+    def read_engine(self, user_id=None):
+        for replica in self.router.candidates():
+            if self.router.needs_check(replica):
+                self._check(replica)
+            if self.router.usable(replica, user_id):
+                return self.replicas[replica]
+        return self.primary
+
+    @contextmanager
+    def read(self, user_id=None):
+        """Connection for read-only work, on a replica when one qualifies."""
+        with self.read_engine(user_id).connect() as conn:
+            yield conn
+
+    @contextmanager
+    def write(self, *user_ids):
+        """Connection to the primary; commits at the end and records the users' write."""
+        with self.primary.connect() as conn:
+            yield conn
+            conn.commit()
+            if self.replicas and user_ids:
+                lsn = parse_lsn(conn.execute(PRIMARY_LSN_SQL).scalar())
+                conn.commit()
+                for user_id in user_ids:
+                    self.router.record_write(user_id, lsn)
+
+    def dispose(self):
+        for engine in self.replicas:
+            engine.dispose()
+
+
+class AsyncRouting:
+    """Async counterpart for the API; replica engines are created on first use."""
+
+    def __init__(self, replica_urls=None, router=None):
+        self.urls = REPLICA_URLS if replica_urls is None else replica_urls
+        self.router = router or Router(len(self.urls))
+        self._engines = None
+        self._sessionmakers = None
+
+    def _sessionmaker(self, replica):
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        if self._engines is None:
+            self._engines = [db.make_async_engine(url, connect_args={'timeout': CONNECT_TIMEOUT_S})
+                             for url in self.urls]
+            self._sessionmakers = [async_sessionmaker(engine, expire_on_commit=False) for engine in self._engines]
+        return self._engines[replica], self._sessionmakers[replica]
+
+    async def _check(self, replica):
+        engine, _ = self._sessionmaker(replica)
+        try:
+            async with engine.connect() as conn:
+                row = (await conn.execute(REPLICA_STATUS_SQL)).one()
+            self.router.observe(replica, parse_lsn(row.lsn), row.lag, in_recovery=row.in_recovery)
+        except Exception:
+            self.router.observe(replica, healthy=False)
+
+    async def read_sessionmaker(self, user_id=None):
+        for replica in self.router.candidates():
+            if self.router.needs_check(replica):
+                await self._check(replica)
+            if self.router.usable(replica, user_id):
+                return self._sessionmaker(replica)[1]
+        return db.get_async_sessionmaker()
+
+    async def note_write(self, session, *user_ids):
+        """Call after committing a write on ``session`` (the primary) for these users."""
+        if not self.urls or not user_ids:
+            return
+        lsn = parse_lsn((await session.execute(PRIMARY_LSN_SQL)).scalar())
+        await session.commit()
+        for user_id in user_ids:
+            self.router.record_write(user_id, lsn)
+
+    async def dispose(self):
+        if self._engines is not None:
+            for engine in self._engines:
+                await engine.dispose()
+        self._engines = None
+        self._sessionmakers = None
+
+
+routing = AsyncRouting()
+
+
+async def note_write(session, *user_ids):
+    await routing.note_write(session, *user_ids)
+
+
+@asynccontextmanager
+async def read_session(user_id=None):
+    async with (await routing.read_sessionmaker(user_id))() as session:
+        yield session
+
+
+async def get_read_session(user_id: UUID):
+    """FastAPI dependency for read-only /users/{user_id}/... endpoints."""
+    async with read_session(user_id) as session:
+        yield session
@@ -0,0 +1,128 @@
+"""Ranked full-text search over a user's investments, job applications and courses.
+
+Each searchable table has a generated, weighted ``search_vector`` column
+with a GIN index (migration 1ae372d9b52e), so a search is an index lookup
+no matter how much text is stored. The query string accepts web-search
+syntax: ``python -sql``, ``"machine learning"``, ``react or vue``.
+
+Hits from all sources are ranked together with ts_rank_cd and only the page
+that is returned gets highlighted, since ts_headline re-parses the text.
+Highlights are HTML-escaped with matches wrapped in <mark>...</mark>.
+
+Usage:
+    python search.py <user_id> "query" [--kind job_application]
+"""
+import argparse
+import html
+
+from sqlalchemy import text
+
+from routing import Routing
+
+MAX_LIMIT = 100
+
+# Sent by ts_headline around matches; replaced by HIGHLIGHT_TAGS after escaping
+START, STOP = '\x02', '\x03'
+HIGHLIGHT_TAGS = ('<mark>', '</mark>')
+HEADLINE_OPTIONS = f"StartSel={START}, StopSel={STOP}, MaxFragments=2, MaxWords=25, MinWords=8"
+TITLE_OPTIONS = f"StartSel={START}, StopSel={STOP}, HighlightAll=true"
+
+# kind -> one branch of the search: investment id, title, body, matched vector, date; filtered to :user_id
+SOURCES = {
+    'investment': """
+        SELECT 'investment' AS kind, i.id AS investment_id, i.title AS title,
+               coalesce(i.description, '') AS body, i.search_vector AS document, i.invested_at AS at
+        FROM investments i
+        WHERE i.user_id = :user_id AND i.search_vector @@ (SELECT q FROM query)
+    """,
+    'job_application': """
+        SELECT 'job_application', j.investment_id, j.company_name || ' - ' || j.position,
+               coalesce(j.notes, ''), j.search_vector, j.applied_at
+        FROM job_applications j
+        WHERE j.user_id = :user_id AND j.search_vector @@ (SELECT q FROM query)
+    """,
+    'learning': """
+        SELECT 'learning', l.investment_id, l.course_name,
+               concat_ws(' - ', l.platform, l.instructor), l.search_vector, i.invested_at
+        FROM learning_investments l
+        JOIN investments i ON i.id = l.investment_id
+        WHERE i.user_id = :user_id AND l.search_vector @@ (SELECT q FROM query)
+    """,
+}
+
+
+def search_sql(kinds=None):
+    kinds = tuple(kinds or SOURCES)
+    for kind in kinds:
+        if kind not in SOURCES:
+            raise ValueError(f"Cannot search {kind!r}; expected one of {', '.join(SOURCES)}")
+    hits = ' UNION ALL '.join(SOURCES[kind] for kind in kinds)
+    return f"""
+        WITH query AS (SELECT websearch_to_tsquery('english', :q) AS q),
+        hits AS ({hits}),
+        page AS (
+            SELECT kind, investment_id, title, body, at, ts_rank_cd(document, (SELECT q FROM query)) AS rank
+            FROM hits
+            ORDER BY rank DESC, at DESC, investment_id
+            LIMIT :limit OFFSET :offset
+        )
+        SELECT kind, investment_id, at, rank,
+               ts_headline('english', title, (SELECT q FROM query), '{TITLE_OPTIONS}') AS title,
+               ts_headline('english', body, (SELECT q FROM query), '{HEADLINE_OPTIONS}') AS snippet
+        FROM page
+        ORDER BY rank DESC, at DESC, investment_id
+    """
+
+
+def highlight(headline):
+    """HTML-escape a ts_headline result and turn its match markers into <mark> tags."""
+    escaped = html.escape(headline or '', quote=False)
+    return escaped.replace(START, HIGHLIGHT_TAGS[0]).replace(STOP, HIGHLIGHT_TAGS[1])
+
+
+def search(conn, user_id, q, kinds=None, limit=20, offset=0):
+    """One page of the user's matches for ``q``, best first.
+
+    Returns [{"kind", "investment_id", "title", "snippet", "rank", "at"}],
+    with ``title`` and ``snippet`` highlighted. An empty or stop-word-only
+    query matches nothing.
+    """
+    if not q or not q.strip():
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    result = conn.execute(text(search_sql(kinds)), {
+        "user_id": user_id, "q": q, "limit": limit, "offset": max(0, offset),
+    })
+    return [
+        {
+            "kind": row.kind,
+            "investment_id": row.investment_id,
+            "title": highlight(row.title),
+            "snippet": highlight(row.snippet),
+            "rank": round(float(row.rank), 6),
+            "at": row.at,
+        }
+        for row in result
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over a user's history")
+    parser.add_argument('user_id')
+    parser.add_argument('query')
+    parser.add_argument('--kind', action='append', choices=list(SOURCES))
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    with Routing().read(args.user_id) as conn:
+        hits = search(conn, args.user_id, args.query, args.kind, args.limit)
+    print(f"🔎 {len(hits)} results for {args.query!r}")
+    print("=" * 30)
+    for hit in hits:
+        print(f"  [{hit['kind']}] {hit['title']}  ({hit['rank']:.3f})")
+        if hit['snippet']:
+            print(f"      {hit['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
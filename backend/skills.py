@@ -0,0 +1,192 @@
+"""Skill search and autocomplete over learning_investments.skills_learned.
+
+SkillIndex keeps every skill in memory as a sorted key list (prefix lookups
+are two bisects) plus inverted indexes skill -> courses and user -> skills,
+so autocomplete never touches Postgres. refresh() pulls only rows created
+since the last refresh (with an overlap window for late commits); reload()
+rebuilds everything, e.g. after bulk edits or deletes.
+
+Skills are matched case-insensitively; the first spelling seen is displayed.
+
+Usage:
+    python skills.py complete pyt
+    python skills.py courses python
+    python skills.py inventory <user_id>
+"""
+import argparse
+import bisect
+import heapq
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from db import engine
+
+# Re-read rows this far behind the watermark to catch transactions that
+# committed after a later-created row was already seen
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+ROWS_SQL = """
+    SELECT l.id, l.investment_id, i.user_id, l.course_name, l.platform,
+           l.skills_learned, l.completion_percentage, l.created_at
+    FROM learning_investments l
+    JOIN investments i ON i.id = l.investment_id
+    {where}
+    ORDER BY l.created_at
+"""
+
+
+def normalize(skill):
+    return ' '.join(skill.split()).lower()
+
+
+class SkillIndex:
+    def __init__(self):
+        self._keys = []            # sorted normalized skills
+        self._display = {}         # normalized -> first spelling seen
+        self._courses = {}         # normalized -> {learning id: course}
+        self._users = {}           # user_id -> Counter(normalized)
+        self._rows = {}            # learning id -> (user_id, skills)
+        self._lock = threading.RLock()
+        self.watermark = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def apply(self, row):
+        """Add or update one learning_investments row (a mapping)."""
+        row_id = str(row['id'])
+        user_id = str(row['user_id'])
+        skills = {normalize(s): s for s in (row['skills_learned'] or []) if s and s.strip()}
+        course = {
+            'id': row_id, 'investment_id': str(row['investment_id']), 'user_id': user_id,
+            'course_name': row['course_name'], 'platform': row.get('platform'),
+            'completion_percentage': row.get('completion_percentage'),
+        }
+        with self._lock:
+            previous = self._rows.get(row_id)
+            if previous is not None:
+                self._remove(row_id, *previous)
+            for key, spelling in skills.items():
+                if key not in self._courses:
+                    bisect.insort(self._keys, key)
+                    self._courses[key] = {}
+                    self._display.setdefault(key, spelling)
+                self._courses[key][row_id] = course
+                self._users.setdefault(user_id, Counter())[key] += 1
+            self._rows[row_id] = (user_id, tuple(skills))
+            created_at = row.get('created_at')
+            if created_at is not None and (self.watermark is None or created_at > self.watermark):
+                self.watermark = created_at
+
+    def _remove(self, row_id, user_id, keys):
+        user_skills = self._users.get(user_id, Counter())
+        for key in keys:
+            courses = self._courses.get(key, {})
+            courses.pop(row_id, None)
+            user_skills[key] -= 1
+            if user_skills[key] <= 0:
+                del user_skills[key]
+            if not courses:
+                self._courses.pop(key, None)
+                self._display.pop(key, None)
+                index = bisect.bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+        del self._rows[row_id]
+
+    def autocomplete(self, prefix, limit=10, user_id=None):
+        """Return up to ``limit`` (skill, course_count) pairs starting with ``prefix``, most used first."""
+        prefix = normalize(prefix)
+        with self._lock:
+            if user_id is not None:
+                counts = self._users.get(str(user_id), Counter())
+                matches = ((key, n) for key, n in counts.items() if key.startswith(prefix))
+            else:
+                lo = bisect.bisect_left(self._keys, prefix)
+                hi = bisect.bisect_left(self._keys, prefix + '\uffff')
+                matches = ((key, len(self._courses[key])) for key in self._keys[lo:hi])
+            best = heapq.nsmallest(limit, matches, key=lambda m: (-m[1], m[0]))
+            return [(self._display[key], n) for key, n in best]
+
+    def courses_for_skill(self, skill, user_id=None):
+        """Return the courses that taught ``skill``, optionally only one user's."""
+        with self._lock:
+            courses = list(self._courses.get(normalize(skill), {}).values())
+        if user_id is not None:
+            courses = [c for c in courses if c['user_id'] == str(user_id)]
+        return sorted(courses, key=lambda c: c['course_name'])
+
+    def user_inventory(self, user_id):
+        """Return {skill: number of courses} for one user, most frequent first."""
+        with self._lock:
+            counts = self._users.get(str(user_id), Counter())
+            return {self._display[key]: n for key, n in counts.most_common()}
+
+    def refresh(self, conn):
+        """Apply rows created since the last refresh; returns how many were read."""
+        if self.watermark is None:
+            return self.reload(conn)
+        rows = conn.execute(text(ROWS_SQL.format(where="WHERE l.created_at > :since")),
+                            {"since": self.watermark - REFRESH_OVERLAP})
+        count = 0
+        for row in rows:
+            self.apply(row._mapping)
+            count += 1
+        return count
+
+    def reload(self, conn):
+        """Rebuild the index from every learning_investments row."""
+        fresh = SkillIndex()
+        count = 0
+        for row in conn.execute(text(ROWS_SQL.format(where=""))):
+            fresh.apply(row._mapping)
+            count += 1
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != '_lock'})
+        return count
+
+
+def courses_with_skill(conn, skill, user_id=None):
+    """Database lookup through the GIN index; exact, case-sensitive match."""
+    user_filter = "AND i.user_id = :user_id" if user_id else ""
+    result = conn.execute(text(f"""
+        SELECT l.id, l.investment_id, i.user_id, l.course_name, l.platform, l.completion_percentage
+        FROM learning_investments l
+        JOIN investments i ON i.id = l.investment_id
+        WHERE l.skills_learned @> ARRAY[CAST(:skill AS varchar)] {user_filter}
+        ORDER BY l.course_name
+    """), {"skill": skill, "user_id": user_id})
+    return [dict(row._mapping) for row in result]
+
+
+index = SkillIndex()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill autocomplete and lookups")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('complete').add_argument('prefix')
+    sub.add_parser('courses').add_argument('skill')
+    sub.add_parser('inventory').add_argument('user_id')
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        index.reload(conn)
+    print(f"🧠 {len(index)} skills indexed")
+
+    if args.command == 'complete':
+        for skill, count in index.autocomplete(args.prefix):
+            print(f"  {skill} ({count} courses)")
+    elif args.command == 'courses':
+        for course in index.courses_for_skill(args.skill):
+            print(f"  {course['course_name']} on {course['platform']}")
+    else:
+        for skill, count in index.user_inventory(args.user_id).items():
+            print(f"  {skill}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Columnar analytics snapshot of the database, for analytics.py.
+
+Streams the seven core tables through server-side cursors into Parquet
+files, partitioned by month, plus a DuckDB file whose views read them:
+
+    <SNAPSHOT_DIR>/
+        investments/month=2026-10/part-20261018T150000.parquet
+        time_logs/month=2026-10/part-20261018T150000.parquet
+        ...
+        _watermarks.json       created_at exported up to, per table
+        analytics.duckdb       one view per table over its Parquet files
+
+Each run appends only rows whose created_at is past the table's watermark,
+so it reads new rows instead of whole tables. All tables are read in one
+REPEATABLE READ, read-only transaction, so they are consistent with each
+other. Point SNAPSHOT_DATABASE_URL at a replica to keep the export off the
+primary (defaults to DATABASE_URL).
+
+The upper bound of each run trails the database clock by
+SNAPSHOT_WATERMARK_LAG_S (default 600) seconds. created_at is stamped when
+a transaction starts, so a row committed after the export read its table
+could otherwise carry a created_at below the new watermark and never be
+exported. Appending by created_at does not see updates or deletes; run with
+--full now and then to rebuild every table from scratch. A rebuild (also
+the first export of a table, or any table without a watermark) is written
+to a staging directory and swapped in once complete, so a failed run
+leaves the previous files and watermark in place.
+
+Needs pyarrow and duckdb: pip install pyarrow duckdb
+
+Usage:
+    python snapshot.py [--full] [--dir data/snapshot] [--table investments ...]
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import ARRAY, BigInteger, Boolean, Date, DateTime, Integer, Numeric, SmallInteger, Uuid, select, text
+
+from models import (FinancialInvestment, Investment, InvestmentCategory, JobApplication, LearningInvestment,
+                    TimeLog, User)
+
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                      'data', 'snapshot'))
+SNAPSHOT_DATABASE_URL = os.getenv('SNAPSHOT_DATABASE_URL')
+WATERMARK_LAG_S = int(os.getenv('SNAPSHOT_WATERMARK_LAG_S', '600'))
+BATCH_SIZE = 10_000
+WATERMARKS_FILE = '_watermarks.json'
+DUCKDB_FILE = 'analytics.duckdb'
+
+# table -> (model, column whose month partitions the files)
+TABLES = {
+    'users': (User, 'created_at'),
+    'investment_categories': (InvestmentCategory, 'created_at'),
+    'investments': (Investment, 'invested_at'),
+    'job_applications': (JobApplication, 'applied_at'),
+    'learning_investments': (LearningInvestment, 'created_at'),
+    'financial_investments': (FinancialInvestment, 'created_at'),
+    'time_logs': (TimeLog, 'logged_date'),
+}
+
+# Never leave the database: secrets, and derived columns with no use in analytics
+EXCLUDED_COLUMNS = {'password_hash', 'search_vector'}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SnapshotError("Writing Parquet snapshots needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise SnapshotError("The analytics database needs duckdb: pip install duckdb")
+    return duckdb
+
+
+def export_columns(table):
+    return [column for column in table.columns if column.name not in EXCLUDED_COLUMNS]
+
+
+def arrow_type(pa, column_type):
+    """The Arrow type a column is written as; UUIDs become strings."""
+    if isinstance(column_type, Uuid):
+        return pa.string()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, BigInteger):
+        return pa.int64()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, Numeric):
+        if column_type.precision is None:
+            return pa.float64()
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us', tz='UTC' if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, ARRAY):
+        return pa.list_(arrow_type(pa, column_type.item_type))
+    return pa.string()
+
+
+def arrow_schema(pa, table):
+    return pa.schema([(column.name, arrow_type(pa, column.type)) for column in export_columns(table)])
+
+
+def partition_month(value):
+    """'YYYY-MM' of a date or timestamp (UTC), or 'unknown' for NULL."""
+    if value is None:
+        return 'unknown'
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def export_statement(table, low=None, high=None):
+    """Rows created after ``low`` and up to ``high``; without ``low`` rows with no created_at too."""
+    created_at = table.c.created_at
+    statement = select(*export_columns(table))
+    if high is not None:
+        statement = statement.where(created_at <= high if low is not None else
+                                    (created_at <= high) | created_at.is_(None))
+    if low is not None:
+        statement = statement.where(created_at > low)
+    return statement
+
+
+def load_watermarks(root):
+    path = os.path.join(root, WATERMARKS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return {table: datetime.fromisoformat(value) for table, value in json.load(f).items()}
+
+
+def save_watermarks(root, watermarks):
+    path = os.path.join(root, WATERMARKS_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({table: value.isoformat() for table, value in sorted(watermarks.items())}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _cell(value):
+    return str(value) if isinstance(value, UUID) else value
+
+
+def export_table(conn, name, root, run_id, low=None, high=None, batch_size=BATCH_SIZE):
+    """Append ``name``'s new rows to its Parquet files, one file per month; returns the row count.
+
+    Files are written under a temporary name and renamed once the whole
+    table is exported, so readers never see a partial run.
+    """
+    pa = _pyarrow()
+    model, partition_column = TABLES[name]
+    table = model.__table__
+    schema = arrow_schema(pa, table)
+    position = schema.names.index(partition_column)
+
+    writers, rows = {}, 0
+    try:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            export_statement(table, low, high))
+        for batch in result.partitions():
+            by_month = {}
+            for row in batch:
+                by_month.setdefault(partition_month(row[position]), []).append(row)
+            for month, month_rows in by_month.items():
+                if month not in writers:
+                    directory = os.path.join(root, name, f"month={month}")
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"part-{run_id}.parquet")
+                    writers[month] = (path, pa.parquet.ParquetWriter(f"{path}.tmp", schema))
+                columns = [pa.array([_cell(row[i]) for row in month_rows], type=field.type)
+                           for i, field in enumerate(schema)]
+                writers[month][1].write_table(pa.Table.from_arrays(columns, schema=schema))
+            rows += len(batch)
+    except BaseException:
+        for path, writer in writers.values():
+            writer.close()
+            os.remove(f"{path}.tmp")
+        raise
+    for path, writer in writers.values():
+        writer.close()
+        os.replace(f"{path}.tmp", path)
+    return rows
+
+
+def rebuild_table(conn, name, root, run_id, watermarks, high=None):
+    """Export all of ``name`` into a staging directory, then swap it in for the current files.
+
+    The table's watermark is removed on disk before the swap, so a run that
+    dies part way through rebuilds the table again next time instead of
+    appending to a mix of old and new files.
+    """
+    staging = os.path.join(root, f".rebuild-{run_id}")
+    try:
+        rows = export_table(conn, name, staging, run_id, high=high)
+        if watermarks.pop(name, None) is not None:
+            save_watermarks(root, watermarks)
+        target = os.path.join(root, name)
+        if os.path.isdir(target):
+            os.replace(target, os.path.join(staging, f"{name}.old"))
+        if os.path.isdir(os.path.join(staging, name)):
+            os.replace(os.path.join(staging, name), target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return rows
+
+
+def build_duckdb(root, path=None):
+    """(Re)create one DuckDB view per exported table over its Parquet files."""
+    duckdb = _duckdb()
+    path = path or os.path.join(root, DUCKDB_FILE)
+    con = duckdb.connect(path)
+    try:
+        for name in TABLES:
+            if not os.path.isdir(os.path.join(root, name)):
+                continue
+            files = os.path.join(os.path.abspath(root), name, '*', '*.parquet').replace("'", "''")
+            con.execute(f"""
+                CREATE OR REPLACE VIEW {name} AS
+                SELECT * FROM read_parquet('{files}', hive_partitioning = true, union_by_name = true)
+            """)
+    finally:
+        con.close()
+    return path
+
+
+def snapshot(conn, root=None, full=False, tables=None, lag_seconds=WATERMARK_LAG_S, high=None):
+    """Export new rows of ``tables`` (default all seven) and refresh the DuckDB views.
+
+    ``conn`` should be in a REPEATABLE READ transaction so every table is
+    read as of the same moment. Rows are exported up to ``high``, by default
+    the database's now() less ``lag_seconds``. Returns {table: rows exported}.
+    """
+    root = root or SNAPSHOT_DIR
+    tables = list(tables or TABLES)
+    for name in tables:
+        if name not in TABLES:
+            raise SnapshotError(f"Unknown table {name!r}; expected one of {', '.join(TABLES)}")
+    os.makedirs(root, exist_ok=True)
+
+    watermarks = load_watermarks(root)
+    if high is None:
+        high = conn.execute(text("SELECT now() - make_interval(secs => :lag)"), {"lag": lag_seconds}).scalar()
+    # Microseconds keep two runs in the same second from overwriting each other's files
+    run_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    counts = {}
+    for name in tables:
+        low = None if full else watermarks.get(name)
+        if low is None:
+            counts[name] = rebuild_table(conn, name, root, run_id, watermarks, high)
+        elif low >= high:
+            counts[name] = 0
+            continue
+        else:
+            counts[name] = export_table(conn, name, root, run_id, low, high)
+        watermarks[name] = high
+        save_watermarks(root, watermarks)
+    build_duckdb(root)
+    return counts
+
+
+def main():
+    from db import make_engine
+
+    parser = argparse.ArgumentParser(description="Export a columnar analytics snapshot")
+    parser.add_argument('--dir', default=SNAPSHOT_DIR, help="snapshot directory")
+    parser.add_argument('--full', action='store_true', help="rebuild instead of appending new rows")
+    parser.add_argument('--table', action='append', choices=list(TABLES), help="only these tables")
+    args = parser.parse_args()
+
+    # Long streaming reads: no statement timeout, one connection
+    engine = make_engine(SNAPSHOT_DATABASE_URL, statement_timeout_ms=0, pool_size=1, max_overflow=0)
+    started = time.perf_counter()
+    try:
+        with engine.connect().execution_options(isolation_level='REPEATABLE READ',
+                                                postgresql_readonly=True) as conn:
+            counts = snapshot(conn, args.dir, full=args.full, tables=args.table)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        return
+    finally:
+        engine.dispose()
+    print(f"📦 Snapshot in {args.dir}")
+    for name, rows in counts.items():
+        print(f"  {name}: {rows:,} new rows")
+    print(f"✅ Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
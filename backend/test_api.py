@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from db import get_async_session
+from investment_listing import encode_cursor
+
+client = TestClient(app)
+
+
+class ScalarResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return iter(self.values)
+
+
+class CategorySession:
+    """Async session stub that owns ``categories`` and records every statement."""
+
+    def __init__(self, categories):
+        self.categories = set(categories)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return ScalarResult([c for c in params["ids"] if c in self.categories])
+
+
+def _investment(category_id):
+    return {"category_id": str(category_id), "type": "money", "title": "Course",
+            "amount_invested": "10", "invested_at": "2024-10-18T09:00:00Z"}
+
+
+def test_health():
+    assert client.get("/health").json() == {"status": "ok"}
+    print("✅ Health endpoint")
+
+
+def test_bad_cursor_is_rejected_before_querying():
+    response = client.get(f"/users/{uuid.uuid4()}/investments", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    junk_id = encode_cursor(datetime(2024, 10, 18, tzinfo=timezone.utc), "not-a-uuid")
+    response = client.get(f"/users/{uuid.uuid4()}/investments", params={"cursor": junk_id})
+    assert response.status_code == 400
+    print("✅ Bad cursor returns 400")
+
+
+def test_invalid_investment_is_rejected():
+    response = client.post(f"/users/{uuid.uuid4()}/investments", json={
+        "category_id": str(uuid.uuid4()), "type": "gold", "title": "Bad",
+        "amount_invested": "1", "invested_at": "2024-10-18T09:00:00Z",
+    })
+    assert response.status_code == 422
+    print("✅ Invalid investment type returns 422")
+
+
+def test_time_log_rating_is_bounded():
+    response = client.post("/time-logs/batch", json=[{
+        "investment_id": str(uuid.uuid4()), "logged_date": "2024-10-18",
+        "time_spent_minutes": 30, "productivity_rating": 11,
+    }])
+    assert response.status_code == 422
+    print("✅ Productivity rating above 10 returns 422")
+
+
+def test_heartbeat_minutes_are_bounded():
+    response = client.post(f"/investments/{uuid.uuid4()}/heartbeat",
+                           json={"logged_date": "2024-10-18", "minutes": 90})
+    assert response.status_code == 422
+    print("✅ Heartbeat over 60 minutes returns 422")
+
+
+def test_search_rejects_unknown_kind():
+    response = client.get(f"/users/{uuid.uuid4()}/search", params={"q": "python", "kind": "tags"})
+    assert response.status_code == 422
+    print("✅ Unknown search kind returns 422")
+
+
+def test_foreign_category_is_rejected():
+    own, foreign = uuid.uuid4(), uuid.uuid4()
+    session = CategorySession([own])
+    app.dependency_overrides[get_async_session] = lambda: session
+    try:
+        user_id = uuid.uuid4()
+        response = client.post(f"/users/{user_id}/investments", json=_investment(foreign))
+        assert response.status_code == 422
+        assert str(foreign) in response.json()["detail"]
+
+        response = client.post(f"/users/{user_id}/investments/batch",
+                               json=[_investment(own), _investment(foreign), _investment(own)])
+        assert response.status_code == 422
+        assert str(own) not in response.json()["detail"]
+    finally:
+        del app.dependency_overrides[get_async_session]
+    # One ownership check per request and nothing inserted
+    assert len(session.statements) == 2
+    assert all("investment_categories" in sql and params["user_id"] == user_id
+               for sql, params in session.statements)
+    print("✅ Unknown or foreign category returns 422")
+
+
+if __name__ == "__main__":
+    test_health()
+    test_bad_cursor_is_rejected_before_querying()
+    test_invalid_investment_is_rejected()
+    test_time_log_rating_is_bounded()
+    test_heartbeat_minutes_are_bounded()
+    test_search_rejects_unknown_kind()
+    test_foreign_category_is_rejected()
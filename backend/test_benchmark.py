@@ -0,0 +1,65 @@
+import benchmark
+from benchmark import bench_inserts, compare, percentile
+from seed_data import Generator
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([], 50) is None
+    print("✅ Percentiles")
+
+
+def test_compare_flags_regressions():
+    baseline = {"reads": {"q": {"p50_ms": 1.0, "p99_ms": 10.0}}, "inserts": {"rows_per_second": 1000}}
+    results = {"reads": {"q": {"p50_ms": 1.1, "p99_ms": 15.0}}, "inserts": {"rows_per_second": 700}}
+
+    assert compare(results, baseline, tolerance=0.2) == [
+        ("q", "p99_ms", 10.0, 15.0),
+        ("inserts", "rows_per_second", 1000, 700),
+    ]
+    print("✅ Regressions are flagged")
+
+
+def test_generator_is_deterministic():
+    first, second = Generator(seed=7), Generator(seed=7)
+    for _ in range(5):
+        assert first.user_rows() == second.user_rows()
+    print("✅ Same seed, same rows")
+
+
+def test_generated_time_logs_have_unique_days():
+    generator = Generator(seed=3)
+    for _ in range(20):
+        logs = generator.user_rows()['time_logs']
+        keys = [(log['investment_id'], log['logged_date']) for log in logs]
+        assert len(keys) == len(set(keys))
+    print("✅ Time logs respect uq_investment_date")
+
+
+def test_insert_runs_use_fresh_seeds(monkeypatch):
+    class Engine:
+        def connect(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    seeds = []
+    monkeypatch.setattr(benchmark, 'engine', Engine())
+    monkeypatch.setattr(benchmark, 'seed', lambda conn, users, seed: seeds.append(seed) or {'users': users})
+    first, second = bench_inserts(1), bench_inserts(1)
+    assert seeds[0] != seeds[1] and first['seed'] == seeds[0]
+    print("✅ Insert benchmark seeds differ per run")
+
+
+if __name__ == "__main__":
+    test_percentile_nearest_rank()
+    test_compare_flags_regressions()
+    test_generator_is_deterministic()
+    test_generated_time_logs_have_unique_days()
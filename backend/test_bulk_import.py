@@ -0,0 +1,71 @@
+import csv
+import json
+import os
+import tempfile
+
+from bulk_import import read_records, split_record, _copy_value
+
+
+def test_split_record_resolves_investment_id():
+    rows = split_record({
+        "user_id": "u1", "category_id": "c1", "type": "time", "title": "Learn SQL",
+        "amount_invested": 2.5, "currency": "hours", "invested_at": "2024-10-18T09:00:00+00:00",
+        "learning_investment": {"course_name": "SQL 101", "skills_learned": ["sql"]},
+        "time_logs": [
+            {"logged_date": "2024-10-18", "time_spent_minutes": 90},
+            {"logged_date": "2024-10-19", "time_spent_minutes": 60},
+        ],
+    })
+
+    tables = [table for table, _ in rows]
+    assert tables == ['investments', 'learning_investments', 'time_logs', 'time_logs']
+    parent_id = rows[0][1]['id']
+    assert parent_id is not None
+    assert all(row['investment_id'] == parent_id for _, row in rows[1:])
+    print("✅ Children point at the generated parent id")
+
+
+def test_read_csv_records_nests_dotted_columns():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["user_id", "category_id", "type", "title", "amount_invested",
+                             "invested_at", "job_application.company_name",
+                             "job_application.position", "job_application.application_stage",
+                             "job_application.applied_at", "time_log.logged_date",
+                             "time_log.time_spent_minutes"])
+            writer.writerow(["u1", "c1", "energy", "Apply", "1", "2024-10-18", "Canonical",
+                             "Engineer", "applied", "2024-10-18", "", ""])
+
+        records = list(read_records(path))
+
+    assert records[0]["job_application"]["company_name"] == "Canonical"
+    assert records[0]["time_logs"] == []
+    assert records[0]["job_application"].get("job_url") is None
+    print("✅ CSV rows become nested records")
+
+
+def test_read_jsonl_records():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"title": "a"}) + "\n\n")
+            f.write(json.dumps({"title": "b"}) + "\n")
+
+        assert [r["title"] for r in read_records(path)] == ["a", "b"]
+    print("✅ JSONL lines are streamed")
+
+
+def test_copy_value_escaping():
+    assert _copy_value(None) == '\\N'
+    assert _copy_value("a\tb\nc") == 'a\\tb\\nc'
+    assert _copy_value(["sql", 'say "hi"']) == '{"sql","say \\\\"hi\\\\""}'
+    print("✅ COPY values are escaped")
+
+
+if __name__ == "__main__":
+    test_split_record_resolves_investment_id()
+    test_read_csv_records_nests_dotted_columns()
+    test_read_jsonl_records()
+    test_copy_value_escaping()
@@ -0,0 +1,260 @@
+import asyncio
+import select
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from api import schemas
+from api.cache import CHANNEL, InvalidationListener, ResponseCache, decode, encode
+
+
+class MemoryTier:
+    """In-memory stand-in for the Redis tier."""
+
+    def __init__(self):
+        self.entries = {}
+        self.generations = {}
+        self.epoch = 0
+
+    async def generation(self, user_id):
+        return f"{self.epoch}:{self.generations.get(str(user_id), 0)}"
+
+    async def get(self, user_id, key, generation):
+        raw = self.entries.get((str(user_id), key))
+        return decode(raw, generation) if raw is not None else None
+
+    async def set(self, user_id, key, value, generation):
+        self.entries[(str(user_id), key)] = encode(value, generation)
+
+    async def invalidate(self, user_id):
+        self.generations[str(user_id)] = self.generations.get(str(user_id), 0) + 1
+        self.entries = {k: v for k, v in self.entries.items() if k[0] != str(user_id)}
+
+    async def clear(self):
+        self.epoch += 1
+
+
+class ListenConnection:
+    """Stand-in for the listener's asyncpg connection."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = []
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def notify(self, payload):
+        self.listeners[CHANNEL](self, 1, CHANNEL, payload)
+
+    def terminate(self):
+        self.closed = True
+        for callback in self.on_terminate:
+            callback(self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def _summary(count):
+    return schemas.Summary(totals=[], child_counts={"time_logs": count})
+
+
+def test_entries_expire_and_least_recently_used_users_are_evicted(clock):
+    cache = ResponseCache(ttl=10, max_users=2, clock=clock)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.set(a, 'summary', 1)
+    cache.set(b, 'summary', 2)
+    assert cache.get(a, 'summary') == 1
+    cache.set(c, 'summary', 3)
+    assert cache.get(b, 'summary') is None
+    assert cache.get(a, 'summary') == 1 and cache.get(c, 'summary') == 3
+    clock.now = 10
+    assert cache.get(a, 'summary') is None
+    print("✅ LRU and TTL")
+
+
+def test_values_computed_before_an_invalidation_are_not_cached():
+    cache = ResponseCache()
+    user = uuid.uuid4()
+    generation = cache.generation(user)
+    cache.invalidate(str(user))
+    cache.set(user, 'summary', 'stale', generation)
+    assert cache.get(user, 'summary') is None
+    print("✅ Generation guard")
+
+
+def test_generations_are_bounded():
+    cache = ResponseCache(max_users=2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    generation = cache.generation(a)
+    cache.invalidate(a)
+    cache.invalidate(b)
+    cache.invalidate(c)
+    assert len(cache._generations) <= 2
+    # a's count was forgotten, but a read from before its invalidation is still refused
+    cache.set(a, 'summary', 'stale', generation)
+    assert cache.get(a, 'summary') is None
+
+    cache.invalidate(a)
+    cache.clear()
+    assert cache._generations == {}
+    print("✅ Generations bounded")
+
+
+def test_shared_tier_serves_other_workers_until_invalidated():
+    shared = MemoryTier()
+    first, second = ResponseCache(shared=shared), ResponseCache(shared=shared)
+    user = uuid.uuid4()
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return _summary(len(computed))
+
+    async def scenario():
+        assert (await first.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 1}
+        assert (await second.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 1}
+        # A notification reaches the second worker, which drops the shared copy too
+        second.invalidate(user)
+        assert (await second.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 2}
+        first.invalidate(user)
+        await first.publish()
+        assert (await first.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 3}
+
+    asyncio.run(scenario())
+    assert len(computed) == 3
+    print("✅ Shared tier")
+
+
+def test_clear_reaches_the_shared_tier():
+    shared = MemoryTier()
+    first, second = ResponseCache(shared=shared), ResponseCache(shared=shared)
+    user = uuid.uuid4()
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return _summary(len(computed))
+
+    async def scenario():
+        await first.get_or_compute(user, 'summary', compute)
+        # The first worker missed notifications while reconnecting
+        first.clear()
+        await first.publish()
+        assert (await second.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 2}
+        assert (await first.get_or_compute(user, 'summary', compute)).child_counts == {"time_logs": 2}
+
+    asyncio.run(scenario())
+    assert shared.epoch == 1 and len(computed) == 2
+    print("✅ Clear bumps the shared epoch")
+
+
+def test_listener_invalidates_and_clears_after_reconnecting():
+    cache = ResponseCache()
+    user, other = uuid.uuid4(), uuid.uuid4()
+    connections = []
+
+    async def connect():
+        if not connections:
+            connections.append(None)
+            raise OSError("connection refused")
+        connections.append(ListenConnection())
+        return connections[-1]
+
+    async def listening(count):
+        for _ in range(1000):
+            if len(connections) == count and CHANNEL in connections[-1].listeners:
+                return
+            await asyncio.sleep(0)
+        raise AssertionError(f"listener did not connect {count - 1} times")
+
+    async def scenario():
+        listener = InvalidationListener(cache, connect=connect, reconnect_delay=0)
+        cache.set(user, 'summary', 1)
+        listener.start()
+        await listening(2)
+        assert cache.get(user, 'summary') is None
+
+        cache.set(user, 'summary', 2)
+        cache.set(other, 'summary', 3)
+        connections[-1].notify(str(user))
+        assert cache.get(user, 'summary') is None and cache.get(other, 'summary') == 3
+
+        connections[-1].terminate()
+        await listening(3)
+        assert cache.get(other, 'summary') is None
+        await listener.stop()
+
+    asyncio.run(scenario())
+    assert all(conn.closed for conn in connections[1:])
+    print("✅ Listener reconnects")
+
+
+def test_only_schema_models_are_shared():
+    assert encode({"plain": "dict"}, 0) is None
+    raw = encode(_summary(4), 7)
+    assert decode(raw, 7) == _summary(4)
+    assert decode(raw, 8) is None
+    print("✅ Shared encoding")
+
+
+def test_writes_notify_the_changed_users(db_engine):
+    listen = db_engine.raw_connection()
+    try:
+        listen.set_isolation_level(0)
+        with listen.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+
+        user_id, category_id, investment_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        with db_engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO users (id, email, password_hash, full_name)
+                VALUES (:id, :email, 'hash123', 'Test User')
+            """), {"id": user_id, "email": f"test-{user_id.hex}@example.com"})
+            conn.execute(text("""
+                INSERT INTO investment_categories (id, user_id, name, type)
+                VALUES (:id, :user_id, 'Learning', 'time')
+            """), {"id": category_id, "user_id": user_id})
+            conn.execute(text("""
+                INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+                VALUES (:id, :user_id, :category_id, 'time', 'Course', 1, :invested_at)
+            """), {"id": investment_id, "user_id": user_id, "category_id": category_id,
+                   "invested_at": datetime(2024, 10, 18, tzinfo=timezone.utc)})
+            for day in ('2024-10-18', '2024-10-19'):
+                conn.execute(text("""
+                    INSERT INTO time_logs (id, investment_id, logged_date, time_spent_minutes)
+                    VALUES (gen_random_uuid(), :investment_id, :day, 30)
+                """), {"investment_id": investment_id, "day": day})
+
+        select.select([listen], [], [], 5)
+        listen.poll()
+        assert [n.payload for n in listen.notifies] == [str(user_id)]
+
+        with db_engine.begin() as conn:
+            conn.execute(text("DELETE FROM investments WHERE id = :id"), {"id": investment_id})
+            conn.execute(text("DELETE FROM investment_categories WHERE id = :id"), {"id": category_id})
+            conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+    finally:
+        listen.close()
+    print("✅ NOTIFY per changed user")
+
+
+if __name__ == "__main__":
+    from conftest import Clock
+
+    test_entries_expire_and_least_recently_used_users_are_evicted(Clock())
+    test_values_computed_before_an_invalidation_are_not_cached()
+    test_generations_are_bounded()
+    test_shared_tier_serves_other_workers_until_invalidated()
+    test_clear_reaches_the_shared_tier()
+    test_listener_invalidates_and_clears_after_reconnecting()
+    test_only_schema_models_are_shared()
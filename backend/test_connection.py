@@ -1,11 +1,8 @@
-import os
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from sqlalchemy import text
 
-load_dotenv()
+from db import engine
 
 try:
-    engine = create_engine(os.getenv('DATABASE_URL'))
     conn = engine.connect()
     
     result = conn.execute(text("SELECT version();"))
@@ -1,109 +1,65 @@
-import os
 import uuid
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timezone
-from dotenv import load_dotenv
 
-load_dotenv()
+import pytest
 
-engine = create_engine(os.getenv('DATABASE_URL'))
+INSERT_INVESTMENT = text("""
+    INSERT INTO investments
+    (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
+    VALUES
+    (:id, :user_id, :category_id, :type, :title, :amount, :currency, :invested_at)
+""")
 
-def test_constraints():
-    with engine.connect() as conn:
-        # Use individual transactions for each test
-        test_user_id = uuid.uuid4()
-        test_category_id = uuid.uuid4()
-        
-        # Setup: Create test user and category
-        with conn.begin():
-            conn.execute(text("""
-                INSERT INTO users (id, email, password_hash, full_name) 
-                VALUES (:id, 'test@example.com', 'hash123', 'Test User')
-            """), {"id": test_user_id})
-            print(" Created test user")
-            
-            conn.execute(text("""
-                INSERT INTO investment_categories (id, user_id, name, type, color) 
-                VALUES (:id, :user_id, 'Learning', 'time', '#FF5733')
-            """), {"id": test_category_id, "user_id": test_user_id})
-            print(" Created test category")
-        
-        # Test 1: Insert valid investment
-        with conn.begin():
-            try:
-                conn.execute(text("""
-                    INSERT INTO investments 
-                    (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
-                    VALUES 
-                    (:id, :user_id, :category_id, 'time', 'Learn Docker', 8.0, 'hours', :invested_at)
-                """), {
-                    "id": uuid.uuid4(),
-                    "user_id": test_user_id,
-                    "category_id": test_category_id,
-                    "invested_at": datetime.now(timezone.utc)
-                })
-                print(" Test 1 PASSED: Valid investment inserted")
-            except Exception as e:
-                print(f" Test 1 FAILED: {e}")
-        
-        # Test 2: Try invalid type (should fail)
-        try:
-            with conn.begin():
-                conn.execute(text("""
-                    INSERT INTO investments 
-                    (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
-                    VALUES 
-                    (:id, :user_id, :category_id, 'invalid_type', 'Bad Investment', 10.0, 'USD', :invested_at)
-                """), {
-                    "id": uuid.uuid4(),
-                    "user_id": test_user_id,
-                    "category_id": test_category_id,
-                    "invested_at": datetime.now(timezone.utc)
-                })
-                print(" Test 2 FAILED: Invalid type was accepted (should have failed)")
-        except Exception as e:
-            print(" Test 2 PASSED: Invalid type correctly rejected")
-        
-        # Test 3: Try without user_id (should fail)
-        try:
-            with conn.begin():
-                conn.execute(text("""
-                    INSERT INTO investments 
-                    (id, category_id, type, title, amount_invested, currency, invested_at)
-                    VALUES 
-                    (:id, :category_id, 'money', 'No User', 100.0, 'USD', :invested_at)
-                """), {
-                    "id": uuid.uuid4(),
-                    "category_id": test_category_id,
-                    "invested_at": datetime.now(timezone.utc)
-                })
-                print(" Test 3 FAILED: Investment without user_id was accepted")
-        except Exception as e:
-            print(" Test 3 PASSED: Investment without user_id correctly rejected")
-        
-        # Show the inserted data
+
+def test_constraints(db_conn):
+    conn = db_conn
+    test_user_id = uuid.uuid4()
+    test_category_id = uuid.uuid4()
+
+    # Setup: Create test user and category
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO users (id, email, password_hash, full_name)
+            VALUES (:id, 'test@example.com', 'hash123', 'Test User')
+        """), {"id": test_user_id})
+        conn.execute(text("""
+            INSERT INTO investment_categories (id, user_id, name, type, color)
+            VALUES (:id, :user_id, 'Learning', 'time', '#FF5733')
+        """), {"id": test_category_id, "user_id": test_user_id})
+
+    def investment(**overrides):
+        return {"id": uuid.uuid4(), "user_id": test_user_id, "category_id": test_category_id,
+                "type": 'time', "title": 'Learn Docker', "amount": 8.0, "currency": 'hours',
+                "invested_at": datetime.now(timezone.utc), **overrides}
+
+    # Test 1: Insert valid investment
+    with conn.begin():
+        conn.execute(INSERT_INVESTMENT, investment())
+
+    # Test 2: Invalid type violates check_investment_type
+    with pytest.raises(IntegrityError, match="check_investment_type"):
         with conn.begin():
-            result = conn.execute(text("""
-                SELECT i.title, i.type, i.amount_invested, i.currency, c.name as category
-                FROM investments i
-                JOIN investment_categories c ON i.category_id = c.id
-                WHERE i.user_id = :user_id
-            """), {"user_id": test_user_id})
-            
-            print("\n Inserted Investments:")
-            investments = list(result)
-            if investments:
-                for row in investments:
-                    print(f"  - {row[0]}: {row[1]} investment of {row[2]} {row[3]} in {row[4]}")
-            else:
-                print("  No investments found (this is expected after constraint tests)")
-        
-        # Cleanup
+            conn.execute(INSERT_INVESTMENT, investment(type='invalid_type', title='Bad Investment',
+                                                       amount=10.0, currency='USD'))
+
+    # Test 3: user_id is required
+    with pytest.raises(IntegrityError, match="user_id"):
         with conn.begin():
-            conn.execute(text("DELETE FROM investments WHERE user_id = :user_id"), {"user_id": test_user_id})
-            conn.execute(text("DELETE FROM investment_categories WHERE user_id = :user_id"), {"user_id": test_user_id})
-            conn.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": test_user_id})
-            print(" Test data cleaned up")
+            conn.execute(INSERT_INVESTMENT, investment(user_id=None, type='money', title='No User',
+                                                       amount=100.0, currency='USD'))
+
+    # Only the valid investment was stored
+    rows = conn.execute(text("""
+        SELECT i.title, i.type, i.amount_invested, i.currency, c.name as category
+        FROM investments i
+        JOIN investment_categories c ON i.category_id = c.id
+        WHERE i.user_id = :user_id
+    """), {"user_id": test_user_id}).all()
+    assert [tuple(row) for row in rows] == [('Learn Docker', 'time', 8, 'hours', 'Learning')]
+    print("✅ Investment constraints")
+
 
 if __name__ == "__main__":
-    test_constraints()
+    raise SystemExit(pytest.main([__file__, "-s"]))
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from funnel import funnel, time_to_outcome
+
+
+def test_funnel_counts_reached_stages():
+    counts = [
+        {'application_stage': 'applied', 'outcome': '', 'applications': 5},
+        {'application_stage': 'screening', 'outcome': '', 'applications': 2},
+        {'application_stage': 'interview', 'outcome': 'rejected', 'applications': 2},
+        {'application_stage': 'offer', 'outcome': 'accepted', 'applications': 1},
+        {'application_stage': 'rejected', 'outcome': 'rejected', 'applications': 2},
+    ]
+
+    steps = funnel(counts)
+
+    assert [(s['stage'], s['reached']) for s in steps] == [
+        ('applied', 12), ('screening', 5), ('interview', 3), ('offer', 1),
+    ]
+    assert steps[0]['conversion'] is None
+    assert steps[1]['conversion'] == round(5 / 12, 4)
+    assert steps[3]['conversion'] == round(1 / 3, 4)
+    print("✅ Funnel stages and conversion")
+
+
+def test_empty_funnel():
+    assert [s['reached'] for s in funnel([])] == [0, 0, 0, 0]
+    assert all(s['conversion'] is None for s in funnel([]))
+    print("✅ Empty funnel")
+
+
+def _application(conn, user_id, category_id, outcome, outcome_at=None):
+    investment_id = uuid.uuid4()
+    applied_at = datetime.now(timezone.utc) - timedelta(days=10)
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+            VALUES (:id, :user_id, :category_id, 'time', 'Apply', 1, :applied_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "applied_at": applied_at})
+        return conn.execute(text("""
+            INSERT INTO job_applications (id, investment_id, company_name, position, application_stage,
+                                          outcome, applied_at, outcome_at)
+            VALUES (gen_random_uuid(), :investment_id, 'Acme', 'Engineer', 'applied',
+                    :outcome, :applied_at, :outcome_at)
+            RETURNING outcome_at
+        """), {"investment_id": investment_id, "outcome": outcome, "applied_at": applied_at,
+               "outcome_at": outcome_at}).scalar_one()
+
+
+def test_outcome_at_is_stamped_on_insert(db_conn, make_user):
+    user_id, category_id = make_user()
+    supplied = datetime.now(timezone.utc) - timedelta(days=4)
+
+    assert _application(db_conn, user_id, category_id, 'rejected') is not None
+    assert _application(db_conn, user_id, category_id, 'accepted', supplied) == supplied
+    assert _application(db_conn, user_id, category_id, None) is None
+
+    outcomes = {row['outcome']: row for row in time_to_outcome(db_conn, user_id)}
+    assert outcomes['rejected']['applications'] == 1
+    assert outcomes['accepted']['avg_days'] == 6
+    print("✅ outcome_at stamped on insert")
+
+
+if __name__ == "__main__":
+    test_funnel_counts_reached_stages()
+    test_empty_funnel()
@@ -0,0 +1,116 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from fx import FxRateError, RateCache, load_rates, money_total, read_rates, rebase
+
+
+class Rows:
+    """Stands in for a connection: answers every rate query with ``series`` and counts calls."""
+
+    def __init__(self, series):
+        self.series = series
+        self.queries = 0
+
+    def execute(self, statement, params):
+        self.queries += 1
+        rows = self.series.get(params['currency'], [])
+        return type('Result', (), {'all': lambda _: [
+            type('Row', (), {'rate_date': day, 'rate': rate}) for day, rate in rows
+        ]})()
+
+
+def _rates_file(tmp_path, body):
+    path = tmp_path / 'rates.csv'
+    path.write_text("date,base,currency,rate\n" + body)
+    return path
+
+
+def test_rates_are_converted_into_the_base_currency(tmp_path):
+    path = _rates_file(tmp_path, "2024-10-18,EUR,USD,1.0800\n2024-10-18,EUR,GBP,0.8300\n"
+                                 "2024-10-19,EUR,GBP,0.8400\n")
+    rates, missing = rebase(read_rates(path), 'USD')
+    assert rates[('EUR', date(2024, 10, 18))] == Decimal('1.0800000000')
+    assert rates[('GBP', date(2024, 10, 18))] == Decimal('1.3012048193')
+    assert ('USD', date(2024, 10, 18)) not in rates
+    assert missing == [date(2024, 10, 19)]
+    print("✅ Cross rates")
+
+
+def test_bad_rate_rows_name_the_line(tmp_path):
+    with pytest.raises(FxRateError, match=r"rates.csv:3: bad rate"):
+        read_rates(_rates_file(tmp_path, "2024-10-18,EUR,USD,1.08\n2024-10-18,EUR,GBP,-1\n"))
+    with pytest.raises(FxRateError, match=r"rates.csv:2: bad date"):
+        read_rates(_rates_file(tmp_path, "18/10/2024,EUR,USD,1.08\n"))
+    print("✅ Rates file errors")
+
+
+def test_rate_cache_uses_the_latest_earlier_rate_until_it_expires(clock):
+    cache = RateCache(ttl=60, clock=clock)
+    conn = Rows({'USD': [(date(1900, 1, 1), Decimal(1))],
+                 'EUR': [(date(2024, 10, 1), Decimal('1.10')), (date(2024, 10, 15), Decimal('1.08'))]})
+
+    assert cache.rate(conn, 'eur', date(2024, 10, 14)) == Decimal('1.10')
+    assert cache.rate(conn, 'EUR', date(2024, 10, 20)) == Decimal('1.08')
+    assert cache.rate(conn, 'EUR', date(2024, 9, 30)) is None
+    assert conn.queries == 1
+    assert cache.convert(conn, Decimal('108.00'), 'USD', date(2024, 10, 20), to='EUR') == Decimal('100.00')
+    assert cache.convert(conn, Decimal('5'), 'GBP', date(2024, 10, 20)) is None
+
+    clock.now = 61
+    cache.rate(conn, 'EUR', date(2024, 10, 20))
+    assert conn.queries == 4
+    print("✅ Rate cache")
+
+
+def _investment(conn, user_id, category_id, amount, currency, day, type_='money'):
+    investment_id = uuid.uuid4()
+    conn.execute(text("""
+        INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
+        VALUES (:id, :user_id, :category_id, :type, 'Spend', :amount, :currency, :invested_at)
+    """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "type": type_,
+           "amount": amount, "currency": currency,
+           "invested_at": datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)})
+    return investment_id
+
+
+def test_amounts_are_normalized_on_load_and_on_insert(db_conn, make_user):
+    user_id, category_id = make_user('money', 'Courses')
+    with db_conn.begin():
+        before = _investment(db_conn, user_id, category_id, Decimal('100'), 'EUR', date(2024, 10, 16))
+        _investment(db_conn, user_id, category_id, Decimal('3'), 'hours', date(2024, 10, 16), 'time')
+
+    result = load_rates(db_conn, {('EUR', date(2024, 10, 1)): Decimal('1.10'),
+                                  ('EUR', date(2024, 10, 15)): Decimal('1.08')}, base='USD')
+    assert result['investments'] == 1
+    normalized = text("SELECT amount_normalized FROM investments WHERE id = :id")
+    assert db_conn.execute(normalized, {"id": before}).scalar() == Decimal('108.00')
+
+    with db_conn.begin():
+        usd = _investment(db_conn, user_id, category_id, Decimal('20'), 'usd', date(2024, 10, 17))
+        early = _investment(db_conn, user_id, category_id, Decimal('10'), 'EUR', date(2024, 10, 2))
+        db_conn.execute(text("UPDATE investments SET amount_invested = 200 WHERE id = :id"), {"id": before})
+    assert db_conn.execute(normalized, {"id": usd}).scalar() == Decimal('20.00')
+    assert db_conn.execute(normalized, {"id": early}).scalar() == Decimal('11.00')
+
+    assert money_total(db_conn, user_id) == (Decimal('247.00'), 3)
+    assert money_total(db_conn, user_id, end=datetime(2024, 10, 10, tzinfo=timezone.utc)) == (Decimal('11.00'), 1)
+    with pytest.raises(FxRateError):
+        load_rates(db_conn, {}, base='EUR')
+    print("✅ Normalized amounts")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    from conftest import Clock
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_rates_are_converted_into_the_base_currency(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_bad_rate_rows_name_the_line(pathlib.Path(tmp))
+    test_rate_cache_uses_the_latest_earlier_rate_until_it_expires(Clock())
@@ -0,0 +1,78 @@
+import time
+
+from sqlalchemy import text
+
+import health_check
+from health_check import exact_counts, table_stats
+
+
+class CountingEngine:
+    """Stands in for the engine: records each statement_timeout and counts slowly."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.timeouts = []
+
+    def connect(self):
+        return self
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        sql = str(statement)
+        if sql.startswith('SET LOCAL'):
+            self.timeouts.append(int(sql.rsplit(' ', 1)[1]))
+            return None
+        time.sleep(self.seconds)
+        return type('Result', (), {'scalar': lambda _: 7})()
+
+
+def test_queued_counts_only_get_the_time_left(monkeypatch):
+    engine = CountingEngine(seconds=0.3)
+    monkeypatch.setattr(health_check, 'engine', engine)
+
+    counts = exact_counts(['a', 'b', 'c'], workers=1, budget=0.5)
+
+    # 'b' started with about 200ms left; 'c' never got a turn
+    assert counts['a'] == 7 and counts['c'] is None
+    assert engine.timeouts[0] <= 500 and all(t < 250 for t in engine.timeouts[1:])
+    assert len(engine.timeouts) <= 2
+    print("✅ Exact counts stay within the budget")
+
+
+def test_partitioned_tables_count_their_partitions_rows(db_engine):
+    with db_engine.connect() as conn:
+        try:
+            with conn.begin():
+                conn.execute(text("""
+                    CREATE TABLE health_events (day date NOT NULL) PARTITION BY RANGE (day);
+                    CREATE TABLE health_events_2024 PARTITION OF health_events
+                        FOR VALUES FROM ('2024-01-01') TO ('2025-01-01');
+                    CREATE TABLE health_events_default PARTITION OF health_events DEFAULT;
+                    INSERT INTO health_events SELECT '2024-06-01' FROM generate_series(1, 30);
+                    INSERT INTO health_events SELECT '2030-06-01' FROM generate_series(1, 12);
+                """))
+            # Table statistics are published shortly after the commit
+            deadline = time.monotonic() + 10
+            while True:
+                with conn.begin():
+                    conn.execute(text("SELECT pg_stat_clear_snapshot()"))
+                    stats = table_stats(conn)
+                if stats['health_events']['rows'] == 42 or time.monotonic() > deadline:
+                    break
+                time.sleep(0.2)
+        finally:
+            with conn.begin():
+                conn.execute(text("DROP TABLE IF EXISTS health_events"))
+
+    assert stats['health_events'] == {"columns": 1, "rows": 42}
+    assert not any(name.startswith('health_events_') for name in stats)
+    assert 'time_logs' in stats and not any(name.startswith('time_logs_') for name in stats)
+    print("✅ Partitioned table rows")
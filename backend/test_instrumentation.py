@@ -0,0 +1,56 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+import instrumentation
+from instrumentation import QueryStats, install, normalize, redact, unit_of_work
+
+
+def test_normalize_collapses_literals_and_lists():
+    assert normalize("SELECT *  FROM t\n WHERE id = %(id)s AND n > 10 AND s = 'x''y'") == \
+        "SELECT * FROM t WHERE id = ? AND n > ? AND s = ?"
+    assert normalize("SELECT * FROM t WHERE id IN ($1, $2, $3)") == "SELECT * FROM t WHERE id IN (...)"
+    assert normalize("INSERT INTO t VALUES (%s, %s), (%s, %s)") == "INSERT INTO t VALUES (...)"
+    assert normalize("SELECT x::date FROM time_logs_p202601") == "SELECT x::date FROM time_logs_p202601"
+    print("✅ Statements normalized")
+
+
+def test_redact_hides_values():
+    assert redact({"email": "a@example.com", "n": 3}) == {"email": "str", "n": "int"}
+    assert redact([{"a": 1}, {"a": 2}]) == "<2 parameter sets>"
+    print("✅ Parameters redacted")
+
+
+def test_engine_events_record_and_flag_n_plus_one(caplog):
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    install(engine, stats)
+    install(engine, stats)  # idempotent
+
+    with caplog.at_level(logging.WARNING, logger='lifeinvest.sql'):
+        with unit_of_work("GET /test"), engine.connect() as conn:
+            for n in range(instrumentation.N_PLUS_ONE_THRESHOLD):
+                conn.execute(text("SELECT :n"), {"n": n})
+
+    [select] = [s for s in stats.snapshot().values() if s.statement == "SELECT ?"]
+    assert select.count == instrumentation.N_PLUS_ONE_THRESHOLD
+    assert select.n_plus_one == 1
+    assert "Possible N+1 in GET /test" in caplog.text
+
+    metrics = stats.prometheus()
+    assert 'lifeinvest_sql_statement_duration_seconds_bucket{' in metrics
+    assert f'le="+Inf"}} {instrumentation.N_PLUS_ONE_THRESHOLD}' in metrics
+    assert 'lifeinvest_sql_n_plus_one_total{' in metrics
+    assert "SELECT ?" in stats.report()
+    print("✅ Latency, rows and N+1 recorded")
+
+
+def test_no_n_plus_one_outside_unit_of_work():
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    install(engine, stats)
+    with engine.connect() as conn:
+        for n in range(instrumentation.N_PLUS_ONE_THRESHOLD * 2):
+            conn.execute(text("SELECT :n"), {"n": n})
+    assert all(s.n_plus_one == 0 for s in stats.snapshot().values())
+    print("✅ Repeats outside a unit of work are not flagged")
@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from investment_listing import InvalidCursor, decode_cursor, encode_cursor, list_investments
+
+
+def test_cursor_round_trip():
+    invested_at = datetime(2024, 10, 18, 9, 30, tzinfo=timezone.utc)
+    investment_id = uuid.uuid4()
+
+    cursor = encode_cursor(invested_at, investment_id)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (invested_at, investment_id)
+    print("✅ Cursor round trip")
+
+
+def test_bad_cursor_is_rejected():
+    for cursor in ["not-a-cursor", encode_cursor(datetime.now(), "x")[:-3], encode_cursor(datetime.now(), "x"),
+                   encode_cursor(datetime.now(), "")]:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"{cursor!r} was accepted")
+    print("✅ Bad cursors rejected")
+
+
+def test_pages_follow_the_cursor_with_children(db_conn, make_user):
+    user_id, category_id = make_user()
+    other_user, other_category = make_user()
+    start = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    ids = [uuid.uuid4() for _ in range(5)]
+    with db_conn.begin():
+        # Two investments share a timestamp, so the id breaks the tie
+        for n, investment_id in enumerate(ids):
+            db_conn.execute(text("""
+                INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+                VALUES (:id, :user_id, :category_id, 'time', :title, 1, :invested_at)
+            """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "title": f"#{n}",
+                   "invested_at": start + timedelta(days=min(n, 3))})
+        db_conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+            VALUES (gen_random_uuid(), :user_id, :category_id, 'time', 'Not mine', 1, :invested_at)
+        """), {"user_id": other_user, "category_id": other_category, "invested_at": start})
+        db_conn.execute(text("""
+            INSERT INTO learning_investments (id, investment_id, course_name, platform)
+            VALUES (gen_random_uuid(), :investment_id, 'SQL', 'Udemy')
+        """), {"investment_id": ids[0]})
+        db_conn.execute(text("""
+            INSERT INTO time_logs (id, investment_id, logged_date, time_spent_minutes)
+            VALUES (gen_random_uuid(), :investment_id, '2024-10-01', 45)
+        """), {"investment_id": ids[0]})
+
+    seen, cursor = [], None
+    while True:
+        page = list_investments(db_conn, user_id, cursor=cursor, limit=2)
+        seen.extend(page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    expected = sorted(ids[3:], reverse=True) + [ids[2], ids[1], ids[0]]
+    assert [item['id'] for item in seen] == expected
+    oldest = seen[-1]
+    assert oldest['details']['kind'] == 'learning' and oldest['details']['course_name'] == 'SQL'
+    assert oldest['time_logs'] == {'count': 1, 'total_minutes': 45}
+    assert 'time_logs' not in seen[0] and seen[0]['details'] is None
+    print("✅ Keyset pages")
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_bad_cursor_is_rejected()
@@ -1,10 +1,6 @@
-import os
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from sqlalchemy import text
 
-load_dotenv()
-
-engine = create_engine(os.getenv('DATABASE_URL'))
+from db import engine
 
 with engine.connect() as conn:
     # Check investments table structure
@@ -1,12 +1,8 @@
 from models import Base, Investment
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from db import engine
 
-engine = create_engine(os.getenv('DATABASE_URL'))
 Base.metadata.create_all(engine)
 
 Session = sessionmaker(bind=engine)
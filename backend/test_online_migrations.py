@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+import online_migrations
+from online_migrations import (LOCK_NOT_AVAILABLE, add_check_not_valid, backfill, backfill_sql, backfill_status,
+                               constraint_state, create_index_concurrently, index_sql, next_batch_size,
+                               validate_constraint)
+
+PG = SimpleNamespace(dialect=postgresql.dialect())
+
+
+def test_index_sql():
+    sql = index_sql(PG, 'ix_time_logs_cover', 'time_logs', ['investment_id', 'logged_date DESC'],
+                    include=['time_spent_minutes'], where='productivity_rating IS NOT NULL')
+    assert sql == ("CREATE INDEX CONCURRENTLY ix_time_logs_cover ON time_logs "
+                   "(investment_id, logged_date DESC) INCLUDE (time_spent_minutes) "
+                   "WHERE productivity_rating IS NOT NULL")
+    assert index_sql(PG, 'uq_users_email', 'users', ['lower(email)'], unique=True).startswith(
+        "CREATE UNIQUE INDEX CONCURRENTLY")
+    print("✅ Index DDL")
+
+
+def test_backfill_sql_resumes_after_last_key():
+    first = backfill_sql(PG, 'investments', "category_id = c.id", "c.name = t.category",
+                         from_sql="investment_categories c")
+    resumed = backfill_sql(PG, 'investments', "category_id = c.id", "c.name = t.category",
+                           from_sql="investment_categories c", resume=True)
+    assert ":last_key" not in first
+    assert "t.id > CAST(:last_key AS uuid)" in resumed
+    assert "FROM batch, investment_categories c" in first
+    print("✅ Batch SQL")
+
+
+def test_next_batch_size_adapts():
+    assert next_batch_size(1000, 2.0, 0.5) == 500
+    assert next_batch_size(1000, 0.1, 0.5) == 2000
+    assert next_batch_size(1000, 0.5, 0.5) == 1000
+    assert next_batch_size(150, 2.0, 0.5) == 100
+    assert next_batch_size(40_000, 0.1, 0.5) == 50_000
+    print("✅ Adaptive batch size")
+
+
+class IndexBuildConn:
+    """Fake autocommit connection whose first concurrent build times out and leaves an invalid index."""
+
+    dialect = postgresql.dialect()
+
+    def __init__(self, timeouts=1):
+        self.timeouts = timeouts
+        self.state = None
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if 'pg_index' in sql:
+            return SimpleNamespace(scalar=lambda: self.state)
+        if sql.startswith('DROP INDEX'):
+            self.state = None
+        elif sql.startswith('CREATE INDEX'):
+            if self.state is not None:
+                raise OperationalError(sql, {}, SimpleNamespace(pgcode='42P07'))
+            if self.timeouts:
+                self.timeouts -= 1
+                self.state = False
+                raise OperationalError(sql, {}, SimpleNamespace(pgcode=LOCK_NOT_AVAILABLE))
+            self.state = True
+
+
+def test_create_index_retry_drops_the_invalid_index(monkeypatch):
+    monkeypatch.setattr(online_migrations.time, 'sleep', lambda seconds: None)
+    conn = IndexBuildConn()
+
+    assert create_index_concurrently(conn, 'ix_users_email', 'users', ['email'])
+    assert conn.state is True
+    ddl = [sql for sql in conn.statements if sql.startswith(('CREATE', 'DROP'))]
+    assert ddl == ["CREATE INDEX CONCURRENTLY ix_users_email ON users (email)",
+                   "DROP INDEX CONCURRENTLY IF EXISTS ix_users_email",
+                   "CREATE INDEX CONCURRENTLY ix_users_email ON users (email)"]
+    assert conn.statements[-1] == "RESET lock_timeout"
+    assert not create_index_concurrently(conn, 'ix_users_email', 'users', ['email'])
+    print("✅ Timed-out index build retried")
+
+
+def test_backfill_runs_in_batches_and_resumes(db_conn, make_user):
+    for _ in range(5):
+        make_user()
+    batches = []
+
+    def report(name, rows_done, last_key, batch_size, seconds):
+        batches.append(rows_done)
+
+    updated = backfill(db_conn, 'test.category_color', 'investment_categories', "color = '#000000'",
+                       where_sql="t.color IS NULL", batch_size=2, max_batch_size=2, sleep=0, report=report)
+
+    assert updated == 5
+    assert batches == [2, 4, 5]
+    assert db_conn.execute(text("SELECT COUNT(*) FROM investment_categories WHERE color IS NULL")).scalar() == 0
+    status = {row['name']: row for row in backfill_status(db_conn)}
+    assert status['test.category_color']['rows_done'] == 5
+    assert status['test.category_color']['finished_at'] is not None
+    # A finished backfill is not repeated
+    assert backfill(db_conn, 'test.category_color', 'investment_categories', "color = NULL", sleep=0) == 0
+    print("✅ Batched backfill with progress")
+
+
+def test_not_valid_check_then_validate(db_conn):
+    assert add_check_not_valid(db_conn, 'ck_users_email_at', 'users', "email LIKE '%@%'")
+    assert constraint_state(db_conn, 'users', 'ck_users_email_at') is False
+    assert not add_check_not_valid(db_conn, 'ck_users_email_at', 'users', "email LIKE '%@%'")
+
+    assert validate_constraint(db_conn, 'users', 'ck_users_email_at')
+    assert constraint_state(db_conn, 'users', 'ck_users_email_at') is True
+    print("✅ NOT VALID constraint validated")
+
+
+if __name__ == "__main__":
+    test_index_sql()
+    test_backfill_sql_resumes_after_last_key()
+    test_next_batch_size_adapts()
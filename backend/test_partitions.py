@@ -0,0 +1,79 @@
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from partitions import (
+    archive_old_partitions, create_partition, list_partitions, month_start, partition_name, split_default,
+)
+
+
+def test_month_start_crosses_years():
+    assert month_start(date(2024, 10, 18)) == date(2024, 10, 1)
+    assert month_start(date(2024, 11, 30), 2) == date(2025, 1, 1)
+    assert month_start(date(2024, 1, 15), -13) == date(2022, 12, 1)
+    print("✅ Month arithmetic")
+
+
+def test_partition_name():
+    assert partition_name('time_logs', date(2024, 3, 1)) == 'time_logs_p202403'
+    print("✅ Partition names")
+
+
+def _log_days(conn, user_id, category_id, days):
+    """Insert one time investment with a 30 minute log on each of ``days``."""
+    investment_id = uuid.uuid4()
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+            VALUES (:id, :user_id, :category_id, 'time', 'Backfilled', 1, :invested_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id,
+               "invested_at": datetime(2014, 1, 1, tzinfo=timezone.utc)})
+        conn.execute(text("""
+            INSERT INTO time_logs (id, investment_id, logged_date, time_spent_minutes)
+            VALUES (gen_random_uuid(), :investment_id, :day, 30)
+        """), [{"investment_id": investment_id, "day": day} for day in days])
+    return investment_id
+
+
+def _count(conn, relation, investment_id):
+    return conn.execute(text(f"SELECT COUNT(*) FROM {relation} WHERE investment_id = :id"),
+                        {"id": investment_id}).scalar()
+
+
+def test_create_partition_moves_stray_default_rows(db_conn, make_user):
+    investment_id = _log_days(db_conn, *make_user(), [date(2015, 3, 10), date(2015, 3, 31), date(2015, 4, 1)])
+    assert _count(db_conn, 'time_logs_default', investment_id) == 3
+
+    with db_conn.begin():
+        assert create_partition(db_conn, 'time_logs', date(2015, 3, 1)) == 'time_logs_p201503'
+    assert _count(db_conn, 'time_logs_p201503', investment_id) == 2
+    assert _count(db_conn, 'time_logs_default', investment_id) == 1
+    assert _count(db_conn, 'time_logs', investment_id) == 3
+
+    # The rest of the default is split out month by month, leaving it empty
+    assert split_default(db_conn, 'time_logs') == ['time_logs_p201504']
+    assert _count(db_conn, 'time_logs_default', investment_id) == 0
+    assert _count(db_conn, 'time_logs', investment_id) == 3
+    assert split_default(db_conn, 'time_logs') == []
+    print("✅ Stray default rows moved into monthly partitions")
+
+
+def test_archive_old_partitions(db_conn, make_user):
+    investment_id = _log_days(db_conn, *make_user(), [date(2014, 6, 2), date(2014, 7, 2)])
+    assert split_default(db_conn, 'time_logs') == ['time_logs_p201406', 'time_logs_p201407']
+
+    assert archive_old_partitions(db_conn, 'time_logs', keep_months=24, today=date(2016, 7, 15)) == [
+        'archive.time_logs_p201406',
+    ]
+    with db_conn.begin():
+        partitions = list_partitions(db_conn, 'time_logs')
+    assert date(2014, 6, 1) not in partitions and date(2014, 7, 1) in partitions
+    assert _count(db_conn, 'time_logs', investment_id) == 1
+    assert _count(db_conn, 'archive.time_logs_p201406', investment_id) == 1
+    print("✅ Old partitions archived")
+
+
+if __name__ == "__main__":
+    test_month_start_crosses_years()
+    test_partition_name()
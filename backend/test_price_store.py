@@ -0,0 +1,83 @@
+from datetime import date
+
+import numpy as np
+
+from price_store import PriceStore, value_series
+
+
+def test_write_merges_and_maps(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write('aapl', ['2026-01-02', '2026-01-05'], [100.0, 102.0])
+    store.write('AAPL', ['2026-01-05', '2026-01-06'], [103.0, 104.0])
+
+    dates, closes = store.series('AAPL')
+    assert isinstance(closes, np.memmap)
+    assert list(dates.astype(str)) == ['2026-01-02', '2026-01-05', '2026-01-06']
+    assert list(closes) == [100.0, 103.0, 104.0]
+    assert store.tickers() == ['AAPL']
+    print("✅ Series merged and memory-mapped")
+
+
+def test_closes_are_as_of(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write('BTC', ['2026-01-02', '2026-01-05'], [10.0, 20.0])
+
+    closes = store.closes_on('BTC', np.array(['2026-01-01', '2026-01-02', '2026-01-04', '2026-01-09'],
+                                             dtype='datetime64[D]'))
+    assert np.isnan(closes[0])
+    assert list(closes[1:]) == [10.0, 10.0, 20.0]
+    assert np.isnan(store.closes_on('NOPE', ['2026-01-01'])).all()
+    print("✅ As-of closes")
+
+
+def test_value_series(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write('VTI', ['2026-01-02', '2026-01-03'], [200.0, 210.0])
+    holdings = [
+        ('VTI', 2, 190, date(2026, 1, 1)),
+        ('VTI', 1, 205, date(2026, 1, 3)),
+        ('XYZ', 5, 10, date(2026, 1, 2)),
+    ]
+
+    days, values, unpriced = value_series(store, holdings, date(2025, 12, 31), date(2026, 1, 3))
+
+    assert len(days) == 4
+    # 12-31 nothing held; 01-01 VTI not priced yet -> cost 380; then 2x200 + XYZ cost; then 3x210 + 50
+    assert list(values) == [0.0, 380.0, 450.0, 680.0]
+    assert unpriced == ['XYZ']
+    print("✅ Portfolio value series")
+
+
+def test_any_symbol_is_stored_inside_the_root(tmp_path):
+    root = tmp_path / 'prices'
+    store = PriceStore(str(root))
+    for ticker in ('BTC/USD', '../etc', 'BRK.B', 'SPACE X'):
+        store.write(ticker, ['2026-01-01'], [1.0])
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['prices']
+    assert store.tickers() == ['../ETC', 'BRK.B', 'BTC/USD', 'SPACE X']
+    assert list(store.closes_on('btc/usd', ['2026-01-02'])) == [1.0]
+    print("✅ Tickers are encoded into safe file names")
+
+
+def test_series_is_one_file_replaced_at_once(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write('VTI', ['2026-01-02'], [200.0])
+    dates, closes = store.series('VTI')
+    store.write('VTI', ['2026-01-03', '2026-01-04'], [210.0, 220.0])
+
+    # A reader holding the old map keeps a consistent old series
+    assert len(dates) == len(closes) == 1
+    assert [path.name for path in tmp_path.iterdir()] == ['VTI.npy']
+    assert len(store.series('VTI')[0]) == 3
+    print("✅ Atomic series replacement")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    for test in (test_write_merges_and_maps, test_closes_are_as_of, test_value_series,
+                 test_any_symbol_is_stored_inside_the_root, test_series_is_one_file_replaced_at_once):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
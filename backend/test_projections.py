@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import configure_mappers
+
+from bulk_import import TABLE_COLUMNS
+from models import Base, Investment
+from projections import InvestmentRow, project, select_for
+from seed_data import TABLES
+
+
+def test_models_match_migrated_columns():
+    configure_mappers()
+    for table, columns in TABLES:
+        model_columns = set(Base.metadata.tables[table].c.keys())
+        assert set(columns) <= model_columns, (table, set(columns) - model_columns)
+    assert set(TABLE_COLUMNS['investments']) <= set(Investment.__table__.c.keys())
+    print("✅ Models cover every written column")
+
+
+def test_select_follows_field_order():
+    sql = str(select_for(InvestmentRow, Investment.__table__).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT investments.id, investments.category_id, investments.type, "
+                          "investments.title, investments.amount_invested, investments.currency, "
+                          "investments.invested_at")
+    print("✅ Projection select matches dataclass fields")
+
+
+def test_rows_are_slotted_and_positional():
+    row = (uuid.uuid4(), uuid.uuid4(), 'money', 'ETF', Decimal('10.00'), 'USD',
+           datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    [projected] = project([row], InvestmentRow)
+
+    assert projected.amount_invested == Decimal('10.00')
+    assert not hasattr(projected, '__dict__')
+    print("✅ Rows are compact slotted dataclasses")
+
+
+if __name__ == "__main__":
+    test_models_match_migrated_columns()
+    test_select_follows_field_order()
+    test_rows_are_slotted_and_positional()
@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from reset_db import (MAX_NAME_LENGTH, TemplateNotFoundError, clone_database, default_template_name,
+                      staging_name, truncate)
+
+
+def test_default_template_name():
+    assert default_template_name("postgresql://u:p@localhost:5432/lifeinvest_db") == "lifeinvest_db_template"
+    print("✅ Template name")
+
+
+def test_staging_name_fits_postgres_limit():
+    assert staging_name("lifeinvest_db") == "lifeinvest_db_staging"
+    long_name = "x" * MAX_NAME_LENGTH
+    assert len(staging_name(long_name)) == MAX_NAME_LENGTH
+    assert staging_name(long_name) != long_name
+    print("✅ Staging name")
+
+
+def test_truncate_empties_tables_and_keeps_schema(db_conn, make_user):
+    make_user()
+
+    tables = truncate(db_conn)
+
+    assert 'users' in tables and 'time_logs' in tables
+    assert 'alembic_version' not in tables
+    assert not any(name.startswith('time_logs_p') for name in tables)
+    assert db_conn.execute(text("SELECT COUNT(*) FROM users")).scalar() == 0
+    assert db_conn.execute(text("SELECT COUNT(*) FROM alembic_version")).scalar() == 1
+    print("✅ Truncated in one statement")
+
+
+def test_restore_from_missing_template_keeps_target(db_engine):
+    target = db_engine.url.database
+    with pytest.raises(TemplateNotFoundError):
+        clone_database(f"missing_{uuid.uuid4().hex}", target, url=db_engine.url, replace=True)
+
+    with db_engine.connect() as conn:
+        assert conn.execute(text("SELECT current_database()")).scalar() == target
+    print("✅ Missing template leaves the database alone")
+
+
+if __name__ == "__main__":
+    test_default_template_name()
+    test_staging_name_fits_postgres_limit()
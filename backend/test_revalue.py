@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from revalue import PriceFileError, read_prices, revalue
+
+
+def test_read_prices_normalizes_tickers(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("ticker_symbol,price\naapl,190.5\nBTC,64000.123456\nAAPL,191.25\n")
+
+    assert read_prices(str(path)) == {'AAPL': Decimal('191.25'), 'BTC': Decimal('64000.123456')}
+    print("✅ Prices read, later rows win")
+
+
+def test_read_prices_rejects_bad_rows(tmp_path):
+    for body in ["ticker_symbol,price\nAAPL,abc\n", "ticker_symbol,price\n,10\n", "ticker_symbol,price\nX,-1\n"]:
+        path = tmp_path / "bad.csv"
+        path.write_text(body)
+        try:
+            read_prices(str(path))
+        except PriceFileError as e:
+            assert "bad.csv:2" in str(e)
+            continue
+        raise AssertionError(f"{body!r} was accepted")
+    print("✅ Bad price rows rejected")
+
+
+def test_read_prices_from_parquet(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "prices.parquet"
+    pq.write_table(pa.table({'ticker_symbol': ['aapl', 'BTC'], 'price': [190.5, 64000.123456],
+                             'volume': [10, 20]}), str(path))
+    assert read_prices(str(path)) == {'AAPL': Decimal('190.5'), 'BTC': Decimal('64000.123456')}
+    print("✅ Prices read from Parquet")
+
+
+def _holding(conn, user_id, category_id, ticker, quantity, current_value=None):
+    investment_id, holding_id = uuid.uuid4(), uuid.uuid4()
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
+            VALUES (:id, :user_id, :category_id, 'money', :ticker, 100, 'USD', :invested_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "ticker": ticker,
+               "invested_at": datetime(2024, 1, 2, tzinfo=timezone.utc)})
+        conn.execute(text("""
+            INSERT INTO financial_investments (id, investment_id, investment_type, asset_name, ticker_symbol,
+                                               quantity, purchase_price, current_value)
+            VALUES (:id, :investment_id, 'stock', :ticker, :ticker, :quantity, 100, :current_value)
+        """), {"id": holding_id, "investment_id": investment_id, "ticker": ticker, "quantity": quantity,
+               "current_value": current_value})
+    return holding_id
+
+
+def test_revalue_updates_holdings_and_history(db_conn, make_user):
+    user_id, category_id = make_user(category_type='money', category_name='Stocks')
+    apple = _holding(db_conn, user_id, category_id, 'aapl', Decimal('10'))
+    bitcoin = _holding(db_conn, user_id, category_id, 'BTC', Decimal('0.5'), Decimal('32000.06'))
+    _holding(db_conn, user_id, category_id, 'MSFT', Decimal('3'))
+    # 999,999 x 2,000,000 does not fit numeric(14, 2)
+    huge = _holding(db_conn, user_id, category_id, 'BIG', Decimal('999999'))
+    valued_at = datetime(2026, 10, 16, 21, tzinfo=timezone.utc)
+
+    result = revalue(db_conn, {'AAPL': Decimal('191.25'), 'BTC': Decimal('64000.123456'),
+                               'BIG': Decimal('2000000')}, valued_at)
+    assert result == {"prices": 3, "valued": 2, "changed": 1, "too_large": 1, "unpriced": {'MSFT': 1}}
+
+    values = dict(db_conn.execute(text("SELECT id, current_value FROM financial_investments")).all())
+    assert values[apple] == Decimal('1912.50')
+    assert values[bitcoin] == Decimal('32000.06')
+    assert values[huge] is None
+    history = db_conn.execute(text("""
+        SELECT financial_investment_id, valued_at, price, market_value
+        FROM financial_valuations ORDER BY market_value
+    """)).all()
+    assert [tuple(row) for row in history] == [
+        (apple, valued_at, Decimal('191.250000'), Decimal('1912.50')),
+        (bitcoin, valued_at, Decimal('64000.123456'), Decimal('32000.06')),
+    ]
+    print("✅ Holdings revalued with one history row each")
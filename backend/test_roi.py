@@ -0,0 +1,90 @@
+import math
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from roi import Portfolio, SECONDS_PER_YEAR, compute_roi, load_portfolio, update_return_percentages
+
+
+def make_portfolio():
+    now = 10 * SECONDS_PER_YEAR
+    investments = [
+        ("a", "learning", "money", "USD", 100.0, now - SECONDS_PER_YEAR),
+        ("b", "learning", "money", "USD", 300.0, now - 2 * SECONDS_PER_YEAR),
+        ("c", "career", "time", "hours", 0.0, now),
+        ("d", "learning", "time", "hours", 10.0, now - SECONDS_PER_YEAR),
+    ]
+    returns = [
+        ("a", 60.0, now),
+        ("a", 60.0, now),
+        ("b", 330.0, now),
+        ("d", 10.0, now),
+    ]
+    return Portfolio.from_rows(investments, returns), now
+
+
+def test_per_investment_roi():
+    portfolio, now = make_portfolio()
+    report = compute_roi(portfolio, as_of=now)
+
+    assert list(report.returned) == [120.0, 330.0, 0.0, 10.0]
+    assert math.isclose(report.roi[0], 20.0)
+    assert math.isclose(report.roi[1], 10.0)
+    assert math.isnan(report.roi[2])
+    assert math.isclose(report.annualized_roi[0], 20.0)
+    assert math.isclose(report.annualized_roi[1], (math.sqrt(1.1) - 1) * 100)
+    print("✅ Per-investment ROI")
+
+
+def test_category_and_currency_roi():
+    portfolio, now = make_portfolio()
+    report = compute_roi(portfolio, as_of=now)
+
+    assert math.isclose(report.by_category[("learning", "USD")]["roi"], 12.5)
+    assert report.by_category[("learning", "hours")]["roi"] == 0.0
+    assert math.isnan(report.by_category[("career", "hours")]["roi"])
+    # Hours never count towards the money totals
+    assert report.by_currency["USD"]["invested"] == 400.0
+    assert math.isclose(report.by_currency["USD"]["roi"], 12.5)
+    # 50 gain over 100 * 1 + 300 * 2 capital-years
+    assert math.isclose(report.by_currency["USD"]["time_weighted_roi"], 50 / 700 * 100)
+    assert report.by_currency["hours"]["invested"] == 10.0
+    print("✅ Category and currency ROI")
+
+
+def test_empty_portfolio():
+    report = compute_roi(Portfolio.from_rows([], []))
+    assert report.by_currency == {} and report.by_category == {}
+    print("✅ Empty portfolio")
+
+
+def test_return_percentages_are_cumulative_roi(db_conn, make_user):
+    user_id, category_id = make_user('money', 'Courses')
+    investment_id = uuid.uuid4()
+    with db_conn.begin():
+        db_conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
+            VALUES (:id, :user_id, :category_id, 'money', 'Course', 100, 'USD', '2024-01-01')
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id})
+        db_conn.execute(text("""
+            INSERT INTO investment_returns (id, investment_id, type, amount_returned, return_date)
+            VALUES (gen_random_uuid(), :id, 'money', 60, '2024-06-01'),
+                   (gen_random_uuid(), :id, 'money', 40, '2024-09-01'),
+                   (gen_random_uuid(), :id, 'money', 20, '2024-12-01')
+        """), {"id": investment_id})
+    assert update_return_percentages(db_conn, user_id) == 3
+    percentages = db_conn.execute(text("""
+        SELECT roi_percentage FROM investment_returns WHERE investment_id = :id ORDER BY return_date
+    """), {"id": investment_id}).scalars().all()
+    assert percentages == [Decimal('-40.00'), Decimal('0.00'), Decimal('20.00')]
+
+    report = compute_roi(load_portfolio(db_conn, user_id))
+    assert math.isclose(report.roi[0], float(percentages[-1]))
+    print("✅ Return percentages are cumulative ROI")
+
+
+if __name__ == "__main__":
+    test_per_investment_roi()
+    test_category_and_currency_roi()
+    test_empty_portfolio()
@@ -0,0 +1,121 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from rollups import backfill, range_totals
+
+FRESH_SQL = text("""
+    SELECT user_id, category_id, type, COALESCE(currency, '') AS currency,
+           (invested_at AT TIME ZONE 'UTC')::date AS day,
+           SUM(amount_invested) AS total_amount, COUNT(*) AS investment_count
+    FROM investments WHERE user_id = :user_id
+    GROUP BY 1, 2, 3, 4, 5
+    ORDER BY 1, 2, 3, 4, 5
+""")
+
+ROLLUPS_SQL = text("""
+    SELECT user_id, category_id, type, currency, day, total_amount, investment_count
+    FROM investment_daily_rollups WHERE user_id = :user_id
+    ORDER BY 1, 2, 3, 4, 5
+""")
+
+
+def _add_category(conn, user_id, name='Career'):
+    category_id = uuid.uuid4()
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investment_categories (id, user_id, name, type)
+            VALUES (:id, :user_id, :name, 'money')
+        """), {"id": category_id, "user_id": user_id, "name": name})
+    return category_id
+
+
+def _invest(conn, user_id, category_id, amount, invested_at, type='money', currency='USD'):
+    investment_id = uuid.uuid4()
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, currency, invested_at)
+            VALUES (:id, :user_id, :category_id, :type, 'Rollup', :amount, :currency, :invested_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "type": type,
+               "amount": amount, "currency": currency, "invested_at": invested_at})
+    return investment_id
+
+
+def _assert_matches_investments(conn, user_id):
+    fresh = [tuple(row) for row in conn.execute(FRESH_SQL, {"user_id": user_id})]
+    assert [tuple(row) for row in conn.execute(ROLLUPS_SQL, {"user_id": user_id})] == fresh
+    return fresh
+
+
+def test_unknown_group_column_is_rejected():
+    with pytest.raises(ValueError):
+        range_totals(None, uuid.uuid4(), date(2024, 1, 1), date(2024, 12, 31), group_by=('title',))
+    print("✅ Rollup group columns")
+
+
+def test_triggers_keep_rollups_equal_to_investments(db_conn, make_user):
+    user_id, category_id = make_user(category_type='money', category_name='Learning')
+    other_category = _add_category(db_conn, user_id)
+    day = datetime(2024, 10, 18, 12, tzinfo=timezone.utc)
+
+    first = _invest(db_conn, user_id, category_id, 100, day)
+    _invest(db_conn, user_id, category_id, 50, day)
+    # 20:30 on the 18th in New York, already the 19th in UTC
+    late = _invest(db_conn, user_id, category_id, 10, datetime(2024, 10, 19, 0, 30, tzinfo=timezone.utc))
+    assert len(_assert_matches_investments(db_conn, user_id)) == 2
+
+    with db_conn.begin():
+        db_conn.execute(text("UPDATE investments SET amount_invested = 120 WHERE id = :id"), {"id": first})
+    assert _assert_matches_investments(db_conn, user_id)[0][5] == Decimal('170.00')
+
+    with db_conn.begin():
+        db_conn.execute(text("""
+            UPDATE investments SET invested_at = :day, category_id = :category_id WHERE id = :id
+        """), {"day": datetime(2024, 10, 20, tzinfo=timezone.utc), "category_id": other_category, "id": late})
+    _assert_matches_investments(db_conn, user_id)
+
+    with db_conn.begin():
+        db_conn.execute(text("DELETE FROM investments WHERE id = :id"), {"id": late})
+    rows = _assert_matches_investments(db_conn, user_id)
+    # Keys whose last investment went away are removed, not left at zero
+    assert [(row[1], row[4]) for row in rows] == [(category_id, date(2024, 10, 18))]
+    print("✅ Rollups follow inserts, updates and deletes")
+
+
+def test_backfill_and_range_totals(db_conn, make_user):
+    user_id, category_id = make_user(category_type='money', category_name='Learning')
+    other_user, other_category = make_user(category_type='money', category_name='Learning')
+    _invest(db_conn, user_id, category_id, 100, datetime(2024, 10, 1, tzinfo=timezone.utc))
+    _invest(db_conn, user_id, category_id, 40, datetime(2024, 10, 2, tzinfo=timezone.utc), currency='EUR')
+    _invest(db_conn, user_id, category_id, 3, datetime(2024, 10, 3, tzinfo=timezone.utc),
+            type='time', currency='hours')
+    _invest(db_conn, user_id, category_id, 999, datetime(2024, 11, 1, tzinfo=timezone.utc))
+    _invest(db_conn, other_user, other_category, 7, datetime(2024, 10, 1, tzinfo=timezone.utc))
+
+    # Drift the table away from investments, then rebuild one user
+    with db_conn.begin():
+        db_conn.execute(text("UPDATE investment_daily_rollups SET total_amount = 0"))
+    assert backfill(db_conn, user_id=user_id) == 4
+    _assert_matches_investments(db_conn, user_id)
+    assert backfill(db_conn) >= 5
+    _assert_matches_investments(db_conn, other_user)
+
+    totals = range_totals(db_conn, user_id, date(2024, 10, 1), date(2024, 10, 31))
+    assert [(row['type'], row['currency'], row['total_amount'], row['investment_count']) for row in totals] == [
+        ('money', 'EUR', Decimal('40.00'), 1), ('money', 'USD', Decimal('100.00'), 1),
+        ('time', 'hours', Decimal('3.00'), 1),
+    ]
+    money = range_totals(db_conn, user_id, date(2024, 10, 1), date(2024, 11, 30), type='money',
+                         group_by=('currency',))
+    assert [(row['currency'], row['total_amount']) for row in money] == [
+        ('EUR', Decimal('40.00')), ('USD', Decimal('1099.00')),
+    ]
+    assert range_totals(db_conn, user_id, date(2025, 1, 1), date(2025, 1, 31)) == []
+    print("✅ Backfill and range totals")
+
+
+if __name__ == "__main__":
+    test_unknown_group_column_is_rejected()
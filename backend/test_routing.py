@@ -0,0 +1,122 @@
+"""Routing decisions, plus an end-to-end check against two servers.
+
+For the end-to-end test start a second Postgres (a real streaming replica
+or any standalone server, accepted there through Router.allow_primary) and
+set TEST_REPLICA_DATABASE_URL next to DATABASE_URL.
+"""
+import os
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from routing import Router, Routing, parse_lsn
+
+
+def test_parse_lsn_orders_positions():
+    assert parse_lsn('0/16B3748') == 0x16B3748
+    assert parse_lsn('1/0') > parse_lsn('0/FFFFFFFF')
+    assert parse_lsn(None) is None
+    print("✅ LSN parsing")
+
+
+def test_lagging_or_unreachable_replicas_are_skipped(clock):
+    router = Router(2, max_lag=5, clock=clock)
+    router.observe(0, lsn=100, lag=12)
+    router.observe(1, healthy=False)
+    assert not router.usable(0) and not router.usable(1)
+    router.observe(0, lsn=200, lag=1)
+    assert router.usable(0)
+    print("✅ Lag limit")
+
+
+def test_servers_not_in_recovery_are_not_replicas(clock):
+    router = Router(1, clock=clock)
+    router.observe(0, lsn=None, lag=0, in_recovery=False)
+    assert not router.usable(0)
+
+    stand_in = Router(1, clock=clock, allow_primary=True)
+    stand_in.observe(0, lsn=None, lag=0, in_recovery=False)
+    assert stand_in.usable(0)
+    print("✅ Primaries are not read from as replicas")
+
+
+def test_reads_follow_a_users_write_until_a_replica_catches_up(clock):
+    router = Router(1, sticky_for=30, clock=clock)
+    writer, other = uuid.uuid4(), uuid.uuid4()
+    router.observe(0, lsn=100, lag=0)
+
+    router.record_write(writer, lsn=150)
+    assert not router.usable(0, writer)
+    assert router.usable(0, other)
+
+    router.observe(0, lsn=150, lag=0)
+    assert router.usable(0, writer)
+    print("✅ Read your own writes by LSN")
+
+
+def test_unknown_positions_fall_back_to_the_sticky_window(clock):
+    router = Router(1, sticky_for=30, clock=clock)
+    writer = uuid.uuid4()
+    router.observe(0, lsn=None, lag=0)
+    router.record_write(writer, lsn=None)
+
+    assert not router.usable(0, writer)
+    clock.now = 31
+    assert router.usable(0, writer)
+    print("✅ Sticky window")
+
+
+def test_candidates_rotate_and_checks_are_rate_limited(clock):
+    router = Router(3, check_interval=2, clock=clock)
+    assert router.candidates() == [0, 1, 2]
+    assert router.candidates() == [1, 2, 0]
+    assert router.needs_check(0)
+    router.observe(0)
+    assert not router.needs_check(0)
+    clock.now = 2
+    assert router.needs_check(0)
+    assert Router(0).candidates() == []
+    print("✅ Round robin")
+
+
+@pytest.fixture
+def two_servers():
+    primary_url, replica_url = os.getenv('DATABASE_URL'), os.getenv('TEST_REPLICA_DATABASE_URL')
+    if not primary_url or not replica_url:
+        pytest.skip("DATABASE_URL and TEST_REPLICA_DATABASE_URL are not both set")
+    import db
+
+    primary = db.make_engine(primary_url)
+    routing = Routing([replica_url], primary=primary, router=Router(1, sticky_for=60, allow_primary=True))
+    yield routing
+    routing.dispose()
+    primary.dispose()
+
+
+def test_reads_go_to_the_replica_except_after_a_write(two_servers):
+    server = text("SELECT inet_server_addr()::text || ':' || inet_server_port() || '/' || current_database()")
+    with two_servers.primary.connect() as conn:
+        primary = conn.execute(server).scalar()
+    writer = uuid.uuid4()
+
+    with two_servers.read(writer) as conn:
+        assert conn.execute(server).scalar() != primary
+    with two_servers.write(writer) as conn:
+        conn.execute(text("SELECT 1"))
+    with two_servers.read(writer) as conn:
+        assert conn.execute(server).scalar() == primary
+    with two_servers.read(uuid.uuid4()) as conn:
+        assert conn.execute(server).scalar() != primary
+    print("✅ Routed between primary and replica")
+
+
+if __name__ == "__main__":
+    from conftest import Clock
+
+    test_parse_lsn_orders_positions()
+    test_lagging_or_unreachable_replicas_are_skipped(Clock())
+    test_servers_not_in_recovery_are_not_replicas(Clock())
+    test_reads_follow_a_users_write_until_a_replica_catches_up(Clock())
+    test_unknown_positions_fall_back_to_the_sticky_window(Clock())
+    test_candidates_rotate_and_checks_are_rate_limited(Clock())
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from search import HIGHLIGHT_TAGS, START, STOP, highlight, search, search_sql
+
+
+def test_highlight_escapes_text_and_marks_matches():
+    assert highlight(f"Learn {START}Python{STOP} <script>") == \
+        f"Learn {HIGHLIGHT_TAGS[0]}Python{HIGHLIGHT_TAGS[1]} &lt;script&gt;"
+    assert highlight(None) == ''
+    print("✅ Highlights are escaped")
+
+
+def test_search_sql_selects_sources():
+    sql = search_sql(['learning'])
+    assert 'learning_investments' in sql and 'job_applications' not in sql
+    with pytest.raises(ValueError):
+        search_sql(['tags'])
+    print("✅ Search sources")
+
+
+def test_blank_query_matches_nothing():
+    assert search(None, uuid.uuid4(), "   ") == []
+    print("✅ Blank query")
+
+
+def _investment(conn, user_id, category_id, title, description=None):
+    investment_id = uuid.uuid4()
+    conn.execute(text("""
+        INSERT INTO investments (id, user_id, category_id, type, title, description, amount_invested, invested_at)
+        VALUES (:id, :user_id, :category_id, 'time', :title, :description, 1, :invested_at)
+    """), {"id": investment_id, "user_id": user_id, "category_id": category_id, "title": title,
+           "description": description, "invested_at": datetime(2024, 10, 18, tzinfo=timezone.utc)})
+    return investment_id
+
+
+def test_search_ranks_and_highlights_across_tables(db_conn, make_user):
+    user_id, category_id = make_user()
+    other_user, other_category = make_user()
+    with db_conn.begin():
+        _investment(db_conn, user_id, category_id, "Evening reading", "Notes on postgres indexing")
+        course = _investment(db_conn, user_id, category_id, "Course")
+        db_conn.execute(text("""
+            INSERT INTO learning_investments (id, investment_id, course_name, platform)
+            VALUES (gen_random_uuid(), :investment_id, 'Postgres Performance', 'Udemy')
+        """), {"investment_id": course})
+        application = _investment(db_conn, user_id, category_id, "Job hunt")
+        db_conn.execute(text("""
+            INSERT INTO job_applications (id, investment_id, company_name, position, application_stage,
+                                          notes, applied_at)
+            VALUES (gen_random_uuid(), :investment_id, 'Acme', 'Backend engineer', 'applied',
+                    'They run Postgres at scale', now())
+        """), {"investment_id": application})
+        _investment(db_conn, other_user, other_category, "Postgres for someone else")
+
+    hits = search(db_conn, user_id, "postgres")
+
+    assert [hit['kind'] for hit in hits][0] == 'learning'  # title match outranks body matches
+    assert {hit['kind'] for hit in hits} == {'investment', 'learning', 'job_application'}
+    assert all('<mark>' in hit['title'] + hit['snippet'] for hit in hits)
+    assert [hit['kind'] for hit in search(db_conn, user_id, "postgres", kinds=['job_application'])] == \
+        ['job_application']
+    assert search(db_conn, user_id, "postgres -scale", kinds=['job_application']) == []
+    print("✅ Ranked search across investments, applications and courses")
+
+
+if __name__ == "__main__":
+    test_highlight_escapes_text_and_marks_matches()
+    test_search_sql_selects_sources()
+    test_blank_query_matches_nothing()
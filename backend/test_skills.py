@@ -0,0 +1,50 @@
+from skills import SkillIndex
+
+
+def make_row(row_id, user_id, course_name, skills):
+    return {"id": row_id, "investment_id": f"inv-{row_id}", "user_id": user_id,
+            "course_name": course_name, "platform": "YouTube", "skills_learned": skills}
+
+
+def make_index():
+    index = SkillIndex()
+    index.apply(make_row("1", "u1", "FastAPI Tutorial", ["Python", "fastapi", "api"]))
+    index.apply(make_row("2", "u1", "Python Basics", ["python"]))
+    index.apply(make_row("3", "u2", "PyTorch", ["pytorch", "Python"]))
+    return index
+
+
+def test_autocomplete_ranks_by_usage():
+    index = make_index()
+
+    assert index.autocomplete("py") == [("Python", 3), ("pytorch", 1)]
+    assert index.autocomplete("PY", limit=1) == [("Python", 3)]
+    assert index.autocomplete("py", user_id="u2") == [("Python", 1), ("pytorch", 1)]
+    assert index.autocomplete("zzz") == []
+    print("✅ Autocomplete ranks skills by usage")
+
+
+def test_courses_and_inventory():
+    index = make_index()
+
+    assert [c["course_name"] for c in index.courses_for_skill("python")] == [
+        "FastAPI Tutorial", "PyTorch", "Python Basics"]
+    assert [c["course_name"] for c in index.courses_for_skill("python", user_id="u2")] == ["PyTorch"]
+    assert index.user_inventory("u1") == {"Python": 2, "fastapi": 1, "api": 1}
+    print("✅ Course lookups and user inventories")
+
+
+def test_updating_a_row_replaces_its_skills():
+    index = make_index()
+    index.apply(make_row("3", "u2", "PyTorch", ["deep learning"]))
+
+    assert index.autocomplete("pyt") == [("Python", 2)]
+    assert index.user_inventory("u2") == {"deep learning": 1}
+    assert len(index) == 4
+    print("✅ Updated rows replace their skills")
+
+
+if __name__ == "__main__":
+    test_autocomplete_ranks_by_usage()
+    test_courses_and_inventory()
+    test_updating_a_row_replaces_its_skills()
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta, timezone
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+import snapshot as snapshot_module
+from models import Investment, TimeLog, User
+from snapshot import (SnapshotError, arrow_schema, export_columns, export_statement, load_watermarks,
+                      partition_month, rebuild_table, save_watermarks, snapshot)
+
+
+def test_partition_month_uses_utc():
+    assert partition_month(date(2026, 1, 31)) == '2026-01'
+    late_evening = datetime(2026, 1, 31, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+    assert partition_month(late_evening) == '2026-02'
+    assert partition_month(None) == 'unknown'
+    print("✅ Month partitions")
+
+
+def test_export_statement_bounds_created_at():
+    high = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    first = str(export_statement(Investment.__table__, high=high).compile(dialect=postgresql.dialect()))
+    incremental = str(export_statement(Investment.__table__, high - timedelta(days=1), high)
+                      .compile(dialect=postgresql.dialect()))
+    assert 'created_at IS NULL' in first and 'created_at >' not in first
+    assert 'investments.created_at >' in incremental and 'IS NULL' not in incremental
+    assert 'search_vector' not in first
+    print("✅ Watermark bounds")
+
+
+def test_secrets_are_not_exported():
+    assert 'password_hash' not in {column.name for column in export_columns(User.__table__)}
+    print("✅ No password hashes in snapshots")
+
+
+def test_watermarks_round_trip(tmp_path):
+    assert load_watermarks(tmp_path) == {}
+    marks = {'investments': datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)}
+    save_watermarks(tmp_path, marks)
+    assert load_watermarks(tmp_path) == marks
+    print("✅ Watermarks saved")
+
+
+def test_unknown_table_is_rejected(tmp_path):
+    with pytest.raises(SnapshotError):
+        snapshot(None, tmp_path, tables=['tags'])
+    print("✅ Unknown table")
+
+
+def test_failed_rebuild_keeps_previous_files(tmp_path, monkeypatch):
+    old_file = tmp_path / 'users' / 'month=2026-09' / 'part-1.parquet'
+    old_file.parent.mkdir(parents=True)
+    old_file.write_bytes(b'old')
+    marks = {'users': datetime(2026, 10, 1, tzinfo=timezone.utc)}
+    save_watermarks(tmp_path, marks)
+
+    def failing_export(conn, name, root, run_id, low=None, high=None):
+        os.makedirs(os.path.join(root, name, 'month=2026-10'))
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(snapshot_module, 'export_table', failing_export)
+    with pytest.raises(RuntimeError):
+        rebuild_table(None, 'users', str(tmp_path), 'run', dict(marks))
+    assert old_file.read_bytes() == b'old'
+    assert load_watermarks(tmp_path) == marks
+    assert sorted(os.listdir(tmp_path)) == ['_watermarks.json', 'users']
+    print("✅ Failed rebuild leaves the previous snapshot")
+
+
+def test_arrow_schema_matches_columns():
+    pa = pytest.importorskip('pyarrow')
+    schema = arrow_schema(pa, TimeLog.__table__)
+    assert schema.field('id').type == pa.string()
+    assert schema.field('logged_date').type == pa.date32()
+    assert schema.field('time_spent_minutes').type == pa.int32()
+    assert schema.field('created_at').type == pa.timestamp('us', tz='UTC')
+    print("✅ Arrow schema")
+
+
+def test_snapshot_appends_new_rows(db_conn, make_user, tmp_path):
+    pytest.importorskip('pyarrow')
+    duckdb = pytest.importorskip('duckdb')
+    start = datetime.now(timezone.utc) - timedelta(hours=3)
+
+    def user_created_at(created_at):
+        user_id, _ = make_user()
+        db_conn.execute(text("UPDATE users SET created_at = :created_at WHERE id = :id"),
+                        {"created_at": created_at, "id": user_id})
+        return str(user_id)
+
+    # Everything runs in one transaction, so now() cannot move the watermark; pin it instead
+    old_user = user_created_at(start)
+    first = snapshot(db_conn, tmp_path, tables=['users'], high=start + timedelta(hours=1))
+    new_user = user_created_at(start + timedelta(hours=2))
+    second = snapshot(db_conn, tmp_path, tables=['users'], high=start + timedelta(hours=2))
+    third = snapshot(db_conn, tmp_path, tables=['users'], high=start + timedelta(hours=2))
+
+    assert (first, second, third) == ({'users': 1}, {'users': 1}, {'users': 0})
+    pattern = str(tmp_path / 'users' / '*' / '*.parquet')
+    con = duckdb.connect(str(tmp_path / 'analytics.duckdb'), read_only=True)
+    try:
+        exported = con.execute("SELECT id, filename FROM read_parquet(?, filename = true) ORDER BY filename",
+                               [pattern]).fetchall()
+        assert con.execute("SELECT count(*) FROM users").fetchone()[0] == 2
+    finally:
+        con.close()
+    assert [row[0] for row in exported] == [old_user, new_user]
+    assert exported[0][1] != exported[1][1]
+
+    # A full run replaces both files with one file per month of its own
+    assert snapshot(db_conn, tmp_path, full=True, tables=['users'], high=start + timedelta(hours=2)) == {'users': 2}
+    assert load_watermarks(tmp_path) == {'users': start + timedelta(hours=2)}
+    assert not [entry for entry in os.listdir(tmp_path) if entry.startswith('.rebuild')]
+    con = duckdb.connect(str(tmp_path / 'analytics.duckdb'), read_only=True)
+    try:
+        rebuilt = con.execute("SELECT id, filename FROM read_parquet(?, filename = true) ORDER BY id",
+                              [pattern]).fetchall()
+    finally:
+        con.close()
+    assert sorted(row[0] for row in rebuilt) == sorted([old_user, new_user])
+    assert not {row[1] for row in rebuilt} & {row[1] for row in exported}
+    print("✅ Incremental snapshot and full rebuild")
+
+
+if __name__ == "__main__":
+    test_partition_month_uses_utc()
+    test_export_statement_bounds_created_at()
+    test_secrets_are_not_exported()
@@ -0,0 +1,170 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from time_log_buffer import FLUSH_SQL, MINUTES_PER_DAY, TimeLogBuffer, TimeLogBufferFull, flush_params
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params):
+        if self.database.fail:
+            raise ConnectionError("database unavailable")
+        self.database.batches.append(params)
+        return type('Result', (), {'rowcount': len(params['minutes'])})()
+
+    async def commit(self):
+        pass
+
+
+class FakeDatabase:
+    """Sessionmaker recording each flushed batch."""
+
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def test_heartbeats_for_the_same_day_are_coalesced():
+    buffer = TimeLogBuffer(sessionmaker=FakeDatabase())
+    investment = uuid.uuid4()
+    for _ in range(3):
+        buffer.add(investment, date(2024, 10, 18), 1)
+    assert buffer.add(investment, date(2024, 10, 19), 2) == 2
+    assert len(buffer) == 2
+    assert buffer.pending_minutes(investment, date(2024, 10, 18)) == 3
+    print("✅ Heartbeats coalesced per day")
+
+
+def test_retried_heartbeats_count_once_and_days_are_capped():
+    buffer = TimeLogBuffer(sessionmaker=FakeDatabase())
+    investment, heartbeat = uuid.uuid4(), uuid.uuid4()
+    assert buffer.add(investment, date(2024, 10, 18), 5, heartbeat_id=heartbeat) == 5
+    assert buffer.add(investment, date(2024, 10, 18), 5, heartbeat_id=heartbeat) == 5
+    assert buffer.add(investment, date(2024, 10, 18), 5, heartbeat_id=uuid.uuid4()) == 10
+    assert buffer.duplicates == 1 and buffer.heartbeats == 2
+
+    for _ in range(30):
+        buffer.add(investment, date(2024, 10, 19), 60)
+    assert buffer.pending_minutes(investment, date(2024, 10, 19)) == MINUTES_PER_DAY
+    print("✅ Idempotent, capped heartbeats")
+
+
+def test_flush_params_are_in_key_order():
+    a, b = sorted([uuid.uuid4(), uuid.uuid4()])
+    params = flush_params({(b, date(2024, 10, 18)): 5, (a, date(2024, 10, 19)): 1, (a, date(2024, 10, 18)): 2})
+    assert params == {
+        "investment_ids": [a, a, b],
+        "logged_dates": [date(2024, 10, 18), date(2024, 10, 19), date(2024, 10, 18)],
+        "minutes": [2, 1, 5],
+    }
+    print("✅ Flush order")
+
+
+def test_a_full_buffer_rejects_new_days_and_wakes_the_flusher():
+    buffer = TimeLogBuffer(flush_rows=2, max_pending=2, sessionmaker=FakeDatabase())
+    investment = uuid.uuid4()
+    buffer.add(investment, date(2024, 10, 18), 1)
+    assert not buffer._wake.is_set()
+    buffer.add(investment, date(2024, 10, 19), 1)
+    assert buffer._wake.is_set()
+    buffer.add(investment, date(2024, 10, 19), 1)
+    with pytest.raises(TimeLogBufferFull):
+        buffer.add(investment, date(2024, 10, 20), 1)
+    print("✅ Bounded buffer")
+
+
+def test_failed_flushes_keep_their_minutes():
+    database = FakeDatabase()
+    flushed_users = []
+
+    async def on_flush(session, user_ids):
+        flushed_users.append(user_ids)
+
+    async def scenario():
+        buffer = TimeLogBuffer(sessionmaker=database, on_flush=on_flush)
+        investment, user = uuid.uuid4(), uuid.uuid4()
+        buffer.add(investment, date(2024, 10, 18), 2, user)
+        database.fail = True
+        with pytest.raises(ConnectionError):
+            await buffer.flush()
+        buffer.add(investment, date(2024, 10, 18), 1)
+        database.fail = False
+        assert await buffer.flush() == 1
+        assert await buffer.flush() == 0
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert [batch['minutes'] for batch in database.batches] == [[3]]
+    assert len(flushed_users) == 1 and buffer.flushes == 1 and len(buffer) == 0
+    print("✅ Failed flush retried")
+
+
+def test_stop_flushes_what_is_pending():
+    database = FakeDatabase()
+
+    async def scenario():
+        buffer = TimeLogBuffer(flush_interval=3600, sessionmaker=database)
+        buffer.start()
+        buffer.add(uuid.uuid4(), date(2024, 10, 18), 1)
+        await buffer.stop()
+        return buffer
+
+    assert len(asyncio.run(scenario())) == 0
+    assert len(database.batches) == 1
+    print("✅ Flush on shutdown")
+
+
+def test_flush_adds_minutes_to_existing_rows(db_conn, make_user):
+    user_id, category_id = make_user()
+    investment_id = uuid.uuid4()
+    with db_conn.begin():
+        db_conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+            VALUES (:id, :user_id, :category_id, 'time', 'Timer', 1, :invested_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id,
+               "invested_at": datetime(2024, 10, 18, tzinfo=timezone.utc)})
+        db_conn.execute(text("""
+            INSERT INTO time_logs (id, investment_id, logged_date, time_spent_minutes, productivity_rating)
+            VALUES (gen_random_uuid(), :investment_id, '2024-10-18', 30, 8),
+                   (gen_random_uuid(), :investment_id, '2024-10-20', 1430, NULL)
+        """), {"investment_id": investment_id})
+
+    deleted = uuid.uuid4()
+    with db_conn.begin():
+        written = db_conn.execute(FLUSH_SQL, flush_params({
+            (investment_id, date(2024, 10, 18)): 5, (investment_id, date(2024, 10, 19)): 2,
+            (investment_id, date(2024, 10, 20)): 30, (deleted, date(2024, 10, 18)): 1,
+        })).rowcount
+    assert written == 3
+    rows = db_conn.execute(text("""
+        SELECT logged_date, time_spent_minutes, productivity_rating FROM time_logs
+        WHERE investment_id = :investment_id ORDER BY logged_date
+    """), {"investment_id": investment_id}).all()
+    assert [tuple(row) for row in rows] == [
+        (date(2024, 10, 18), 35, 8), (date(2024, 10, 19), 2, None), (date(2024, 10, 20), MINUTES_PER_DAY, None),
+    ]
+    print("✅ Batched upsert accumulates minutes")
+
+
+if __name__ == "__main__":
+    test_heartbeats_for_the_same_day_are_coalesced()
+    test_retried_heartbeats_count_once_and_days_are_capped()
+    test_flush_params_are_in_key_order()
+    test_a_full_buffer_rejects_new_days_and_wakes_the_flusher()
+    test_failed_flushes_keep_their_minutes()
+    test_stop_flushes_what_is_pending()
@@ -0,0 +1,127 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from time_log_stats import TimeLogStats, period_totals, streaks
+
+
+class FakeEngine:
+    """Counts connections so the test can see cache hits."""
+
+    def __init__(self):
+        self.connections = 0
+
+    def connect(self):
+        self.connections += 1
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_cache_is_per_user_and_invalidated():
+    engine = FakeEngine()
+    stats = TimeLogStats(engine, ttl=60)
+    computed = []
+
+    def compute(conn):
+        computed.append(1)
+        return len(computed)
+
+    assert stats._cached("user-1", "week", compute) == 1
+    assert stats._cached("user-1", "week", compute) == 1
+    assert stats._cached("user-2", "week", compute) == 2
+    assert engine.connections == 2
+
+    stats.invalidate("user-1")
+    assert stats._cached("user-1", "week", compute) == 3
+    assert stats._cached("user-2", "week", compute) == 2
+    print("✅ Stats are cached per user and invalidated on new logs")
+
+
+def test_expired_entries_are_recomputed():
+    stats = TimeLogStats(FakeEngine(), ttl=0)
+    values = iter([1, 2])
+    assert stats._cached("user-1", "month", lambda conn: next(values)) == 1
+    assert stats._cached("user-1", "month", lambda conn: next(values)) == 2
+    print("✅ Expired entries are recomputed")
+
+
+def test_cache_is_bounded(clock):
+    stats = TimeLogStats(FakeEngine(), ttl=60, max_users=2, clock=clock)
+    for day in range(3):
+        stats._cached("user-1", ('streaks', None, day), lambda conn: day)
+        clock.now += 61
+    # Yesterday's streak keys expired and were dropped when today's was stored
+    assert list(stats._users["user-1"][1]) == [('streaks', None, 2)]
+
+    stats._cached("user-2", "week", lambda conn: 2)
+    stats.invalidate("user-3")
+    assert list(stats._users) == ["user-2", "user-3"]
+    print("✅ Cache bounded by users and expiry")
+
+
+def _logs(conn, user_id, category_id, logs):
+    """Insert one time investment with (day, minutes, rating) logs; returns its id."""
+    investment_id = uuid.uuid4()
+    with conn.begin():
+        conn.execute(text("""
+            INSERT INTO investments (id, user_id, category_id, type, title, amount_invested, invested_at)
+            VALUES (:id, :user_id, :category_id, 'time', 'Practice', 1, :invested_at)
+        """), {"id": investment_id, "user_id": user_id, "category_id": category_id,
+               "invested_at": datetime(2024, 9, 1, tzinfo=timezone.utc)})
+        conn.execute(text("""
+            INSERT INTO time_logs (id, investment_id, logged_date, time_spent_minutes, productivity_rating)
+            VALUES (gen_random_uuid(), :investment_id, :day, :minutes, :rating)
+        """), [{"investment_id": investment_id, "day": day, "minutes": minutes, "rating": rating}
+               for day, minutes, rating in logs])
+    return investment_id
+
+
+def test_period_totals_weight_hours_by_rating(db_conn, make_user):
+    user_id, category_id = make_user()
+    first = _logs(db_conn, user_id, category_id, [
+        (date(2024, 9, 30), 60, 10), (date(2024, 10, 1), 120, 5), (date(2024, 10, 8), 30, None),
+    ])
+    _logs(db_conn, user_id, category_id, [(date(2024, 10, 1), 60, None)])
+    other_user, other_category = make_user()
+    _logs(db_conn, other_user, other_category, [(date(2024, 10, 1), 999, 1)])
+
+    weeks = period_totals(db_conn, user_id, 'week')
+    assert [(w['period_start'], w['total_minutes'], w['days_logged']) for w in weeks] == [
+        (date(2024, 9, 30), 240, 2), (date(2024, 10, 7), 30, 1),
+    ]
+    # 60 min at 10 and 120 min at 5 make two productive hours; unrated hours count only in totals
+    assert weeks[0]['total_hours'] == Decimal('4.00')
+    assert weeks[0]['weighted_hours'] == Decimal('2.00')
+    assert weeks[0]['avg_productivity'] == Decimal('6.67')
+    assert weeks[1]['avg_productivity'] is None
+
+    months = period_totals(db_conn, user_id, 'month', investment_id=first, start=date(2024, 10, 1))
+    assert [(m['period_start'], m['total_minutes']) for m in months] == [(date(2024, 10, 1), 150)]
+    print("✅ Period totals")
+
+
+def test_streaks_count_consecutive_days(db_conn, make_user):
+    user_id, category_id = make_user()
+    days = [date(2024, 10, d) for d in (1, 2, 3, 4, 7, 8)]
+    _logs(db_conn, user_id, category_id, [(day, 30, None) for day in days])
+
+    assert streaks(db_conn, user_id, today=date(2024, 10, 9)) == {"current": 2, "longest": 4}
+    assert streaks(db_conn, user_id, today=date(2024, 10, 10)) == {"current": 0, "longest": 4}
+    empty_user, _ = make_user()
+    assert streaks(db_conn, empty_user) == {"current": 0, "longest": 0}
+    print("✅ Streaks")
+
+
+if __name__ == "__main__":
+    from conftest import Clock
+
+    test_cache_is_per_user_and_invalidated()
+    test_expired_entries_are_recomputed()
+    test_cache_is_bounded(Clock())
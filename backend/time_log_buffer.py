@@ -0,0 +1,183 @@
+"""Write-behind buffer for timer heartbeats.
+
+Timer clients report elapsed minutes about once a minute. Instead of one
+upsert per heartbeat, heartbeats are added up in memory per (investment,
+day) and written every TIME_LOG_FLUSH_S seconds, or sooner once
+TIME_LOG_FLUSH_ROWS days are pending, as one statement:
+
+    INSERT ... SELECT FROM unnest(...) ON CONFLICT (investment_id, logged_date)
+    DO UPDATE SET time_spent_minutes = time_logs.time_spent_minutes + EXCLUDED.time_spent_minutes
+
+The addition makes flushes from several API workers safe to interleave.
+Rows are written in key order so concurrent flushes lock them in the same
+order. A failed flush puts its minutes back for the next one. A day never
+goes past MINUTES_PER_DAY, in the buffer or in the table, however many
+heartbeats arrive for it.
+
+Clients may send a heartbeat_id with each heartbeat and reuse it when they
+retry; ids seen recently by this process are counted once. A retry that
+lands on another API worker is counted again, within the daily cap.
+
+The cost is a bounded loss window: a crash loses at most the last
+TIME_LOG_FLUSH_S seconds of heartbeats, and they are not visible in reads
+until flushed. The API flushes on shutdown (api/main.py). Past
+TIME_LOG_MAX_PENDING pending days, add() refuses new ones so an unreachable
+database cannot exhaust memory.
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+
+from sqlalchemy import text
+
+import db
+
+FLUSH_INTERVAL_S = float(os.getenv('TIME_LOG_FLUSH_S', '5'))
+FLUSH_ROWS = int(os.getenv('TIME_LOG_FLUSH_ROWS', '1000'))
+MAX_PENDING = int(os.getenv('TIME_LOG_MAX_PENDING', '50000'))
+OWNER_CACHE_SIZE = 10000
+HEARTBEAT_ID_CACHE_SIZE = 100000
+MINUTES_PER_DAY = 1440
+
+logger = logging.getLogger('lifeinvest.time_logs')
+
+# Heartbeats for deleted investments are dropped instead of failing the batch
+FLUSH_SQL = text(f"""
+    INSERT INTO time_logs AS t (id, investment_id, logged_date, time_spent_minutes)
+    SELECT gen_random_uuid(), h.investment_id, h.logged_date, LEAST(h.minutes, {MINUTES_PER_DAY})
+    FROM unnest(CAST(:investment_ids AS uuid[]), CAST(:logged_dates AS date[]), CAST(:minutes AS integer[]))
+         AS h(investment_id, logged_date, minutes)
+    WHERE EXISTS (SELECT 1 FROM investments i WHERE i.id = h.investment_id)
+    ON CONFLICT (investment_id, logged_date) DO UPDATE
+    SET time_spent_minutes = LEAST(t.time_spent_minutes + EXCLUDED.time_spent_minutes, {MINUTES_PER_DAY})
+""")
+
+
+class TimeLogBufferFull(Exception):
+    pass
+
+
+def flush_params(pending):
+    """Bind parameters for FLUSH_SQL, in (investment_id, logged_date) order."""
+    keys = sorted(pending)
+    return {
+        "investment_ids": [investment_id for investment_id, _ in keys],
+        "logged_dates": [logged_date for _, logged_date in keys],
+        "minutes": [pending[key] for key in keys],
+    }
+
+
+class TimeLogBuffer:
+    """Pending minutes per (investment_id, logged_date), flushed by a background task.
+
+    ``on_flush(session, user_ids)`` is awaited after each committed flush
+    with the owners of the investments written, e.g. to invalidate caches.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL_S, flush_rows=FLUSH_ROWS, max_pending=MAX_PENDING,
+                 sessionmaker=None, on_flush=None):
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_pending = max_pending
+        self.sessionmaker = sessionmaker
+        self.on_flush = on_flush
+        self.heartbeats = 0
+        self.duplicates = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self._pending = {}
+        self._owners = {}
+        self._heartbeat_ids = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def owner(self, investment_id):
+        """The user_id last seen for ``investment_id``, or None."""
+        return self._owners.get(investment_id)
+
+    def add(self, investment_id, logged_date, minutes, user_id=None, heartbeat_id=None):
+        """Buffer ``minutes`` for the day; returns the minutes now pending for it.
+
+        A ``heartbeat_id`` that was already added is not counted again.
+        """
+        key = (investment_id, logged_date)
+        if heartbeat_id is not None and heartbeat_id in self._heartbeat_ids:
+            self.duplicates += 1
+            return self._pending.get(key, 0)
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            raise TimeLogBufferFull(f"{len(self._pending)} days of time logs are waiting to be written")
+        if user_id is not None:
+            if len(self._owners) >= OWNER_CACHE_SIZE:
+                self._owners.clear()
+            self._owners[investment_id] = user_id
+        self._pending[key] = min(MINUTES_PER_DAY, self._pending.get(key, 0) + minutes)
+        if heartbeat_id is not None:
+            self._heartbeat_ids[heartbeat_id] = None
+            if len(self._heartbeat_ids) > HEARTBEAT_ID_CACHE_SIZE:
+                self._heartbeat_ids.popitem(last=False)
+        self.heartbeats += 1
+        if len(self._pending) >= self.flush_rows:
+            self._wake.set()
+        return self._pending[key]
+
+    def pending_minutes(self, investment_id, logged_date):
+        return self._pending.get((investment_id, logged_date), 0)
+
+    async def flush(self):
+        """Write everything pending in one statement; returns the rows inserted or updated."""
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            sessionmaker = self.sessionmaker or db.get_async_sessionmaker()
+            try:
+                async with sessionmaker() as session:
+                    written = (await session.execute(FLUSH_SQL, flush_params(batch))).rowcount
+                    await session.commit()
+            except BaseException:
+                for key, minutes in batch.items():
+                    self._pending[key] = min(MINUTES_PER_DAY, self._pending.get(key, 0) + minutes)
+                raise
+            self.flushes += 1
+            self.rows_written += written
+            if self.on_flush is not None:
+                user_ids = {self._owners[i] for i, _ in batch if i in self._owners}
+                if user_ids:
+                    async with sessionmaker() as session:
+                        await self.on_flush(session, user_ids)
+            return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing %d buffered time logs failed; retrying", len(self._pending))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Lost %d buffered time logs on shutdown", len(self._pending))
@@ -0,0 +1,227 @@
+"""Time-log aggregation: weekly/monthly totals, productivity-weighted hours and streaks.
+
+All aggregation runs set-based in SQL over time_logs (served by the
+uq_investment_date index, which includes the minutes and rating). TimeLogStats caches the results per
+user and drops a user's entries whenever a log is written through it, or
+when invalidate() is called by another writer. It keeps the
+TIME_STATS_CACHE_USERS most recently used users, like the API's summary
+cache (api/cache.py).
+
+productivity_rating is on a 1-10 scale; productivity-weighted hours count an
+hour rated 10 as a full hour and an hour rated 5 as half. Unrated logs count
+toward totals but not toward weighted hours.
+
+Usage:
+    python time_log_stats.py <user_id>
+"""
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from db import engine
+
+PERIODS = ('week', 'month')
+MAX_USERS = int(os.getenv('TIME_STATS_CACHE_USERS', '10000'))
+
+
+def _filters(user_id, investment_id):
+    filters = ["i.user_id = :user_id"]
+    params = {"user_id": user_id}
+    if investment_id is not None:
+        filters.append("t.investment_id = :investment_id")
+        params["investment_id"] = investment_id
+    return filters, params
+
+
+def period_totals(conn, user_id, period='week', investment_id=None, start=None, end=None):
+    """Return per-week or per-month totals for a user, optionally one investment.
+
+    Each row has period_start, total_minutes, total_hours, weighted_hours,
+    avg_productivity (minute-weighted, None when nothing is rated) and days_logged.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {PERIODS}")
+    filters, params = _filters(user_id, investment_id)
+    if start is not None:
+        filters.append("t.logged_date >= :start")
+        params["start"] = start
+    if end is not None:
+        filters.append("t.logged_date <= :end")
+        params["end"] = end
+    params["period"] = period
+
+    result = conn.execute(text(f"""
+        SELECT date_trunc(:period, t.logged_date)::date AS period_start,
+               SUM(t.time_spent_minutes) AS total_minutes,
+               ROUND(SUM(t.time_spent_minutes) / 60.0, 2) AS total_hours,
+               ROUND(COALESCE(SUM(t.time_spent_minutes * t.productivity_rating), 0) / 600.0, 2) AS weighted_hours,
+               ROUND(SUM(t.time_spent_minutes * t.productivity_rating)::numeric
+                     / NULLIF(SUM(t.time_spent_minutes) FILTER (WHERE t.productivity_rating IS NOT NULL), 0), 2)
+                   AS avg_productivity,
+               COUNT(DISTINCT t.logged_date) AS days_logged
+        FROM time_logs t
+        JOIN investments i ON i.id = t.investment_id
+        WHERE {' AND '.join(filters)}
+        GROUP BY 1
+        ORDER BY 1
+    """), params)
+    return [dict(row._mapping) for row in result]
+
+
+def streaks(conn, user_id, investment_id=None, today=None):
+    """Return {"current": days, "longest": days} of consecutive logged days.
+
+    The current streak is still alive if its last day is today or yesterday.
+    """
+    filters, params = _filters(user_id, investment_id)
+    params["today"] = today or date.today()
+    row = conn.execute(text(f"""
+        WITH days AS (
+            SELECT DISTINCT t.logged_date
+            FROM time_logs t
+            JOIN investments i ON i.id = t.investment_id
+            WHERE {' AND '.join(filters)}
+        ),
+        islands AS (
+            SELECT logged_date,
+                   logged_date - (ROW_NUMBER() OVER (ORDER BY logged_date))::int AS island
+            FROM days
+        ),
+        runs AS (
+            SELECT MAX(logged_date) AS last_day, COUNT(*) AS length
+            FROM islands
+            GROUP BY island
+        )
+        SELECT COALESCE(MAX(length) FILTER (WHERE last_day >= CAST(:today AS date) - 1), 0) AS current,
+               COALESCE(MAX(length), 0) AS longest
+        FROM runs
+    """), params).one()
+    return {"current": row.current, "longest": row.longest}
+
+
+def log_time(conn, investment_id, logged_date, minutes, description=None, productivity_rating=None):
+    """Write one day's log for an investment, replacing an existing one.
+
+    Returns the owning user_id so callers can invalidate cached stats.
+    """
+    with conn.begin():
+        return conn.execute(text("""
+            INSERT INTO time_logs
+            (id, investment_id, logged_date, time_spent_minutes, description, productivity_rating)
+            VALUES
+            (gen_random_uuid(), :investment_id, :logged_date, :minutes, :description, :rating)
+            ON CONFLICT (investment_id, logged_date) DO UPDATE
+            SET time_spent_minutes = EXCLUDED.time_spent_minutes,
+                description = EXCLUDED.description,
+                productivity_rating = EXCLUDED.productivity_rating
+            RETURNING (SELECT user_id FROM investments WHERE id = :investment_id)
+        """), {
+            "investment_id": investment_id,
+            "logged_date": logged_date,
+            "minutes": minutes,
+            "description": description,
+            "rating": productivity_rating,
+        }).scalar()
+
+
+class TimeLogStats:
+    """Per-user LRU cache in front of period_totals() and streaks().
+
+    Entries expire after ``ttl`` seconds as a safety net for writes made
+    elsewhere; writes through log_time() invalidate the user immediately.
+    Each user's slot holds a generation and their entries; expired entries
+    are dropped whenever the user's slot is written, and past ``max_users``
+    the least recently used user is evicted.
+    """
+
+    def __init__(self, engine, ttl=300, max_users=MAX_USERS, clock=time.monotonic):
+        self.engine = engine
+        self.ttl = ttl
+        self.max_users = max_users
+        self.clock = clock
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, user_id, generation, entries):
+        self._users[user_id] = (generation, entries)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def _cached(self, user_id, key, compute):
+        user_id = str(user_id)
+        with self._lock:
+            generation, entries = self._users.get(user_id, (0, {}))
+            entry = entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._users.move_to_end(user_id)
+                return entry[1]
+        with self.engine.connect() as conn:
+            value = compute(conn)
+        now = self.clock()
+        with self._lock:
+            current, entries = self._users.get(user_id, (0, {}))
+            # Don't store a result that an invalidation raced past
+            if current == generation:
+                entries = {k: e for k, e in entries.items() if e[0] > now}
+                entries[key] = (now + self.ttl, value)
+                self._store(user_id, generation, entries)
+        return value
+
+    def weekly(self, user_id, investment_id=None):
+        return self._cached(user_id, ('week', investment_id),
+                            lambda conn: period_totals(conn, user_id, 'week', investment_id))
+
+    def monthly(self, user_id, investment_id=None):
+        return self._cached(user_id, ('month', investment_id),
+                            lambda conn: period_totals(conn, user_id, 'month', investment_id))
+
+    def streaks(self, user_id, investment_id=None):
+        today = date.today()
+        return self._cached(user_id, ('streaks', investment_id, today),
+                            lambda conn: streaks(conn, user_id, investment_id, today))
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            generation, _ = self._users.get(user_id, (0, {}))
+            self._store(user_id, generation + 1, {})
+
+    def log_time(self, investment_id, logged_date, minutes, description=None, productivity_rating=None):
+        with self.engine.connect() as conn:
+            user_id = log_time(conn, investment_id, logged_date, minutes, description, productivity_rating)
+        if user_id is not None:
+            self.invalidate(user_id)
+        return user_id
+
+
+stats = TimeLogStats(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-log totals and streaks for a user")
+    parser.add_argument('user_id')
+    parser.add_argument('--period', choices=PERIODS, default='week')
+    parser.add_argument('--weeks', type=int, default=12, help="how far back to report")
+    args = parser.parse_args()
+
+    start = date.today() - timedelta(weeks=args.weeks)
+    with engine.connect() as conn:
+        rows = period_totals(conn, args.user_id, args.period, start=start)
+        user_streaks = streaks(conn, args.user_id)
+
+    print(f"⏰ TIME LOGS BY {args.period.upper()}")
+    print("=" * 30)
+    for row in rows:
+        print(f"  {row['period_start']}: {row['total_hours']} h "
+              f"({row['weighted_hours']} productive h, {row['days_logged']} days)")
+    print(f"\n🔥 Current streak: {user_streaks['current']} days, longest: {user_streaks['longest']} days")
+
+
+if __name__ == "__main__":
+    main()